@@ -1,8 +1,14 @@
 import os
+import click
 from flask import Flask
 from flask_restful import Api
+from flask_migrate import Migrate, upgrade
 import logging
-from infrastructure.database import db
+from infrastructure.compression import response_compression
+from infrastructure.database import db, enable_sqlite_foreign_keys
+from infrastructure.pool import engine_options_from_env, pool_metrics
+from infrastructure.request_metrics import request_metrics
+from infrastructure.serializers import json_representation
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -11,24 +17,69 @@ logger = logging.getLogger(__name__)
 # Create the Flask application
 app = Flask(__name__)
 api = Api(app)
+api.representations['application/json'] = json_representation()
 
 # Configure the application
 app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL")
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options_from_env(app.config["SQLALCHEMY_DATABASE_URI"], os.environ)
 app.config["SECRET_KEY"] = os.environ.get("FLASK_SECRET_KEY", "dev_key")
+app.config["AUTO_MIGRATE"] = os.environ.get("AUTO_MIGRATE", "false").lower() == "true"
+app.config["HEALTH_READY_CACHE_SECONDS"] = float(os.environ.get("HEALTH_READY_CACHE_SECONDS", "1.0"))
+app.config["CASE_CACHE_ENABLED"] = os.environ.get("CASE_CACHE_ENABLED", "false").lower() == "true"
+app.config["CASE_CACHE_MAX_SIZE"] = int(os.environ.get("CASE_CACHE_MAX_SIZE", "1024"))
+app.config["CASE_CACHE_TTL_SECONDS"] = float(os.environ.get("CASE_CACHE_TTL_SECONDS", "30"))
+# Optional infrastructure.cache.CacheBackend shared by all workers
+app.config["CASE_CACHE_SHARED_BACKEND"] = None
+app.config["CASE_BATCH_MAX_ITEMS"] = int(os.environ.get("CASE_BATCH_MAX_ITEMS", "10000"))
+app.config["CASE_BATCH_CHUNK_SIZE"] = int(os.environ.get("CASE_BATCH_CHUNK_SIZE", "500"))
+app.config["MESSAGE_BATCH_MAX_ITEMS"] = int(os.environ.get("MESSAGE_BATCH_MAX_ITEMS", "5000"))
+app.config["MESSAGE_GROUP_COMMIT_ENABLED"] = os.environ.get("MESSAGE_GROUP_COMMIT_ENABLED", "false").lower() == "true"
+app.config["MESSAGE_GROUP_COMMIT_MAX_BATCH"] = int(os.environ.get("MESSAGE_GROUP_COMMIT_MAX_BATCH", "100"))
+app.config["MESSAGE_GROUP_COMMIT_MAX_DELAY_MS"] = float(os.environ.get("MESSAGE_GROUP_COMMIT_MAX_DELAY_MS", "2"))
+app.config["MESSAGE_STREAM_HEARTBEAT_SECONDS"] = float(os.environ.get("MESSAGE_STREAM_HEARTBEAT_SECONDS", "15"))
+app.config["MESSAGE_STREAM_QUEUE_SIZE"] = int(os.environ.get("MESSAGE_STREAM_QUEUE_SIZE", "1000"))
+app.config["MESSAGE_LONG_POLL_MAX_SECONDS"] = float(os.environ.get("MESSAGE_LONG_POLL_MAX_SECONDS", "30"))
+# Optional infrastructure.realtime.MessageBroker fanning messages out across workers
+app.config["MESSAGE_BROKER"] = None
+# Optional domain.search.SearchIndex; defaults to the backend for the database dialect
+app.config["SEARCH_INDEX"] = None
+app.config["COMPRESSION_ENABLED"] = os.environ.get("COMPRESSION_ENABLED", "true").lower() == "true"
+app.config["COMPRESSION_MIN_SIZE"] = int(os.environ.get("COMPRESSION_MIN_SIZE", "1024"))
+app.config["COMPRESSION_LEVEL"] = int(os.environ.get("COMPRESSION_LEVEL", "6"))
 
 # Initialize extensions with app
 db.init_app(app)
+request_metrics.init_app(app)
+response_compression.init_app(app)
+migrate = Migrate(app, db, directory=os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations"))
 
-# Initialize application context and create tables
+# Initialize application context and bring the schema up to date
 with app.app_context():
-    # Create all database tables
-    db.create_all()
+    enable_sqlite_foreign_keys(db.engine)
+    pool_metrics.instrument(db.engine)
+    request_metrics.instrument(db.engine)
+
+    # The schema is owned by the Alembic migrations; run `flask --app app db upgrade`
+    # as a release step, or set AUTO_MIGRATE=true for single-process setups
+    if app.config["AUTO_MIGRATE"]:
+        upgrade()
+        logger.info("Database migrations applied")
 
     # Import and initialize routes after models are ready
     from infrastructure.routes import initialize_routes
     initialize_routes(api)
-    logger.info("Database tables created and routes initialized successfully")
+    logger.info("Routes initialized successfully")
+
+@app.cli.command("rebuild-search-index")
+def rebuild_search_index():
+    """Rebuild the SQLite full-text index from its content tables; run it after a VACUUM."""
+    if db.engine.dialect.name != 'sqlite':
+        click.echo("Only the SQLite search index is kept outside its tables; nothing to rebuild")
+        return
+    from infrastructure.search import SQLiteSearchIndex
+    SQLiteSearchIndex.rebuild()
+    click.echo("Search index rebuilt")
 
 # Error handlers
 @app.errorhandler(404)
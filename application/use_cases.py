@@ -1,76 +1,359 @@
 """Application use cases implementing the business logic."""
-from typing import List, Optional, Tuple
+import logging
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Callable, ContextManager, Iterator, List, Optional, Tuple
 from uuid import UUID
-from domain.entities import SupportCase, Message
-from domain.repositories import SupportCaseRepository, MessageRepository
+from domain.entities import CaseRevision, SupportCase, Message
+from domain.events import MessagePublisher
+from domain.pagination import Page, Position
+from domain.repositories import (SupportCaseRepository, MessageRepository,
+                                 AsyncSupportCaseRepository, AsyncMessageRepository)
+from domain.search import SearchHit, SearchIndex
+
+logger = logging.getLogger(__name__)
+
+class UnitOfWork(ABC):
+    """Transaction boundary of a use case.
+
+    Repository writes made inside transaction() are only staged and are
+    committed together when the outermost block exits cleanly, or rolled back
+    if it raises.
+    """
+
+    @abstractmethod
+    def transaction(self) -> ContextManager[None]:
+        """Open the transaction, or join the one already open."""
+        pass
+
+    @abstractmethod
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Run callback once the open transaction commits, or right away if none is open."""
+        pass
+
+class NullUnitOfWork(UnitOfWork):
+    """No shared transaction; every repository write commits on its own."""
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        yield
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        callback()
 
 class SupportCaseService:
     """Application service for managing support cases."""
     
-    def __init__(self, case_repo: SupportCaseRepository, message_repo: MessageRepository):
+    def __init__(self, case_repo: SupportCaseRepository, message_repo: MessageRepository,
+                 unit_of_work: Optional[UnitOfWork] = None):
         self.case_repo = case_repo
         self.message_repo = message_repo
+        self.unit_of_work = unit_of_work or NullUnitOfWork()
     
     def create_case(self, summary: str, description: str, customer_id: int) -> SupportCase:
         """Create a new support case."""
         case = SupportCase.create(summary, description, customer_id)
-        self.case_repo.add(case)
+        with self.unit_of_work.transaction():
+            self.case_repo.add(case)
         return case
     
     def get_case(self, case_id: UUID) -> Optional[SupportCase]:
         """Get a support case by ID."""
         return self.case_repo.get(case_id)
     
+    def get_case_header(self, case_id: UUID) -> Optional[SupportCase]:
+        """Get a support case by ID without its messages."""
+        return self.case_repo.get_header(case_id)
+    
+    def get_case_header_at(self, revision: CaseRevision) -> Optional[SupportCase]:
+        """Get a support case without its messages, no older than revision.
+
+        Returns None if the case was deleted since.
+        """
+        return self.case_repo.get_header(revision.case_id, revision.version)
+    
+    def case_exists(self, case_id: UUID) -> bool:
+        """Check whether a support case exists."""
+        return self.case_repo.exists(case_id)
+    
+    def get_case_revision(self, case_id: UUID) -> Optional[CaseRevision]:
+        """Get the current revision of a support case, or None if it does not exist."""
+        return self.case_repo.get_revision(case_id)
+    
     def get_all_cases(self) -> List[SupportCase]:
         """Get all support cases."""
         return self.case_repo.get_all()
     
+    def list_cases(self, limit: int = 20, after: Optional[Position] = None, customer_id: Optional[int] = None,
+                   created_from: Optional[datetime] = None, created_to: Optional[datetime] = None,
+                   by_activity: bool = False) -> Page[SupportCase]:
+        """Get a page of support cases, optionally filtered by customer and creation time.
+
+        With by_activity, the most recently active cases come first.
+        """
+        return self.case_repo.get_page(limit, after, customer_id, created_from, created_to, by_activity)
+    
+    def stream_cases(self, after: Optional[Position] = None, customer_id: Optional[int] = None,
+                     created_from: Optional[datetime] = None, created_to: Optional[datetime] = None,
+                     by_activity: bool = False) -> Iterator[SupportCase]:
+        """Iterate over every support case list_cases would return from after on, for exports."""
+        return self.case_repo.stream(after, customer_id, created_from, created_to, by_activity)
+    
     def update_case(self, case_id: UUID, summary: str, description: str, customer_id: int) -> Optional[SupportCase]:
-        """Update an existing support case."""
-        case = self.case_repo.get(case_id)
-        if not case:
-            return None
-            
-        case.summary = summary
-        case.description = description
-        case.customer_id = customer_id
-        self.case_repo.update(case)
-        return case
+        """Update an existing support case.
+
+        Returns None if the case does not exist.
+        """
+        with self.unit_of_work.transaction():
+            return self.case_repo.update(case_id, summary, description, customer_id)
+    
+    def upsert_cases(self, items: List[dict], chunk_size: int = 500) -> Tuple[List[SupportCase], List[Optional[bool]]]:
+        """Create or update support cases in bulk, one transaction per chunk.
+
+        Each item holds summary, description, customer_id and optionally the id of
+        the case to update. Returns the cases and, for each one, True if it was
+        created, False if it was updated or None if its chunk failed.
+        """
+        cases = [SupportCase.create(item["summary"], item["description"], item["customer_id"], item.get("id"))
+                 for item in items]
+        outcomes: List[Optional[bool]] = []
+        for start in range(0, len(cases), chunk_size):
+            chunk = cases[start:start + chunk_size]
+            try:
+                with self.unit_of_work.transaction():
+                    outcomes.extend(self.case_repo.upsert_many(chunk))
+            except Exception as e:
+                logger.error(f"Error upserting support cases {start}-{start + len(chunk) - 1}: {str(e)}")
+                outcomes.extend([None] * len(chunk))
+        return cases, outcomes
     
     def delete_case(self, case_id: UUID) -> bool:
-        """Delete a support case."""
-        case = self.case_repo.get(case_id)
-        if not case:
-            return False
-        self.case_repo.delete(case_id)
-        return True
+        """Delete a support case with its messages; returns False if it does not exist."""
+        with self.unit_of_work.transaction():
+            return self.case_repo.delete(case_id)
 
 class MessageService:
-    """Application service for managing messages."""
+    """Application service for managing messages.
+
+    Message writes change their case too (counters, revision); case_changed,
+    if given, is called with the case id once such a write commits, e.g. to
+    drop a cached copy of the case.
+    """
     
-    def __init__(self, case_repo: SupportCaseRepository, message_repo: MessageRepository):
+    def __init__(self, case_repo: SupportCaseRepository, message_repo: MessageRepository,
+                 publisher: Optional[MessagePublisher] = None, unit_of_work: Optional[UnitOfWork] = None,
+                 case_changed: Optional[Callable[[UUID], None]] = None):
         self.case_repo = case_repo
         self.message_repo = message_repo
+        self.publisher = publisher
+        self.unit_of_work = unit_of_work or NullUnitOfWork()
+        self.case_changed = case_changed
     
     def add_message(self, case_id: UUID, content: str) -> Optional[Message]:
-        """Add a new message to a support case."""
-        case = self.case_repo.get(case_id)
-        if not case:
-            return None
-            
-        message = case.add_message(content)
-        self.message_repo.add(message)
+        """Add a new message to a support case.
+
+        Returns None if the case does not exist. A message repository may
+        store the message outside the unit of work, as group commit does.
+        """
+        with self.unit_of_work.transaction():
+            if not self.case_repo.exists(case_id):
+                return None
+                
+            message = Message.create(case_id, content)
+            self.message_repo.add(message)
+            self._notify_case_changed(case_id)
+        self._publish([message])
         return message
     
-    def get_case_messages(self, case_id: UUID, limit: int = 10, offset: int = 0) -> Tuple[List[Message], int]:
-        """Get messages for a case with pagination."""
-        case = self.case_repo.get(case_id)
-        if not case:
-            return [], 0
+    def add_messages(self, case_id: UUID, contents: List[str]) -> Optional[List[Message]]:
+        """Add several messages to a support case in one transaction.
+
+        Messages keep the order of contents. Returns None if the case does not exist.
+        """
+        with self.unit_of_work.transaction():
+            if not self.case_repo.exists(case_id):
+                return None
+
+            # Spread timestamps by a microsecond so the thread order matches the input order
+            now = datetime.utcnow()
+            messages = [Message.create(case_id, content, now + timedelta(microseconds=i))
+                        for i, content in enumerate(contents)]
+            if messages:
+                self.message_repo.add_many(messages)
+                self._notify_case_changed(case_id)
+        if messages:
+            self._publish(messages)
+        return messages
+    
+    def get_case_messages(self, case_id: UUID, limit: int = 10, offset: int = 0,
+                          case_checked: bool = False) -> Optional[Tuple[List[Message], int]]:
+        """Get messages for a case with pagination.
+
+        Returns None if the case does not exist; pass case_checked when the
+        caller already knows it does, to skip the check.
+        """
+        if not case_checked and not self.case_repo.exists(case_id):
+            return None
             
         return self.message_repo.get_by_case(case_id, limit, offset)
     
+    def get_case_messages_page(self, case_id: UUID, limit: int = 10, after: Optional[Position] = None,
+                               include_total: bool = False, case_checked: bool = False) -> Optional[Page[Message]]:
+        """Get messages for a case with keyset pagination.
+
+        Returns None if the case does not exist, unless case_checked is set.
+        """
+        if not case_checked and not self.case_repo.exists(case_id):
+            return None
+
+        return self.message_repo.get_page_by_case(case_id, limit, after, include_total)
+
+    def get_case_messages_since(self, case_id: UUID, since: Position, limit: int = 10,
+                                case_checked: bool = False) -> Optional[Page[Message]]:
+        """Get the messages of a case created after a position, oldest first.
+
+        Returns None if the case does not exist, unless case_checked is set.
+        """
+        if not case_checked and not self.case_repo.exists(case_id):
+            return None
+
+        return self.message_repo.get_page_since(case_id, since, limit)
+
+    def stream_case_messages(self, case_id: UUID, after: Optional[Position] = None) -> Optional[Iterator[Message]]:
+        """Iterate over the whole thread of a case, newest first, for exports.
+
+        Returns None if the case does not exist.
+        """
+        if not self.case_repo.exists(case_id):
+            return None
+
+        return self.message_repo.stream_by_case(case_id, after)
+    
     def delete_message(self, case_id: UUID, message_id: UUID) -> bool:
         """Delete a message from a support case."""
-        self.message_repo.delete(message_id)
+        with self.unit_of_work.transaction():
+            self.message_repo.delete(message_id)
+            self._notify_case_changed(case_id)
+        return True
+    
+    def _notify_case_changed(self, case_id: UUID) -> None:
+        if self.case_changed is not None:
+            self.unit_of_work.after_commit(lambda: self.case_changed(case_id))
+    
+    def _publish(self, messages: List[Message]) -> None:
+        """Announce committed messages to subscribers; failures never undo the write."""
+        if self.publisher is None:
+            return
+        try:
+            self.publisher.publish(messages)
+        except Exception as e:
+            logger.error(f"Error publishing messages: {str(e)}")
+
+class SearchService:
+    """Application service for full-text search over cases and messages."""
+    
+    def __init__(self, search_index: SearchIndex):
+        self.search_index = search_index
+    
+    def search(self, query: str, limit: int = 20, offset: int = 0,
+               kind: Optional[str] = None) -> Tuple[List[SearchHit], bool]:
+        """Search cases and messages, most relevant first.
+
+        Returns the hits of the requested page and whether more follow.
+        """
+        # Fetch one extra hit to learn whether another page follows
+        hits = self.search_index.search(query, limit + 1, offset, kind)
+        return hits[:limit], len(hits) > limit
+
+class AsyncSupportCaseService:
+    """Asynchronous application service for managing support cases."""
+    
+    def __init__(self, case_repo: AsyncSupportCaseRepository, message_repo: AsyncMessageRepository):
+        self.case_repo = case_repo
+        self.message_repo = message_repo
+    
+    async def create_case(self, summary: str, description: str, customer_id: int) -> SupportCase:
+        """Create a new support case."""
+        case = SupportCase.create(summary, description, customer_id)
+        await self.case_repo.add(case)
+        return case
+    
+    async def get_case(self, case_id: UUID) -> Optional[SupportCase]:
+        """Get a support case by ID."""
+        return await self.case_repo.get(case_id)
+    
+    async def get_case_header(self, case_id: UUID) -> Optional[SupportCase]:
+        """Get a support case by ID without its messages."""
+        return await self.case_repo.get_header(case_id)
+    
+    async def case_exists(self, case_id: UUID) -> bool:
+        """Check whether a support case exists."""
+        return await self.case_repo.exists(case_id)
+    
+    async def list_cases(self, limit: int = 20, after: Optional[Position] = None, customer_id: Optional[int] = None,
+                         created_from: Optional[datetime] = None, created_to: Optional[datetime] = None,
+                         by_activity: bool = False) -> Page[SupportCase]:
+        """Get a page of support cases, optionally filtered by customer and creation time.
+
+        With by_activity, the most recently active cases come first.
+        """
+        return await self.case_repo.get_page(limit, after, customer_id, created_from, created_to, by_activity)
+    
+    async def update_case(self, case_id: UUID, summary: str, description: str,
+                          customer_id: int) -> Optional[SupportCase]:
+        """Update an existing support case.
+
+        Returns None if the case does not exist.
+        """
+        return await self.case_repo.update(case_id, summary, description, customer_id)
+    
+    async def delete_case(self, case_id: UUID) -> bool:
+        """Delete a support case with its messages; returns False if it does not exist."""
+        return await self.case_repo.delete(case_id)
+
+class AsyncMessageService:
+    """Asynchronous application service for managing messages."""
+    
+    def __init__(self, case_repo: AsyncSupportCaseRepository, message_repo: AsyncMessageRepository):
+        self.case_repo = case_repo
+        self.message_repo = message_repo
+    
+    async def add_message(self, case_id: UUID, content: str) -> Optional[Message]:
+        """Add a new message to a support case.
+
+        Returns None if the case does not exist.
+        """
+        if not await self.case_repo.exists(case_id):
+            return None
+            
+        message = Message.create(case_id, content)
+        await self.message_repo.add(message)
+        return message
+    
+    async def get_case_messages(self, case_id: UUID, limit: int = 10,
+                                offset: int = 0) -> Optional[Tuple[List[Message], int]]:
+        """Get messages for a case with pagination.
+
+        Returns None if the case does not exist.
+        """
+        if not await self.case_repo.exists(case_id):
+            return None
+            
+        return await self.message_repo.get_by_case(case_id, limit, offset)
+    
+    async def get_case_messages_page(self, case_id: UUID, limit: int = 10, after: Optional[Position] = None,
+                                     include_total: bool = False) -> Optional[Page[Message]]:
+        """Get messages for a case with keyset pagination.
+
+        Returns None if the case does not exist.
+        """
+        if not await self.case_repo.exists(case_id):
+            return None
+
+        return await self.message_repo.get_page_by_case(case_id, limit, after, include_total)
+    
+    async def delete_message(self, case_id: UUID, message_id: UUID) -> bool:
+        """Delete a message from a support case."""
+        await self.message_repo.delete(message_id)
         return True
@@ -0,0 +1,231 @@
+"""Asynchronous ASGI serving mode for the case and message API.
+
+Serves the case and message CRUD and pagination routes of the Flask
+application, with the same responses, on SQLAlchemy asyncio, so a single
+worker can keep many small concurrent requests in flight. The other Flask
+routes and features are not ported; the README lists them. Run with:
+
+    uvicorn asgi:app --workers 2
+"""
+import os
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime
+from uuid import UUID
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+from application.use_cases import AsyncSupportCaseService, AsyncMessageService
+from domain.pagination import Position
+from infrastructure.async_database import (async_engine_options_from_env, create_engine_from_url,
+                                           create_session_factory)
+from infrastructure.async_implementations import (AsyncSQLAlchemySupportCaseRepository,
+                                                  AsyncSQLAlchemyMessageRepository)
+from infrastructure.cursors import encode_cursor, decode_cursor, parse_datetime
+from infrastructure.serializers import case_to_dict, message_to_dict, dumps
+from validators import support_case_errors, message_errors
+
+logger = logging.getLogger(__name__)
+
+INSTANCE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "instance")
+
+DATABASE_URL = os.environ.get("DATABASE_URL")
+engine = create_engine_from_url(DATABASE_URL, INSTANCE_PATH,
+                                **async_engine_options_from_env(DATABASE_URL, os.environ))
+session_factory = create_session_factory(engine)
+
+case_repository = AsyncSQLAlchemySupportCaseRepository(session_factory)
+message_repository = AsyncSQLAlchemyMessageRepository(session_factory)
+case_service = AsyncSupportCaseService(case_repository, message_repository)
+message_service = AsyncMessageService(case_repository, message_repository)
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded by the shared serializers (orjson when installed)."""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+def _error(message, status_code):
+    return FastJSONResponse({"error": message}, status_code=status_code)
+
+async def _json_body(request: Request):
+    try:
+        return await request.json()
+    except ValueError:
+        return None
+
+async def liveness(request: Request):
+    return FastJSONResponse({"status": "alive", "timestamp": datetime.utcnow().isoformat()})
+
+async def cases(request: Request):
+    try:
+        if request.method == "POST":
+            data = await _json_body(request)
+            errors = support_case_errors(data)
+            if errors:
+                return FastJSONResponse({"error": "Invalid support case data", "details": errors}, status_code=400)
+
+            case = await case_service.create_case(data["summary"], data["description"], data["customer_id"])
+            return FastJSONResponse(case_to_dict(case), status_code=201)
+
+        try:
+            params = request.query_params
+            limit = max(min(int(params.get('limit', 20)), 100), 1)
+            after = params.get('after')
+            position = decode_cursor(after) if after else None
+            customer_id = int(params['customer_id']) if params.get('customer_id') else None
+            created_from = parse_datetime(params.get('created_from'))
+            created_to = parse_datetime(params.get('created_to'))
+            sort = params.get('sort', 'created')
+            if sort not in ('created', 'activity'):
+                raise ValueError(f"Unknown sort order: {sort}")
+        except ValueError:
+            return _error("Invalid query parameters", 400)
+
+        page = await case_service.list_cases(limit, position, customer_id, created_from, created_to,
+                                             by_activity=sort == 'activity')
+        return FastJSONResponse({
+            "cases": [case_to_dict(case) for case in page.items],
+            "pagination": {
+                "limit": limit,
+                "next_cursor": encode_cursor(page.next_position) if page.next_position else None
+            }
+        })
+
+    except Exception as e:
+        logger.error(f"Error handling support cases: {str(e)}")
+        return _error("Internal server error", 500)
+
+async def case_detail(request: Request):
+    try:
+        try:
+            case_id = UUID(request.path_params['case_id'])
+        except ValueError:
+            return _error("Invalid UUID format", 400)
+
+        if request.method == "GET":
+            case = await case_service.get_case_header(case_id)
+            if not case:
+                return _error("Support case not found", 404)
+            return FastJSONResponse(case_to_dict(case))
+
+        if request.method == "PUT":
+            data = await _json_body(request)
+            errors = support_case_errors(data)
+            if errors:
+                return FastJSONResponse({"error": "Invalid support case data", "details": errors}, status_code=400)
+
+            case = await case_service.update_case(case_id, data["summary"], data["description"],
+                                                  data["customer_id"])
+            if not case:
+                return _error("Support case not found", 404)
+            return FastJSONResponse(case_to_dict(case))
+
+        if await case_service.delete_case(case_id):
+            return Response(status_code=204)
+        return _error("Support case not found", 404)
+
+    except Exception as e:
+        logger.error(f"Error handling support case: {str(e)}")
+        return _error("Internal server error", 500)
+
+async def messages(request: Request):
+    try:
+        try:
+            case_id = UUID(request.path_params['case_id'])
+        except ValueError:
+            return _error("Invalid UUID format", 400)
+
+        if request.method == "POST":
+            data = await _json_body(request)
+            errors = message_errors(data)
+            if errors:
+                return FastJSONResponse({"error": "Invalid message data", "details": errors}, status_code=400)
+
+            message = await message_service.add_message(case_id, data["content"])
+            if not message:
+                return _error("Support case not found", 404)
+            return FastJSONResponse(message_to_dict(message), status_code=201)
+
+        params = request.query_params
+        if 'after' in params:
+            return await _messages_page(case_id, params)
+
+        try:
+            limit = min(int(params.get('limit', 10)), 100)
+            offset = max(int(params.get('offset', 0)), 0)
+        except ValueError:
+            return _error("Invalid pagination parameters", 400)
+
+        result = await message_service.get_case_messages(case_id, limit, offset)
+        if result is None:
+            return _error("Support case not found", 404)
+
+        items, total = result
+        pagination = {"total": total, "offset": offset, "limit": limit}
+        if items and offset + len(items) < total:
+            pagination["next_cursor"] = encode_cursor(Position(items[-1].created_at, items[-1].id))
+        return FastJSONResponse({"messages": [message_to_dict(m) for m in items], "pagination": pagination})
+
+    except Exception as e:
+        logger.error(f"Error handling messages: {str(e)}")
+        return _error("Internal server error", 500)
+
+async def _messages_page(case_id, params):
+    try:
+        limit = max(min(int(params.get('limit', 10)), 100), 1)
+        position = decode_cursor(params['after']) if params['after'] else None
+    except ValueError:
+        return _error("Invalid pagination parameters", 400)
+
+    include_total = params.get('include_total', 'false').lower() == 'true'
+    page = await message_service.get_case_messages_page(case_id, limit, position, include_total)
+    if page is None:
+        return _error("Support case not found", 404)
+
+    pagination = {
+        "limit": limit,
+        "next_cursor": encode_cursor(page.next_position) if page.next_position else None
+    }
+    if include_total:
+        pagination["total"] = page.total
+    return FastJSONResponse({"messages": [message_to_dict(m) for m in page.items], "pagination": pagination})
+
+async def message_detail(request: Request):
+    try:
+        try:
+            case_id = UUID(request.path_params['case_id'])
+            message_id = UUID(request.path_params['message_id'])
+        except ValueError:
+            return _error("Invalid UUID format", 400)
+
+        if not await case_service.case_exists(case_id):
+            return _error("Support case not found", 404)
+
+        await message_service.delete_message(case_id, message_id)
+        return Response(status_code=204)
+
+    except Exception as e:
+        logger.error(f"Error deleting message: {str(e)}")
+        return _error("Internal server error", 500)
+
+async def not_found(request: Request, exc):
+    return _error("Resource not found", 404)
+
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    await engine.dispose()
+
+app = Starlette(
+    routes=[
+        Route('/health/live', liveness),
+        Route('/api/cases', cases, methods=['GET', 'POST']),
+        Route('/api/cases/{case_id}', case_detail, methods=['GET', 'PUT', 'DELETE']),
+        Route('/api/cases/{case_id}/messages', messages, methods=['GET', 'POST']),
+        Route('/api/cases/{case_id}/messages/{message_id}', message_detail, methods=['DELETE'])
+    ],
+    exception_handlers={404: not_found},
+    lifespan=lifespan
+)
@@ -0,0 +1 @@
+# Empty __init__.py to mark the directory as a Python package
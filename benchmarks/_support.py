@@ -0,0 +1,30 @@
+"""Helpers shared by the benchmark scripts."""
+import os
+import tempfile
+import timeit
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+def per_call_us(func: Callable[[], object], number: int) -> float:
+    """Time of one call to func in microseconds, the best of five runs of number calls."""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+@contextmanager
+def benchmark_database(url: Optional[str] = None) -> Iterator[str]:
+    """Point the app at a database for the benchmark and yield its URL.
+
+    The app reads DATABASE_URL on import, so enter this before importing it.
+    Without a URL, a scratch SQLite file is used and removed on exit.
+    """
+    if url:
+        os.environ["DATABASE_URL"] = url
+        yield url
+        return
+
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    try:
+        yield os.environ["DATABASE_URL"]
+    finally:
+        os.remove(path)
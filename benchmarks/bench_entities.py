@@ -0,0 +1,85 @@
+"""Memory benchmark of hydrating message threads into domain entities.
+
+Measures the memory held by 100k `Message` entities, as slotted frozen
+dataclasses against the same fields in a plain dataclass, and then the peak
+memory of loading a thread of that size through the repository, as a bare
+page of messages and as a case with its whole thread.
+
+Run from the repository root:
+    python -m benchmarks.bench_entities [--messages N]
+"""
+import argparse
+import gc
+import logging
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from uuid import UUID, uuid4
+from benchmarks._support import benchmark_database
+from domain.entities import Message
+
+@dataclass
+class DictMessage:
+    """The message entity as it was before slots, for comparison."""
+    id: UUID
+    case_id: UUID
+    content: str
+    created_at: datetime
+
+def _measure(build):
+    """Return the result of build() and the memory it still holds and peaked at, in bytes."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak
+
+def bench_entities(count):
+    case_id = uuid4()
+    now = datetime.utcnow()
+    rows = [(uuid4(), f"Message {i}", now + timedelta(microseconds=i)) for i in range(count)]
+
+    print(f"Holding {count} message entities (fields shared, so only the entities are counted)")
+    print(f"{'entity':<22} {'MiB':>8} {'bytes/msg':>10}")
+    for name, cls in (("plain dataclass", DictMessage), ("slotted, frozen", Message)):
+        entities, current, _ = _measure(lambda: [cls(id, case_id, content, created_at)
+                                                  for id, content, created_at in rows])
+        print(f"{name:<22} {current / 2**20:>8.1f} {current / count:>10.0f}")
+        del entities
+
+def bench_hydration(count):
+    with benchmark_database():
+        from app import app, db
+        from infrastructure.routes import case_repository, case_service, message_repository, message_service
+        with app.app_context():
+            db.create_all()
+            case = case_service.create_case("Benchmark", "Benchmark case", 1)
+            message_service.add_messages(case.id, [f"Benchmark message {i}" for i in range(count)])
+
+            print(f"\nHydrating a thread of {count} messages from SQLite")
+            print(f"{'read':<22} {'held MiB':>9} {'peak MiB':>9}")
+            reads = [
+                ("case header", lambda: case_repository.get_header(case.id)),
+                ("page of messages", lambda: message_repository.get_by_case(case.id, count, 0)),
+                ("case with thread", lambda: case_repository.get(case.id)),
+            ]
+            for name, read in reads:
+                db.session.expunge_all()
+                result, current, peak = _measure(read)
+                print(f"{name:<22} {current / 2**20:>9.1f} {peak / 2**20:>9.1f}")
+                del result
+            db.session.remove()
+            db.engine.dispose()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=100_000, help="messages to hydrate")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    bench_entities(args.messages)
+    bench_hydration(args.messages)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark of JSON serialization for list responses.
+
+Compares the hand-built payloads encoded by the stdlib `json` module, as the
+routes used to do, with the shared serializers on the stdlib fallback and on
+orjson, first for encoding alone and then end to end through the list
+endpoints against a temporary SQLite database.
+
+Run from the repository root:
+    python -m benchmarks.bench_serializers [--items N] [--number N]
+"""
+import argparse
+import json
+import logging
+from benchmarks._support import benchmark_database, per_call_us
+from domain.entities import SupportCase, Message
+from infrastructure import serializers
+from infrastructure.serializers import message_to_dict, json_representation, stdlib_dumps
+
+def _hand_built(messages):
+    # The payload the routes built before the serializers existed
+    return json.dumps({"messages": [{
+        'id': str(message.id),
+        'case_id': str(message.case_id),
+        'content': message.content,
+        'created_at': message.created_at.isoformat()
+    } for message in messages], "pagination": {"limit": len(messages)}}) + "\n"
+
+def _serialized(messages, dumps):
+    return dumps({"messages": [message_to_dict(message) for message in messages],
+                  "pagination": {"limit": len(messages)}})
+
+def _encoders():
+    encoders = [("stdlib", stdlib_dumps)]
+    if serializers.orjson is not None:
+        encoders.append(("orjson", serializers.orjson_dumps))
+    return encoders
+
+def bench_encoding(items, number):
+    case = SupportCase.create("Benchmark", "Benchmark case", 1)
+    messages = [Message.create(case.id, f"Benchmark message {i} " * 4) for i in range(items)]
+
+    baseline = per_call_us(lambda: _hand_built(messages), number)
+    print(f"Encoding {items} messages")
+    print(f"{'encoder':<22} {'us/call':>10} {'speedup':>8}")
+    print(f"{'hand-built + json':<22} {baseline:>10.1f} {1:>7.1f}x")
+    for name, dumps in _encoders():
+        elapsed = per_call_us(lambda: _serialized(messages, dumps), number)
+        print(f"{'serializers + ' + name:<22} {elapsed:>10.1f} {baseline / elapsed:>7.1f}x")
+
+def bench_endpoints(items, number):
+    with benchmark_database():
+        from app import app, api, db
+        from infrastructure.routes import case_service, message_service
+        with app.app_context():
+            db.create_all()
+            for i in range(items):
+                case = case_service.create_case(f"Benchmark {i}", "Benchmark case", 1)
+            message_service.add_messages(case.id, [f"Benchmark message {i}" for i in range(items)])
+
+            client = app.test_client()
+            endpoints = [("GET /api/cases", f"/api/cases?limit={items}"),
+                         ("GET .../messages", f"/api/cases/{case.id}/messages?limit={items}")]
+            print(f"\nEnd to end, {items} items per response")
+            print(f"{'endpoint':<22} " + " ".join(f"{name + ' us':>12}" for name, _ in _encoders()))
+            for label, url in endpoints:
+                timings = []
+                for _, dumps in _encoders():
+                    api.representations['application/json'] = json_representation(dumps)
+                    timings.append(per_call_us(lambda: client.get(url), max(number // 10, 1)))
+                print(f"{label:<22} " + " ".join(f"{elapsed:>12.1f}" for elapsed in timings))
+            db.session.remove()
+            db.engine.dispose()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100, help="cases and messages per list response")
+    parser.add_argument("--number", type=int, default=500, help="calls per timing run")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    bench_encoding(args.items, args.number)
+    bench_endpoints(args.items, args.number)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Micro-benchmark of per-request JSON schema validation.
+
+Compares `jsonschema.validate`, which checks the schema and builds a new
+validator on every call, with the validators compiled once in `validators`.
+
+Run from the repository root:
+    python -m benchmarks.bench_validators [--number N]
+"""
+import argparse
+import logging
+from jsonschema import validate, ValidationError
+from benchmarks._support import per_call_us
+from schemas import SUPPORT_CASE_SCHEMA, MESSAGE_SCHEMA
+from validators import validate_support_case, validate_message
+
+VALID_CASE = {"summary": "Printer on fire", "description": "It is still on fire", "customer_id": 42}
+INVALID_CASE = {"summary": "", "customer_id": 0, "priority": "high"}
+VALID_MESSAGE = {"content": "Have you tried turning it off and on again?"}
+
+def _validate_per_call(data, schema):
+    try:
+        validate(instance=data, schema=schema)
+        return True
+    except ValidationError:
+        return False
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=5000, help="calls per timing run")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    cases = [
+        ("valid support case", VALID_CASE, SUPPORT_CASE_SCHEMA, validate_support_case),
+        ("invalid support case", INVALID_CASE, SUPPORT_CASE_SCHEMA, validate_support_case),
+        ("valid message", VALID_MESSAGE, MESSAGE_SCHEMA, validate_message),
+    ]
+    print(f"{'payload':<22} {'validate() us':>14} {'compiled us':>12} {'speedup':>8}")
+    for name, data, schema, compiled in cases:
+        before = per_call_us(lambda: _validate_per_call(data, schema), args.number)
+        after = per_call_us(lambda: compiled(data), args.number)
+        print(f"{name:<22} {before:>14.2f} {after:>12.2f} {before / after:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
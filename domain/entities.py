@@ -4,35 +4,57 @@ from datetime import datetime
 from typing import List, Optional
 from uuid import UUID, uuid4
 
-@dataclass
+@dataclass(slots=True)
 class SupportCase:
-    """Support case entity representing a customer support ticket."""
+    """Support case entity representing a customer support ticket.
+
+    messages is None when the thread was not loaded, which is the case for
+    every read except SupportCaseRepository.get.
+    """
     id: UUID
     summary: str
     description: str
     customer_id: int
     created_at: datetime
-    messages: List['Message']
+    messages: Optional[List['Message']] = None
+    message_count: int = 0
+    last_message_at: Optional[datetime] = None
+    version: int = 1
+    updated_at: Optional[datetime] = None
 
     @classmethod
-    def create(cls, summary: str, description: str, customer_id: int) -> 'SupportCase':
+    def create(cls, summary: str, description: str, customer_id: int,
+               case_id: Optional[UUID] = None) -> 'SupportCase':
         """Factory method to create a new support case."""
+        now = datetime.utcnow()
         return cls(
-            id=uuid4(),
+            id=case_id or uuid4(),
             summary=summary,
             description=description,
             customer_id=customer_id,
-            created_at=datetime.utcnow(),
-            messages=[]
+            created_at=now,
+            messages=[],
+            updated_at=now
         )
 
     def add_message(self, content: str) -> 'Message':
         """Add a new message to this support case."""
         message = Message.create(self.id, content)
-        self.messages.append(message)
+        if self.messages is not None:
+            self.messages.append(message)
         return message
 
-@dataclass
+@dataclass(slots=True, frozen=True)
+class CaseRevision:
+    """Revision of a support case, advanced by every change to it or its thread.
+
+    version grows by one per change; updated_at is when the last one happened.
+    """
+    case_id: UUID
+    version: int
+    updated_at: datetime
+
+@dataclass(slots=True, frozen=True)
 class Message:
     """Message entity representing a communication in a support case."""
     id: UUID
@@ -41,11 +63,11 @@ class Message:
     created_at: datetime
 
     @classmethod
-    def create(cls, case_id: UUID, content: str) -> 'Message':
+    def create(cls, case_id: UUID, content: str, created_at: Optional[datetime] = None) -> 'Message':
         """Factory method to create a new message."""
         return cls(
             id=uuid4(),
             case_id=case_id,
             content=content,
-            created_at=datetime.utcnow()
+            created_at=created_at or datetime.utcnow()
         )
@@ -0,0 +1,12 @@
+"""Interfaces for announcing domain changes to interested parties."""
+from abc import ABC, abstractmethod
+from typing import List
+from .entities import Message
+
+class MessagePublisher(ABC):
+    """Interface for announcing messages once they are stored."""
+    
+    @abstractmethod
+    def publish(self, messages: List[Message]) -> None:
+        """Announce newly committed messages; must not block on slow consumers."""
+        pass
@@ -0,0 +1,20 @@
+"""Value objects for keyset pagination."""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Generic, List, Optional, TypeVar
+from uuid import UUID
+
+T = TypeVar('T')
+
+@dataclass(frozen=True)
+class Position:
+    """Keyset position of a row in a (created_at, id) ordering."""
+    created_at: datetime
+    id: UUID
+
+@dataclass
+class Page(Generic[T]):
+    """A slice of an ordered result set and the position to resume from."""
+    items: List[T]
+    next_position: Optional[Position] = None
+    total: Optional[int] = None
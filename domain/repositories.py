@@ -1,8 +1,10 @@
 """Repository interfaces for the domain."""
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import Iterator, List, Optional
 from uuid import UUID
-from .entities import SupportCase, Message
+from .entities import CaseRevision, SupportCase, Message
+from .pagination import Page, Position
 
 class SupportCaseRepository(ABC):
     """Interface for support case persistence."""
@@ -12,24 +14,75 @@ class SupportCaseRepository(ABC):
         """Retrieve a support case by ID."""
         pass
     
+    @abstractmethod
+    def get_header(self, case_id: UUID, min_version: Optional[int] = None) -> Optional[SupportCase]:
+        """Retrieve a support case by ID without loading its messages.
+
+        A copy kept by a cache is only returned if its version is at least min_version.
+        """
+        pass
+    
+    @abstractmethod
+    def exists(self, case_id: UUID) -> bool:
+        """Check whether a support case exists."""
+        pass
+    
+    @abstractmethod
+    def get_revision(self, case_id: UUID) -> Optional[CaseRevision]:
+        """Read the current revision of a support case, or None if it does not exist."""
+        pass
+    
     @abstractmethod
     def get_all(self) -> List[SupportCase]:
         """Retrieve all support cases."""
         pass
     
+    @abstractmethod
+    def get_page(self, limit: int = 20, after: Optional[Position] = None, customer_id: Optional[int] = None,
+                 created_from: Optional[datetime] = None, created_to: Optional[datetime] = None,
+                 by_activity: bool = False) -> Page[SupportCase]:
+        """Retrieve a page of support cases, newest first, without their messages.
+
+        With by_activity, cases are ordered by their latest message (or creation,
+        if they have none) and the positions carry that time.
+        """
+        pass
+    
+    @abstractmethod
+    def stream(self, after: Optional[Position] = None, customer_id: Optional[int] = None,
+               created_from: Optional[datetime] = None, created_to: Optional[datetime] = None,
+               by_activity: bool = False) -> Iterator[SupportCase]:
+        """Yield every support case get_page would list from a keyset position on, without their messages.
+
+        Rows are fetched in batches from a server-side cursor, so memory stays
+        flat however many cases match.
+        """
+        pass
+    
     @abstractmethod
     def add(self, case: SupportCase) -> None:
         """Add a new support case."""
         pass
     
     @abstractmethod
-    def update(self, case: SupportCase) -> None:
-        """Update an existing support case."""
+    def update(self, case_id: UUID, summary: str, description: str, customer_id: int) -> Optional[SupportCase]:
+        """Update the fields of a support case in a single statement.
+
+        Returns the updated case without its messages, or None if it does not exist.
+        """
         pass
     
     @abstractmethod
-    def delete(self, case_id: UUID) -> None:
-        """Delete a support case."""
+    def upsert_many(self, cases: List[SupportCase]) -> List[bool]:
+        """Insert or update several support cases in a single transaction.
+
+        Returns, for each case, True if it was inserted and False if it was updated.
+        """
+        pass
+    
+    @abstractmethod
+    def delete(self, case_id: UUID) -> bool:
+        """Delete a support case and its messages in a single statement; returns whether it existed."""
         pass
 
 class MessageRepository(ABC):
@@ -39,13 +92,114 @@ class MessageRepository(ABC):
     def get_by_case(self, case_id: UUID, limit: int = 10, offset: int = 0) -> tuple[List[Message], int]:
         """Retrieve messages for a case with pagination."""
         pass
+
+    @abstractmethod
+    def get_page_by_case(self, case_id: UUID, limit: int = 10, after: Optional[Position] = None,
+                         include_total: bool = False) -> Page[Message]:
+        """Retrieve messages for a case, newest first, starting after a keyset position.
+
+        The total is only counted when include_total is set.
+        """
+        pass
+
+    @abstractmethod
+    def get_page_since(self, case_id: UUID, since: Position, limit: int = 10) -> Page[Message]:
+        """Retrieve messages for a case created strictly after a keyset position, oldest first."""
+        pass
+
+    @abstractmethod
+    def stream_by_case(self, case_id: UUID, after: Optional[Position] = None) -> Iterator[Message]:
+        """Yield every message of a case, newest first, starting after a keyset position.
+
+        Rows are fetched in batches from a server-side cursor, so memory stays
+        flat however long the thread is.
+        """
+        pass
     
     @abstractmethod
     def add(self, message: Message) -> None:
         """Add a new message."""
         pass
     
+    @abstractmethod
+    def add_many(self, messages: List[Message]) -> None:
+        """Add several messages in a single transaction."""
+        pass
+    
     @abstractmethod
     def delete(self, message_id: UUID) -> None:
         """Delete a message."""
         pass
+
+class AsyncSupportCaseRepository(ABC):
+    """Asynchronous interface for support case persistence."""
+    
+    @abstractmethod
+    async def get(self, case_id: UUID) -> Optional[SupportCase]:
+        """Retrieve a support case by ID."""
+        pass
+    
+    @abstractmethod
+    async def get_header(self, case_id: UUID) -> Optional[SupportCase]:
+        """Retrieve a support case by ID without loading its messages."""
+        pass
+    
+    @abstractmethod
+    async def exists(self, case_id: UUID) -> bool:
+        """Check whether a support case exists."""
+        pass
+    
+    @abstractmethod
+    async def get_page(self, limit: int = 20, after: Optional[Position] = None, customer_id: Optional[int] = None,
+                       created_from: Optional[datetime] = None, created_to: Optional[datetime] = None,
+                       by_activity: bool = False) -> Page[SupportCase]:
+        """Retrieve a page of support cases, newest or most recently active first, without their messages."""
+        pass
+    
+    @abstractmethod
+    async def add(self, case: SupportCase) -> None:
+        """Add a new support case."""
+        pass
+    
+    @abstractmethod
+    async def update(self, case_id: UUID, summary: str, description: str,
+                     customer_id: int) -> Optional[SupportCase]:
+        """Update the fields of a support case in a single statement.
+
+        Returns the updated case without its messages, or None if it does not exist.
+        """
+        pass
+    
+    @abstractmethod
+    async def delete(self, case_id: UUID) -> bool:
+        """Delete a support case and its messages in a single statement; returns whether it existed."""
+        pass
+
+class AsyncMessageRepository(ABC):
+    """Asynchronous interface for message persistence."""
+    
+    @abstractmethod
+    async def get_by_case(self, case_id: UUID, limit: int = 10, offset: int = 0) -> tuple[List[Message], int]:
+        """Retrieve messages for a case with pagination."""
+        pass
+    
+    @abstractmethod
+    async def get_page_by_case(self, case_id: UUID, limit: int = 10, after: Optional[Position] = None,
+                               include_total: bool = False) -> Page[Message]:
+        """Retrieve messages for a case, newest first, starting after a keyset position."""
+        pass
+    
+    @abstractmethod
+    async def add(self, message: Message) -> None:
+        """Add a new message."""
+        pass
+    
+    @abstractmethod
+    async def add_many(self, messages: List[Message]) -> None:
+        """Add several messages in a single transaction."""
+        pass
+    
+    @abstractmethod
+    async def delete(self, message_id: UUID) -> None:
+        """Delete a message."""
+        pass
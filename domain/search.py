@@ -0,0 +1,33 @@
+"""Interfaces for full-text search over cases and messages."""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import List, Optional
+from uuid import UUID
+
+CASE = 'case'
+MESSAGE = 'message'
+
+@dataclass(frozen=True)
+class SearchHit:
+    """A case or message matching a search, with its relevance and a highlighted excerpt."""
+    kind: str
+    id: UUID
+    case_id: UUID
+    rank: float
+    snippet: str
+
+class SearchIndex(ABC):
+    """Interface for a full-text index over case and message text.
+
+    Implementations keep the index current as cases and messages are added,
+    updated and deleted, so searches never need a separate reindexing step.
+    """
+    
+    @abstractmethod
+    def search(self, query: str, limit: int = 20, offset: int = 0,
+               kind: Optional[str] = None) -> List[SearchHit]:
+        """Return hits for a free-text query, most relevant first.
+
+        kind restricts results to CASE or MESSAGE hits.
+        """
+        pass
@@ -0,0 +1,48 @@
+"""Asynchronous database engine configuration for the ASGI serving mode."""
+import os
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from infrastructure.database import enable_sqlite_foreign_keys
+from infrastructure.pool import engine_options_from_env
+
+# Async drivers replacing the synchronous ones of DATABASE_URL
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite"
+}
+
+def to_async_url(database_url: str, instance_path: str) -> str:
+    """Translate a synchronous DATABASE_URL into its asyncio equivalent.
+
+    Relative SQLite paths are resolved against instance_path, as
+    Flask-SQLAlchemy does, so both serving modes share one database file.
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver configured for {backend!r}")
+
+    if backend == "sqlite" and url.database and url.database != ":memory:" and not os.path.isabs(url.database):
+        url = url.set(database=os.path.join(instance_path, url.database))
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+def create_session_factory(engine: AsyncEngine) -> async_sessionmaker:
+    """Create the session factory used by the async repositories."""
+    # Entities are built from loaded rows, so nothing is read after commit
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+def create_engine_from_url(database_url: str, instance_path: str, **options) -> AsyncEngine:
+    """Create an async engine for DATABASE_URL."""
+    engine = create_async_engine(to_async_url(database_url, instance_path), **options)
+    enable_sqlite_foreign_keys(engine.sync_engine)
+    return engine
+
+def async_engine_options_from_env(database_url: str, environ) -> dict:
+    """Build async engine options from the same DB_* variables as the sync engine."""
+    options = engine_options_from_env(database_url, environ)
+    # The instrumented pool and psycopg2 connect arguments only apply to the sync engine
+    options.pop("poolclass", None)
+    options.pop("connect_args", None)
+    if "DB_STATEMENT_TIMEOUT_MS" in environ and make_url(database_url).get_backend_name() == "postgresql":
+        options["connect_args"] = {"server_settings": {"statement_timeout": environ["DB_STATEMENT_TIMEOUT_MS"]}}
+    return options
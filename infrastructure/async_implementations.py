@@ -0,0 +1,198 @@
+"""SQLAlchemy asyncio implementations of the async repository interfaces."""
+from datetime import datetime
+from typing import List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import and_, delete, desc, exists, or_, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import selectinload
+from domain.entities import SupportCase, Message
+from domain.pagination import Page, Position
+from domain.repositories import AsyncSupportCaseRepository, AsyncMessageRepository
+from infrastructure.models import CASE_HEADER_COLUMNS, SupportCaseModel, MessageModel, messages_removed, revised
+from infrastructure.infrastructure_implementations import case_listing_statement, message_insert_statements
+
+class AsyncSQLAlchemySupportCaseRepository(AsyncSupportCaseRepository):
+    """SQLAlchemy asyncio implementation of the support case repository."""
+    
+    def __init__(self, session_factory: async_sessionmaker):
+        self.session_factory = session_factory
+    
+    async def get(self, case_id: UUID) -> Optional[SupportCase]:
+        async with self.session_factory() as session:
+            model = await session.scalar(
+                select(SupportCaseModel)
+                .options(selectinload(SupportCaseModel.messages))
+                .where(SupportCaseModel.id == case_id)
+            )
+            return self._to_entity(model) if model else None
+    
+    async def get_header(self, case_id: UUID) -> Optional[SupportCase]:
+        async with self.session_factory() as session:
+            row = (await session.execute(
+                select(*CASE_HEADER_COLUMNS).where(SupportCaseModel.id == case_id)
+            )).first()
+            return self._row_to_header_entity(row) if row else None
+    
+    async def exists(self, case_id: UUID) -> bool:
+        async with self.session_factory() as session:
+            return await session.scalar(select(exists().where(SupportCaseModel.id == case_id)))
+    
+    async def get_page(self, limit: int = 20, after: Optional[Position] = None, customer_id: Optional[int] = None,
+                       created_from: Optional[datetime] = None, created_to: Optional[datetime] = None,
+                       by_activity: bool = False) -> Page[SupportCase]:
+        statement = case_listing_statement(after, customer_id, created_from, created_to, by_activity)
+        async with self.session_factory() as session:
+            rows = (await session.execute(statement.limit(limit + 1))).all()
+
+        cases = [self._row_to_header_entity(row) for row in rows[:limit]]
+        next_position = None
+        if len(rows) > limit:
+            last = cases[-1]
+            sort_value = (last.last_message_at or last.created_at) if by_activity else last.created_at
+            next_position = Position(sort_value, last.id)
+        return Page(cases, next_position)
+    
+    async def add(self, case: SupportCase) -> None:
+        async with self.session_factory() as session:
+            session.add(SupportCaseModel(
+                id=case.id,
+                summary=case.summary,
+                description=case.description,
+                customer_id=case.customer_id,
+                created_at=case.created_at,
+                updated_at=case.updated_at
+            ))
+            await session.commit()
+    
+    async def update(self, case_id: UUID, summary: str, description: str,
+                     customer_id: int) -> Optional[SupportCase]:
+        async with self.session_factory() as session:
+            row = (await session.execute(
+                update(SupportCaseModel)
+                .where(SupportCaseModel.id == case_id)
+                .values(**revised(summary=summary, description=description, customer_id=customer_id))
+                .returning(*CASE_HEADER_COLUMNS)
+            )).first()
+            await session.commit()
+            return self._row_to_header_entity(row) if row else None
+    
+    async def delete(self, case_id: UUID) -> bool:
+        async with self.session_factory() as session:
+            # Messages go with the case through ON DELETE CASCADE
+            deleted = await session.scalar(
+                delete(SupportCaseModel).where(SupportCaseModel.id == case_id).returning(SupportCaseModel.id)
+            )
+            await session.commit()
+            return deleted is not None
+    
+    def _to_entity(self, model: SupportCaseModel) -> SupportCase:
+        return SupportCase(
+            id=model.id,
+            summary=model.summary,
+            description=model.description,
+            customer_id=model.customer_id,
+            created_at=model.created_at,
+            messages=[AsyncSQLAlchemyMessageRepository._to_entity(m) for m in model.messages],
+            message_count=model.message_count,
+            last_message_at=model.last_message_at,
+            version=model.version,
+            updated_at=model.updated_at
+        )
+    
+    def _row_to_header_entity(self, row) -> SupportCase:
+        return SupportCase(
+            id=row.id,
+            summary=row.summary,
+            description=row.description,
+            customer_id=row.customer_id,
+            created_at=row.created_at,
+            messages=None,
+            message_count=row.message_count,
+            last_message_at=row.last_message_at,
+            version=row.version,
+            updated_at=row.updated_at
+        )
+
+class AsyncSQLAlchemyMessageRepository(AsyncMessageRepository):
+    """SQLAlchemy asyncio implementation of the message repository."""
+    
+    # Rows per multi-row INSERT, keeping bound parameters under driver limits
+    INSERT_CHUNK_SIZE = 1000
+    
+    def __init__(self, session_factory: async_sessionmaker):
+        self.session_factory = session_factory
+    
+    async def get_by_case(self, case_id: UUID, limit: int = 10, offset: int = 0) -> Tuple[List[Message], int]:
+        async with self.session_factory() as session:
+            total = await self._count(session, case_id)
+            models = await session.scalars(
+                select(MessageModel)
+                .where(MessageModel.case_id == case_id)
+                .order_by(desc(MessageModel.created_at), desc(MessageModel.id))
+                .limit(limit)
+                .offset(offset)
+            )
+            return [self._to_entity(model) for model in models], total
+    
+    async def get_page_by_case(self, case_id: UUID, limit: int = 10, after: Optional[Position] = None,
+                               include_total: bool = False) -> Page[Message]:
+        query = select(MessageModel).where(MessageModel.case_id == case_id)
+        if after is not None:
+            query = query.where(or_(
+                MessageModel.created_at < after.created_at,
+                and_(MessageModel.created_at == after.created_at, MessageModel.id < after.id)
+            ))
+        # Fetch one extra row to learn whether another page follows
+        query = query.order_by(desc(MessageModel.created_at), desc(MessageModel.id)).limit(limit + 1)
+
+        async with self.session_factory() as session:
+            total = None
+            if include_total:
+                total = await self._count(session, case_id)
+            models = list(await session.scalars(query))
+
+        messages = [self._to_entity(model) for model in models[:limit]]
+        next_position = None
+        if len(models) > limit:
+            next_position = Position(messages[-1].created_at, messages[-1].id)
+        return Page(messages, next_position, total)
+    
+    async def add(self, message: Message) -> None:
+        async with self.session_factory() as session:
+            session.add(MessageModel(
+                id=message.id,
+                case_id=message.case_id,
+                content=message.content,
+                created_at=message.created_at
+            ))
+            await session.commit()
+    
+    async def add_many(self, messages: List[Message]) -> None:
+        async with self.session_factory() as session:
+            for statement in message_insert_statements(messages, self.INSERT_CHUNK_SIZE):
+                await session.execute(statement)
+            await session.commit()
+    
+    async def delete(self, message_id: UUID) -> None:
+        async with self.session_factory() as session:
+            case_id = await session.scalar(
+                delete(MessageModel).where(MessageModel.id == message_id).returning(MessageModel.case_id)
+            )
+            if case_id is not None:
+                await session.execute(messages_removed(case_id, 1))
+            await session.commit()
+    
+    @staticmethod
+    async def _count(session, case_id: UUID) -> int:
+        # Read the denormalized counter instead of counting the thread
+        count = await session.scalar(select(SupportCaseModel.message_count).where(SupportCaseModel.id == case_id))
+        return count or 0
+    
+    @staticmethod
+    def _to_entity(model: MessageModel) -> Message:
+        return Message(
+            id=model.id,
+            case_id=model.case_id,
+            content=model.content,
+            created_at=model.created_at
+        )
@@ -0,0 +1,261 @@
+"""Read-through caching of support case headers."""
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Iterator, List, Optional
+from uuid import UUID
+from domain.entities import CaseRevision, SupportCase
+from domain.pagination import Page, Position
+from domain.repositories import SupportCaseRepository
+
+class CacheBackend(ABC):
+    """Interface for a cache shared between processes, such as Redis or memcached."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Return the value stored under key, or None if absent or expired."""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: str, ttl: float) -> None:
+        """Store value under key for ttl seconds."""
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove key."""
+        pass
+
+class InMemoryCacheBackend(CacheBackend):
+    """Process-local stand-in for a shared cache backend."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if self._clock() >= expires_at:
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (value, self._clock() + ttl)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+class LRUTTLCache:
+    """Thread-safe in-process cache bounded by entry count and age."""
+
+    def __init__(self, max_size: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if self._clock() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value) -> None:
+        with self._lock:
+            self._entries[key] = (value, self._clock() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class CachingSupportCaseRepository(SupportCaseRepository):
+    """Support case repository decorator caching case headers.
+
+    Headers are looked up in a bounded LRU+TTL tier in this process, then in an
+    optional shared tier, then in the wrapped repository. Writes made through
+    this repository invalidate both tiers; full aggregates with messages and
+    listings are never cached.
+
+    When writes are staged in a unit of work, pass its after_commit so entries
+    are also dropped once the writes commit; a read between the write and the
+    commit would otherwise cache the old header again.
+    """
+
+    def __init__(self, inner: SupportCaseRepository, max_size: int = 1024, ttl: float = 30.0,
+                 shared: Optional[CacheBackend] = None, shared_ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 after_commit: Optional[Callable[[Callable[[], None]], None]] = None):
+        self.inner = inner
+        self.after_commit = after_commit
+        self.local = LRUTTLCache(max_size, ttl, clock)
+        self.shared = shared
+        self.shared_ttl = shared_ttl if shared_ttl is not None else ttl
+        self._lock = threading.Lock()
+        self._stats = {"local_hits": 0, "local_misses": 0, "shared_hits": 0, "shared_misses": 0,
+                       "stale_hits": 0, "invalidations": 0}
+
+    def get(self, case_id: UUID) -> Optional[SupportCase]:
+        return self.inner.get(case_id)
+
+    def get_header(self, case_id: UUID, min_version: Optional[int] = None) -> Optional[SupportCase]:
+        data = self._lookup(case_id)
+        if data is not None and min_version is not None and data['version'] < min_version:
+            # Written elsewhere since it was cached, e.g. by another worker
+            self._count("stale_hits")
+            data = None
+        if data is None:
+            case = self.inner.get_header(case_id)
+            if case is None:
+                return None
+            data = self._to_data(case)
+            self._store(case_id, data)
+        return self._from_data(data)
+
+    def exists(self, case_id: UUID) -> bool:
+        # Always current: a case deleted by another worker must not take new messages
+        return self.inner.exists(case_id)
+
+    def get_revision(self, case_id: UUID) -> Optional[CaseRevision]:
+        # Always current: it decides whether a client's copy is still fresh
+        return self.inner.get_revision(case_id)
+
+    def get_all(self) -> List[SupportCase]:
+        return self.inner.get_all()
+
+    def get_page(self, limit: int = 20, after: Optional[Position] = None, customer_id: Optional[int] = None,
+                 created_from: Optional[datetime] = None, created_to: Optional[datetime] = None,
+                 by_activity: bool = False) -> Page[SupportCase]:
+        return self.inner.get_page(limit, after, customer_id, created_from, created_to, by_activity)
+
+    def stream(self, after: Optional[Position] = None, customer_id: Optional[int] = None,
+               created_from: Optional[datetime] = None, created_to: Optional[datetime] = None,
+               by_activity: bool = False) -> Iterator[SupportCase]:
+        return self.inner.stream(after, customer_id, created_from, created_to, by_activity)
+
+    def add(self, case: SupportCase) -> None:
+        self.inner.add(case)
+        self._invalidate_written([case.id])
+
+    def update(self, case_id: UUID, summary: str, description: str, customer_id: int) -> Optional[SupportCase]:
+        case = self.inner.update(case_id, summary, description, customer_id)
+        self._invalidate_written([case_id])
+        return case
+
+    def upsert_many(self, cases: List[SupportCase]) -> List[bool]:
+        try:
+            return self.inner.upsert_many(cases)
+        finally:
+            self._invalidate_written([case.id for case in cases])
+
+    def delete(self, case_id: UUID) -> bool:
+        deleted = self.inner.delete(case_id)
+        self._invalidate_written([case_id])
+        return deleted
+
+    def invalidate(self, case_id: UUID) -> None:
+        """Drop a case header from every tier."""
+        self.local.delete(case_id)
+        if self.shared is not None:
+            self.shared.delete(self._shared_key(case_id))
+        self._count("invalidations")
+
+    def _invalidate_written(self, case_ids: List[UUID]) -> None:
+        def invalidate_all():
+            for case_id in case_ids:
+                self.invalidate(case_id)
+
+        invalidate_all()
+        if self.after_commit is not None:
+            self.after_commit(invalidate_all)
+
+    def stats(self) -> dict:
+        """Return hit/miss counters per tier and the local tier size."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["local_size"] = len(self.local)
+        return stats
+
+    def _lookup(self, case_id: UUID) -> Optional[dict]:
+        data = self.local.get(case_id)
+        if data is not None:
+            self._count("local_hits")
+            return data
+        self._count("local_misses")
+
+        if self.shared is None:
+            return None
+        raw = self.shared.get(self._shared_key(case_id))
+        if raw is None:
+            self._count("shared_misses")
+            return None
+        self._count("shared_hits")
+        data = json.loads(raw)
+        self.local.set(case_id, data)
+        return data
+
+    def _store(self, case_id: UUID, data: dict) -> None:
+        self.local.set(case_id, data)
+        if self.shared is not None:
+            self.shared.set(self._shared_key(case_id), json.dumps(data), self.shared_ttl)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    @staticmethod
+    def _shared_key(case_id: UUID) -> str:
+        return f"support_case:header:{case_id}"
+
+    @staticmethod
+    def _to_data(case: SupportCase) -> dict:
+        return {
+            'id': str(case.id),
+            'summary': case.summary,
+            'description': case.description,
+            'customer_id': case.customer_id,
+            'created_at': case.created_at.isoformat(),
+            'message_count': case.message_count,
+            'last_message_at': case.last_message_at.isoformat() if case.last_message_at else None,
+            'version': case.version,
+            'updated_at': case.updated_at.isoformat() if case.updated_at else None
+        }
+
+    @staticmethod
+    def _from_data(data: dict) -> SupportCase:
+        # A fresh entity per read, so callers cannot mutate the cached copy
+        return SupportCase(
+            id=UUID(data['id']),
+            summary=data['summary'],
+            description=data['description'],
+            customer_id=data['customer_id'],
+            created_at=datetime.fromisoformat(data['created_at']),
+            messages=None,
+            message_count=data['message_count'],
+            last_message_at=datetime.fromisoformat(data['last_message_at']) if data['last_message_at'] else None,
+            version=data['version'],
+            updated_at=datetime.fromisoformat(data['updated_at']) if data['updated_at'] else None
+        )
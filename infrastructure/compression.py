@@ -0,0 +1,107 @@
+"""Negotiated compression of API responses.
+
+JSON compresses several times over, so large listings and exports are sent
+with the best encoding the client accepts: brotli when the optional brotli
+package is installed, gzip otherwise. Bodies below a size threshold go out
+as they are, since compressing them costs more time than it saves. Streamed
+bodies are compressed chunk by chunk as they are produced, so they are never
+held in memory whole.
+"""
+import zlib
+from typing import Iterable, Iterator, Union
+from flask import Flask, current_app, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Media types worth compressing; event streams are left alone so every event is flushed as it happens
+COMPRESSIBLE_MIMETYPES = frozenset({'application/json', 'application/x-ndjson'})
+
+# Brotli quality suited to responses compressed on the fly, rather than ahead of time
+BROTLI_QUALITY = 5
+
+class GzipCompressor:
+    """Incremental gzip encoder."""
+
+    def __init__(self, level: int):
+        self._encoder = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._encoder.compress(data)
+
+    def flush(self) -> bytes:
+        """Emit everything compressed so far, so the client can decode it already."""
+        return self._encoder.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._encoder.flush()
+
+class BrotliCompressor:
+    """Incremental brotli encoder."""
+
+    def __init__(self, quality: int = BROTLI_QUALITY):
+        self._encoder = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._encoder.process(data)
+
+    def flush(self) -> bytes:
+        """Emit everything compressed so far, so the client can decode it already."""
+        return self._encoder.flush()
+
+    def finish(self) -> bytes:
+        return self._encoder.finish()
+
+# Content codings offered, in order of preference
+ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+def compress_stream(chunks: Iterable[bytes], compressor: Union[GzipCompressor, BrotliCompressor]) -> Iterator[bytes]:
+    """Compress a streamed body chunk by chunk, flushing after each one."""
+    try:
+        for chunk in chunks:
+            if chunk:
+                yield compressor.compress(chunk) + compressor.flush()
+        yield compressor.finish()
+    finally:
+        # Close the wrapped body so its cleanup (such as popping a streamed request context) runs now
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+class ResponseCompression:
+    """Compresses the responses of a Flask app the client accepts compressed."""
+
+    def init_app(self, app: Flask) -> None:
+        """Compress every eligible response of the Flask app."""
+        app.after_request(self._compress)
+
+    def _compress(self, response):
+        config = current_app.config
+        if not config["COMPRESSION_ENABLED"] or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            return response
+        # The body differs by Accept-Encoding whether or not this one is compressed
+        response.vary.add('Accept-Encoding')
+        if (request.method == 'HEAD' or response.status_code < 200 or response.status_code in (204, 304)
+                or response.direct_passthrough or 'Content-Encoding' in response.headers):
+            return response
+
+        encoding = request.accept_encodings.best_match(ENCODINGS)
+        if encoding is None:
+            return response
+        compressor = BrotliCompressor() if encoding == 'br' else GzipCompressor(config["COMPRESSION_LEVEL"])
+
+        if response.is_streamed:
+            # The size of a streamed body is unknown up front; such bodies are large exports
+            response.response = compress_stream(response.response, compressor)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < config["COMPRESSION_MIN_SIZE"]:
+                return response
+            response.set_data(compressor.compress(data) + compressor.finish())
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+response_compression = ResponseCompression()
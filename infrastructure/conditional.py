@@ -0,0 +1,44 @@
+"""HTTP conditional GETs of support cases and their threads.
+
+Responses carry a weak ETag and a Last-Modified date derived from the case
+revision, which is a single primary key lookup. A client sending back a
+validator that still matches gets a 304 before the case or any of its
+messages are loaded.
+"""
+import hashlib
+from datetime import timezone
+from typing import Dict
+from flask import Response, request
+from werkzeug.http import http_date, quote_etag
+from domain.entities import CaseRevision
+
+def etag(revision: CaseRevision) -> str:
+    """Opaque tag of a case revision; the update time tells apart a case recreated under the same id."""
+    key = f"{revision.case_id}:{revision.version}:{revision.updated_at.isoformat()}"
+    return hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+
+def validator_headers(revision: CaseRevision) -> Dict[str, str]:
+    """Headers letting clients revalidate their copy instead of downloading it again."""
+    return {
+        'ETag': quote_etag(etag(revision), weak=True),
+        'Last-Modified': http_date(revision.updated_at),
+        # Caches may keep the response but must revalidate it before each reuse
+        'Cache-Control': 'no-cache'
+    }
+
+def is_not_modified(revision: CaseRevision) -> bool:
+    """Whether the request's validators match the revision.
+
+    If-None-Match takes precedence over If-Modified-Since, whose one-second
+    resolution can miss a change made within the second.
+    """
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag(revision))
+    if request.if_modified_since is not None:
+        modified = revision.updated_at.replace(microsecond=0, tzinfo=timezone.utc)
+        return modified <= request.if_modified_since
+    return False
+
+def not_modified(revision: CaseRevision) -> Response:
+    """Empty 304 response repeating the validators."""
+    return Response(status=304, headers=validator_headers(revision))
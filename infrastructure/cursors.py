@@ -0,0 +1,53 @@
+"""Opaque cursor encoding for keyset pagination."""
+import base64
+import binascii
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID
+from domain.pagination import Position
+
+def encode_cursor(position: Position) -> str:
+    """Encode a keyset position as an opaque, URL-safe token."""
+    raw = f"{position.created_at.isoformat()}|{position.id.hex}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(token: str) -> Position:
+    """Decode a token produced by encode_cursor.
+
+    Raises ValueError if the token is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode()
+        created_at, id_hex = raw.split('|')
+        return Position(datetime.fromisoformat(created_at), UUID(hex=id_hex))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {token!r}") from e
+
+# Sorts after every id, so a position built on it excludes its whole timestamp
+MAX_UUID = UUID(int=(1 << 128) - 1)
+
+def parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse an optional ISO 8601 string into a naive UTC datetime.
+
+    Raises ValueError if the string is malformed.
+    """
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def decode_since(token: str) -> Position:
+    """Decode a cursor, or an ISO 8601 timestamp meaning "strictly after this time".
+
+    Raises ValueError if the token is neither.
+    """
+    try:
+        return decode_cursor(token)
+    except ValueError:
+        pass
+    try:
+        return Position(parse_datetime(token), MAX_UUID)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor or timestamp: {token!r}") from e
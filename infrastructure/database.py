@@ -1,5 +1,6 @@
 """Database configuration and initialization."""
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
 from sqlalchemy.orm import DeclarativeBase
 
 class Base(DeclarativeBase):
@@ -7,3 +8,18 @@ class Base(DeclarativeBase):
 
 # Initialize SQLAlchemy with the base model class
 db = SQLAlchemy(model_class=Base)
+
+def enable_sqlite_foreign_keys(engine) -> None:
+    """Enforce foreign keys, including ON DELETE CASCADE, on every SQLite connection of engine.
+
+    SQLite leaves them off unless each connection asks. Takes a sync engine;
+    pass an async engine's sync_engine. Other databases are left alone.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def _enable_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
@@ -0,0 +1,183 @@
+"""Group commit of message inserts from concurrent requests.
+
+Committing every posted message in its own transaction bounds write
+throughput by the latency of one durable commit (an fsync) per message. The
+writer here queues the messages of concurrent requests and stores them in a
+shared transaction, which commits once a batch is full or a few milliseconds
+after its first message arrived. Each caller blocks until the transaction
+holding its messages has committed, so a 201 still means the message is
+durable.
+"""
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Iterator, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy.engine import Engine
+from domain.entities import Message
+from domain.pagination import Page, Position
+from domain.repositories import MessageRepository
+from infrastructure.infrastructure_implementations import end_read_transaction, message_insert_statements
+
+logger = logging.getLogger(__name__)
+
+class _PendingWrite:
+    """Messages of one caller, waiting for the transaction storing them."""
+
+    def __init__(self, messages: List[Message]):
+        self.messages = messages
+        self.error: Optional[BaseException] = None
+        self.done = threading.Event()
+
+class GroupCommitWriter:
+    """Stores messages in transactions shared by concurrent callers.
+
+    A background thread takes the first pending write, keeps collecting more
+    for up to max_delay seconds or until max_batch messages are queued, and
+    commits them together. If the shared transaction fails, each write of the
+    batch is retried in its own transaction, so one bad write only fails its
+    own caller.
+    """
+
+    def __init__(self, engine: Engine, max_batch: int = 100, max_delay: float = 0.002):
+        self.engine = engine
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.batches = 0
+        self.writes = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def write(self, messages: List[Message]) -> None:
+        """Store messages, returning once they are committed and raising if storing them failed."""
+        pending = _PendingWrite(messages)
+        self._ensure_started()
+        self._queue.put(pending)
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+
+    def close(self) -> None:
+        """Commit what is queued and stop the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and self._pid == os.getpid():
+            self._queue.put(None)
+            thread.join()
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "writes": self.writes,
+            "writes_per_batch": round(self.writes / self.batches, 2) if self.batches else 0.0
+        }
+
+    def _ensure_started(self) -> None:
+        # A thread started before a worker process forked does not exist in the worker
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name="message-group-commit", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch, stop = self._collect(first)
+            self._commit(batch)
+            if stop:
+                return
+
+    def _collect(self, first: _PendingWrite) -> Tuple[List[_PendingWrite], bool]:
+        """Gather the writes queued while the batch is open; also report a stop request."""
+        batch = [first]
+        size = len(first.messages)
+        deadline = time.monotonic() + self.max_delay
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                pending = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if pending is None:
+                return batch, True
+            batch.append(pending)
+            size += len(pending.messages)
+        return batch, False
+
+    def _commit(self, batch: List[_PendingWrite]) -> None:
+        try:
+            self._store([message for pending in batch for message in pending.messages])
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0].error = e
+            else:
+                logger.warning(f"Group commit of {len(batch)} writes failed, retrying them one by one: {str(e)}")
+                for pending in batch:
+                    try:
+                        self._store(pending.messages)
+                    except Exception as error:
+                        pending.error = error
+        finally:
+            self.batches += 1
+            self.writes += len(batch)
+            for pending in batch:
+                pending.done.set()
+
+    def _store(self, messages: List[Message]) -> None:
+        with self.engine.begin() as connection:
+            for statement in message_insert_statements(messages):
+                connection.execute(statement)
+
+class GroupCommitMessageRepository(MessageRepository):
+    """Message repository storing single messages through a GroupCommitWriter.
+
+    Reads, batches and deletes go to the wrapped repository; batches are
+    already one transaction each.
+
+    A group-committed message is stored in the writer's transaction, not in
+    the caller's unit of work: it stays stored even if the use case fails
+    after adding it. Messages added once the unit of work has staged other
+    changes bypass the writer and are committed with those changes.
+    """
+
+    def __init__(self, inner: MessageRepository, writer: GroupCommitWriter):
+        self.inner = inner
+        self.writer = writer
+
+    def get_by_case(self, case_id: UUID, limit: int = 10, offset: int = 0) -> Tuple[List[Message], int]:
+        return self.inner.get_by_case(case_id, limit, offset)
+
+    def get_page_by_case(self, case_id: UUID, limit: int = 10, after: Optional[Position] = None,
+                         include_total: bool = False) -> Page[Message]:
+        return self.inner.get_page_by_case(case_id, limit, after, include_total)
+
+    def get_page_since(self, case_id: UUID, since: Position, limit: int = 10) -> Page[Message]:
+        return self.inner.get_page_since(case_id, since, limit)
+
+    def stream_by_case(self, case_id: UUID, after: Optional[Position] = None) -> Iterator[Message]:
+        return self.inner.stream_by_case(case_id, after)
+
+    def add(self, message: Message) -> None:
+        # End the request's transaction first: waiting while holding its pooled
+        # connection could leave the writer without one once the pool is exhausted.
+        # Changes an enclosing unit of work already staged must commit along with
+        # the message, so it is then staged with them instead
+        if not end_read_transaction():
+            self.inner.add(message)
+            return
+        self.writer.write([message])
+
+    def add_many(self, messages: List[Message]) -> None:
+        self.inner.add_many(messages)
+
+    def delete(self, message_id: UUID) -> None:
+        self.inner.delete(message_id)
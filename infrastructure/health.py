@@ -0,0 +1,61 @@
+"""Database readiness probing for the health endpoints."""
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Optional
+from sqlalchemy import text
+from infrastructure.database import db
+
+class DatabaseProbe:
+    """Checks database readiness with a `SELECT 1` round-trip.
+
+    Results are cached for a caller-supplied number of seconds so that frequent
+    load balancer probes from every worker do not each cost a round-trip.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._result: Optional[dict] = None
+        self._checked_at = 0.0
+
+    def check(self, max_age: float = 0.0) -> dict:
+        """Return the readiness report, reusing one younger than max_age seconds."""
+        with self._lock:
+            now = self._clock()
+            if self._result is not None and now - self._checked_at < max_age:
+                return dict(self._result, cached=True)
+
+        # Probe without the lock, so one slow round-trip does not hold up callers a cached report satisfies
+        result = self._probe()
+        with self._lock:
+            # Keep the report of the latest probe when several overlap
+            if now >= self._checked_at:
+                self._result = result
+                self._checked_at = now
+        return dict(result, cached=False)
+
+    def _probe(self) -> dict:
+        report = {"timestamp": datetime.utcnow().isoformat()}
+        try:
+            start = time.perf_counter()
+            with db.engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+            report["latency_ms"] = round((time.perf_counter() - start) * 1000, 3)
+            report["ready"] = True
+        except Exception as e:
+            report["ready"] = False
+            report["error"] = str(e)
+        report["pool"] = pool_status()
+        return report
+
+def pool_status() -> dict:
+    """Describe the state of the engine's connection pool."""
+    pool = db.engine.pool
+    status = {"class": type(pool).__name__}
+    # Only queue-based pools track size and overflow
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            status[name] = method()
+    return status
@@ -1,11 +1,138 @@
 """SQLAlchemy implementations of repository interfaces."""
-from typing import List, Optional, Tuple
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Callable, Iterator, List, Optional, Tuple
 from uuid import UUID
-from sqlalchemy import desc
+from sqlalchemy import and_, delete, desc, exists, insert, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from infrastructure.database import db
+from application.use_cases import UnitOfWork
 from domain.repositories import SupportCaseRepository, MessageRepository
-from domain.entities import SupportCase, Message
-from infrastructure.models import SupportCaseModel, MessageModel
+from domain.entities import CaseRevision, SupportCase, Message
+from domain.pagination import Page, Position
+from infrastructure.models import (CASE_HEADER_COLUMNS, SupportCaseModel, MessageModel, case_activity,
+                                   case_revised_at, messages_added, messages_removed, revised)
+
+# Rows fetched per round trip when streaming listings from a server-side cursor
+STREAM_BATCH_SIZE = 500
+
+# INSERT constructs supporting ON CONFLICT, by dialect name
+UPSERT_INSERTS = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
+
+class _OpenUnit:
+    """State of the unit of work open in a context."""
+
+    def __init__(self):
+        # Callbacks waiting for the commit
+        self.callbacks: List[Callable[[], None]] = []
+        # Whether a repository staged changes in the session yet
+        self.staged = False
+
+# The unit of work open in this context, if any
+_open_unit: ContextVar[Optional[_OpenUnit]] = ContextVar('open_unit_of_work', default=None)
+
+class SQLAlchemyUnitOfWork(UnitOfWork):
+    """Unit of work committing the scoped session once per use case.
+
+    While a transaction is open the repositories below only stage their
+    changes in the session; leaving the outermost transaction commits them
+    in one round trip, then runs the after-commit callbacks.
+    """
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        if _open_unit.get() is not None:
+            yield
+            return
+
+        unit = _OpenUnit()
+        token = _open_unit.set(unit)
+        try:
+            yield
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        finally:
+            _open_unit.reset(token)
+        for callback in unit.callbacks:
+            callback()
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        unit = _open_unit.get()
+        if unit is None:
+            callback()
+        else:
+            unit.callbacks.append(callback)
+
+def _commit() -> None:
+    """Commit the session, unless a unit of work owns the transaction."""
+    unit = _open_unit.get()
+    if unit is None:
+        db.session.commit()
+    else:
+        unit.staged = True
+
+def _rollback() -> None:
+    """Roll the session back, unless a unit of work owns the transaction."""
+    if _open_unit.get() is None:
+        db.session.rollback()
+
+def end_read_transaction() -> bool:
+    """End the session's transaction, and return its connection to the pool, if it has only read.
+
+    Returns False, leaving the transaction open, when the unit of work open
+    in this context has already staged changes in it.
+    """
+    unit = _open_unit.get()
+    if unit is not None and unit.staged:
+        return False
+    db.session.rollback()
+    return True
+
+def message_insert_statements(messages: List[Message], chunk_size: int = 1000) -> list:
+    """Statements storing messages and bumping their cases' counters in one transaction.
+
+    Core inserts skip the mapper events maintaining the case counters, so the
+    counters are updated first, in case id order so that concurrent writers
+    lock the case rows in the same order.
+    """
+    added = defaultdict(list)
+    for message in messages:
+        added[message.case_id].append(message.created_at)
+    statements = [messages_added(case_id, len(added[case_id]), max(added[case_id])) for case_id in sorted(added)]
+
+    rows = [{
+        'id': message.id,
+        'case_id': message.case_id,
+        'content': message.content,
+        'created_at': message.created_at
+    } for message in messages]
+    for start in range(0, len(rows), chunk_size):
+        statements.append(insert(MessageModel).values(rows[start:start + chunk_size]))
+    return statements
+
+def case_listing_statement(after: Optional[Position] = None, customer_id: Optional[int] = None,
+                           created_from: Optional[datetime] = None, created_to: Optional[datetime] = None,
+                           by_activity: bool = False):
+    """SELECT of the case headers matching the filters, in listing order from after on."""
+    sort_key = case_activity if by_activity else SupportCaseModel.created_at
+    # Plain columns, so the messages relationship is never loaded
+    statement = select(*CASE_HEADER_COLUMNS)
+    if customer_id is not None:
+        statement = statement.where(SupportCaseModel.customer_id == customer_id)
+    if created_from is not None:
+        statement = statement.where(SupportCaseModel.created_at >= created_from)
+    if created_to is not None:
+        statement = statement.where(SupportCaseModel.created_at < created_to)
+    if after is not None:
+        statement = statement.where(or_(
+            sort_key < after.created_at,
+            and_(sort_key == after.created_at, SupportCaseModel.id < after.id)
+        ))
+    return statement.order_by(desc(sort_key), desc(SupportCaseModel.id))
 
 class SQLAlchemySupportCaseRepository(SupportCaseRepository):
     """SQLAlchemy implementation of the support case repository."""
@@ -14,27 +141,92 @@ class SQLAlchemySupportCaseRepository(SupportCaseRepository):
         model = SupportCaseModel.query.filter_by(id=case_id).first()
         return self._to_entity(model) if model else None
     
+    def get_header(self, case_id: UUID, min_version: Optional[int] = None) -> Optional[SupportCase]:
+        # Always the current row, so min_version holds by construction
+        row = self._header_query().filter(SupportCaseModel.id == case_id).first()
+        return self._row_to_header_entity(row) if row else None
+    
+    def exists(self, case_id: UUID) -> bool:
+        return db.session.query(exists().where(SupportCaseModel.id == case_id)).scalar()
+    
+    def get_revision(self, case_id: UUID) -> Optional[CaseRevision]:
+        row = db.session.execute(
+            select(SupportCaseModel.version, case_revised_at).where(SupportCaseModel.id == case_id)
+        ).first()
+        return CaseRevision(case_id, row[0], row[1]) if row else None
+    
     def get_all(self) -> List[SupportCase]:
         return [self._to_entity(model) for model in SupportCaseModel.query.all()]
     
+    def get_page(self, limit: int = 20, after: Optional[Position] = None, customer_id: Optional[int] = None,
+                 created_from: Optional[datetime] = None, created_to: Optional[datetime] = None,
+                 by_activity: bool = False) -> Page[SupportCase]:
+        statement = case_listing_statement(after, customer_id, created_from, created_to, by_activity)
+        rows = db.session.execute(statement.limit(limit + 1)).all()
+
+        cases = [self._row_to_header_entity(row) for row in rows[:limit]]
+        next_position = None
+        if len(rows) > limit:
+            last = cases[-1]
+            sort_value = (last.last_message_at or last.created_at) if by_activity else last.created_at
+            next_position = Position(sort_value, last.id)
+        return Page(cases, next_position)
+    
+    def stream(self, after: Optional[Position] = None, customer_id: Optional[int] = None,
+               created_from: Optional[datetime] = None, created_to: Optional[datetime] = None,
+               by_activity: bool = False) -> Iterator[SupportCase]:
+        statement = case_listing_statement(after, customer_id, created_from, created_to, by_activity)
+        for row in db.session.execute(statement.execution_options(yield_per=STREAM_BATCH_SIZE)):
+            yield self._row_to_header_entity(row)
+    
     def add(self, case: SupportCase) -> None:
         model = self._to_model(case)
         db.session.add(model)
-        db.session.commit()
+        _commit()
     
-    def update(self, case: SupportCase) -> None:
-        model = SupportCaseModel.query.get(case.id)
-        if model:
-            model.summary = case.summary
-            model.description = case.description
-            model.customer_id = case.customer_id
-            db.session.commit()
+    def update(self, case_id: UUID, summary: str, description: str, customer_id: int) -> Optional[SupportCase]:
+        row = db.session.execute(
+            update(SupportCaseModel)
+            .where(SupportCaseModel.id == case_id)
+            .values(**revised(summary=summary, description=description, customer_id=customer_id))
+            .returning(*CASE_HEADER_COLUMNS)
+        ).first()
+        _commit()
+        return self._row_to_header_entity(row) if row else None
     
-    def delete(self, case_id: UUID) -> None:
-        model = SupportCaseModel.query.get(case_id)
-        if model:
-            db.session.delete(model)
-            db.session.commit()
+    def upsert_many(self, cases: List[SupportCase]) -> List[bool]:
+        insert_for_dialect = UPSERT_INSERTS[db.session.get_bind().dialect.name]
+        statement = insert_for_dialect(SupportCaseModel).values([{
+            'id': case.id,
+            'summary': case.summary,
+            'description': case.description,
+            'customer_id': case.customer_id,
+            'created_at': case.created_at,
+            'updated_at': case.updated_at
+        } for case in cases])
+        # One INSERT ... ON CONFLICT: an id that exists, or that a concurrent batch has just
+        # inserted, is updated in place rather than failing the chunk
+        statement = statement.on_conflict_do_update(
+            index_elements=[SupportCaseModel.id],
+            set_=revised(summary=statement.excluded.summary, description=statement.excluded.description,
+                         customer_id=statement.excluded.customer_id)
+        ).returning(SupportCaseModel.id, SupportCaseModel.version)
+        try:
+            versions = dict(db.session.execute(statement).all())
+            _commit()
+        except Exception:
+            _rollback()
+            raise
+        # Updates advance the version, so only inserted rows are still at their first
+        return [versions[case.id] == 1 for case in cases]
+    
+    def delete(self, case_id: UUID) -> bool:
+        # Messages go with the case through ON DELETE CASCADE
+        deleted = db.session.scalar(
+            delete(SupportCaseModel).where(SupportCaseModel.id == case_id).returning(SupportCaseModel.id)
+        )
+        _commit()
+        return deleted is not None
     
     def _to_entity(self, model: SupportCaseModel) -> SupportCase:
         return SupportCase(
@@ -43,7 +235,29 @@ class SQLAlchemySupportCaseRepository(SupportCaseRepository):
             description=model.description,
             customer_id=model.customer_id,
             created_at=model.created_at,
-            messages=[self._message_to_entity(m) for m in model.messages]
+            messages=[self._message_to_entity(m) for m in model.messages],
+            message_count=model.message_count,
+            last_message_at=model.last_message_at,
+            version=model.version,
+            updated_at=model.updated_at
+        )
+    
+    def _header_query(self):
+        # Select plain columns so the messages relationship is never loaded
+        return db.session.query(*CASE_HEADER_COLUMNS)
+    
+    def _row_to_header_entity(self, row) -> SupportCase:
+        return SupportCase(
+            id=row.id,
+            summary=row.summary,
+            description=row.description,
+            customer_id=row.customer_id,
+            created_at=row.created_at,
+            messages=None,
+            message_count=row.message_count,
+            last_message_at=row.last_message_at,
+            version=row.version,
+            updated_at=row.updated_at
         )
     
     def _to_model(self, entity: SupportCase) -> SupportCaseModel:
@@ -52,7 +266,8 @@ class SQLAlchemySupportCaseRepository(SupportCaseRepository):
             summary=entity.summary,
             description=entity.description,
             customer_id=entity.customer_id,
-            created_at=entity.created_at
+            created_at=entity.created_at,
+            updated_at=entity.updated_at
         )
     
     def _message_to_entity(self, model: MessageModel) -> Message:
@@ -66,27 +281,98 @@ class SQLAlchemySupportCaseRepository(SupportCaseRepository):
 class SQLAlchemyMessageRepository(MessageRepository):
     """SQLAlchemy implementation of the message repository."""
     
+    # Rows per multi-row INSERT, keeping bound parameters under driver limits
+    INSERT_CHUNK_SIZE = 1000
+    
     def get_by_case(self, case_id: UUID, limit: int = 10, offset: int = 0) -> Tuple[List[Message], int]:
         query = MessageModel.query.filter_by(case_id=case_id)
-        total = query.count()
+        total = self._count(case_id)
         
-        models = query.order_by(desc(MessageModel.created_at))\
+        models = query.order_by(desc(MessageModel.created_at), desc(MessageModel.id))\
             .limit(limit)\
             .offset(offset)\
             .all()
             
         return [self._to_entity(model) for model in models], total
     
+    def get_page_by_case(self, case_id: UUID, limit: int = 10, after: Optional[Position] = None,
+                         include_total: bool = False) -> Page[Message]:
+        query = MessageModel.query.filter_by(case_id=case_id)
+        total = self._count(case_id) if include_total else None
+
+        if after is not None:
+            query = query.filter(or_(
+                MessageModel.created_at < after.created_at,
+                and_(MessageModel.created_at == after.created_at, MessageModel.id < after.id)
+            ))
+
+        # Fetch one extra row to learn whether another page follows
+        models = query.order_by(desc(MessageModel.created_at), desc(MessageModel.id))\
+            .limit(limit + 1)\
+            .all()
+
+        messages = [self._to_entity(model) for model in models[:limit]]
+        next_position = None
+        if len(models) > limit:
+            next_position = Position(messages[-1].created_at, messages[-1].id)
+        return Page(messages, next_position, total)
+
+    def get_page_since(self, case_id: UUID, since: Position, limit: int = 10) -> Page[Message]:
+        models = MessageModel.query.filter_by(case_id=case_id)\
+            .filter(or_(
+                MessageModel.created_at > since.created_at,
+                and_(MessageModel.created_at == since.created_at, MessageModel.id > since.id)
+            ))\
+            .order_by(MessageModel.created_at, MessageModel.id)\
+            .limit(limit + 1)\
+            .all()
+
+        messages = [self._to_entity(model) for model in models[:limit]]
+        next_position = None
+        if len(models) > limit:
+            next_position = Position(messages[-1].created_at, messages[-1].id)
+        return Page(messages, next_position)
+
+    def stream_by_case(self, case_id: UUID, after: Optional[Position] = None) -> Iterator[Message]:
+        # Plain columns: rows become entities without passing through the identity map
+        query = db.session.query(MessageModel.id, MessageModel.case_id, MessageModel.content,
+                                 MessageModel.created_at)\
+            .filter(MessageModel.case_id == case_id)
+        if after is not None:
+            query = query.filter(or_(
+                MessageModel.created_at < after.created_at,
+                and_(MessageModel.created_at == after.created_at, MessageModel.id < after.id)
+            ))
+        query = query.order_by(desc(MessageModel.created_at), desc(MessageModel.id))
+        for row in query.yield_per(STREAM_BATCH_SIZE):
+            yield Message(id=row.id, case_id=row.case_id, content=row.content, created_at=row.created_at)
+    
     def add(self, message: Message) -> None:
         model = self._to_model(message)
         db.session.add(model)
-        db.session.commit()
+        _commit()
+    
+    def add_many(self, messages: List[Message]) -> None:
+        try:
+            for statement in message_insert_statements(messages, self.INSERT_CHUNK_SIZE):
+                db.session.execute(statement)
+            _commit()
+        except Exception:
+            _rollback()
+            raise
     
     def delete(self, message_id: UUID) -> None:
-        model = MessageModel.query.get(message_id)
-        if model:
-            db.session.delete(model)
-            db.session.commit()
+        case_id = db.session.scalar(
+            delete(MessageModel).where(MessageModel.id == message_id).returning(MessageModel.case_id)
+        )
+        if case_id is not None:
+            db.session.execute(messages_removed(case_id, 1))
+        _commit()
+    
+    def _count(self, case_id: UUID) -> int:
+        # Read the denormalized counter instead of counting the thread
+        count = db.session.query(SupportCaseModel.message_count).filter(SupportCaseModel.id == case_id).scalar()
+        return count or 0
     
     def _to_entity(self, model: MessageModel) -> Message:
         return Message(
@@ -2,6 +2,7 @@
 from infrastructure.database import db
 from uuid import uuid4
 from datetime import datetime
+from sqlalchemy import DDL, case, event, func, or_, select, update
 from sqlalchemy.dialects.postgresql import UUID
 
 class SupportCaseModel(db.Model):
@@ -13,13 +14,132 @@ class SupportCaseModel(db.Model):
     description = db.Column(db.Text, nullable=False)
     customer_id = db.Column(db.Integer, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    messages = db.relationship('MessageModel', backref='case', lazy=True, cascade='all, delete-orphan')
+    # Denormalized from messages so totals and activity ordering need no aggregates
+    message_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    last_message_at = db.Column(db.DateTime, nullable=True)
+    # Advanced by every change to the case or its thread, so HTTP validators need no other reads
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    updated_at = db.Column(db.DateTime, nullable=True, default=datetime.utcnow)
+    # The database deletes a case's messages (ON DELETE CASCADE); the ORM never loads them to do it
+    messages = db.relationship('MessageModel', backref='case', lazy=True, cascade='all, delete-orphan',
+                               passive_deletes=True)
 
 class MessageModel(db.Model):
     """SQLAlchemy model for messages."""
     __tablename__ = 'messages'
 
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
-    case_id = db.Column(UUID(as_uuid=True), db.ForeignKey('support_cases.id'), nullable=False)
+    case_id = db.Column(UUID(as_uuid=True), db.ForeignKey('support_cases.id', ondelete='CASCADE'), nullable=False)
     content = db.Column(db.Text, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
\ No newline at end of file
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+# Plain case columns, so the messages relationship is never loaded
+CASE_HEADER_COLUMNS = (
+    SupportCaseModel.id,
+    SupportCaseModel.summary,
+    SupportCaseModel.description,
+    SupportCaseModel.customer_id,
+    SupportCaseModel.created_at,
+    SupportCaseModel.message_count,
+    SupportCaseModel.last_message_at,
+    SupportCaseModel.version,
+    SupportCaseModel.updated_at
+)
+
+# Serves per-customer listings filtered or ordered by creation time
+db.Index('ix_support_cases_customer_id_created_at', SupportCaseModel.customer_id, SupportCaseModel.created_at)
+
+# Serves message pages of a case in (created_at DESC, id) keyset order
+db.Index('ix_messages_case_id_created_at_id', MessageModel.case_id, MessageModel.created_at.desc(), MessageModel.id)
+
+# When a case last saw a message, or was opened if it has none yet
+case_activity = func.coalesce(SupportCaseModel.last_message_at, SupportCaseModel.created_at)
+
+# Serves case listings ordered by most recent activity
+db.Index('ix_support_cases_activity', case_activity.desc(), SupportCaseModel.id.desc())
+
+# When a case last changed; cases stored before versioning only know when they were opened
+case_revised_at = func.coalesce(SupportCaseModel.updated_at, SupportCaseModel.created_at)
+
+def revised(**values):
+    """Values of an UPDATE of support cases, advancing their revision too."""
+    return dict(values, version=SupportCaseModel.version + 1, updated_at=datetime.utcnow())
+
+def messages_added(case_id, count, latest):
+    """Build the UPDATE recording count new messages of a case, the newest created at latest.
+
+    Run it before inserting the messages: locking the case row first keeps
+    concurrent writers to one case from deadlocking on the foreign key check.
+    """
+    return update(SupportCaseModel)\
+        .where(SupportCaseModel.id == case_id)\
+        .values(**revised(
+            message_count=SupportCaseModel.message_count + count,
+            last_message_at=case(
+                (or_(SupportCaseModel.last_message_at.is_(None), SupportCaseModel.last_message_at < latest), latest),
+                else_=SupportCaseModel.last_message_at
+            )
+        ))
+
+def messages_removed(case_id, count):
+    """Build the UPDATE recording count deleted messages of a case; run it after the delete."""
+    latest = select(func.max(MessageModel.created_at))\
+        .where(MessageModel.case_id == case_id)\
+        .scalar_subquery()
+    return update(SupportCaseModel)\
+        .where(SupportCaseModel.id == case_id)\
+        .values(**revised(message_count=SupportCaseModel.message_count - count, last_message_at=latest))
+
+@event.listens_for(MessageModel, 'before_insert')
+def _count_inserted_message(mapper, connection, target):
+    # Bulk Core inserts skip mapper events and call messages_added themselves
+    if target.created_at is None:
+        target.created_at = datetime.utcnow()
+    connection.execute(messages_added(target.case_id, 1, target.created_at))
+
+@event.listens_for(MessageModel, 'after_delete')
+def _count_deleted_message(mapper, connection, target):
+    connection.execute(messages_removed(target.case_id, 1))
+
+# Full-text search indexes, kept current by the database on every write (see infrastructure.search)
+SEARCH_SCHEMA = {
+    'postgresql': ([
+        "CREATE INDEX IF NOT EXISTS ix_support_cases_search ON support_cases USING gin "
+        "((setweight(to_tsvector('english', summary), 'A') || "
+        "setweight(to_tsvector('english', description), 'B')))",
+        "CREATE INDEX IF NOT EXISTS ix_messages_search ON messages USING gin (to_tsvector('english', content))"
+    ], []),
+    'sqlite': ([
+        "CREATE VIRTUAL TABLE IF NOT EXISTS support_cases_fts USING fts5("
+        "summary, description, content='support_cases', tokenize='porter unicode61')",
+        "CREATE TRIGGER IF NOT EXISTS support_cases_fts_insert AFTER INSERT ON support_cases BEGIN "
+        "INSERT INTO support_cases_fts(rowid, summary, description) "
+        "VALUES (new.rowid, new.summary, new.description); END",
+        "CREATE TRIGGER IF NOT EXISTS support_cases_fts_delete AFTER DELETE ON support_cases BEGIN "
+        "INSERT INTO support_cases_fts(support_cases_fts, rowid, summary, description) "
+        "VALUES ('delete', old.rowid, old.summary, old.description); END",
+        "CREATE TRIGGER IF NOT EXISTS support_cases_fts_update AFTER UPDATE OF summary, description ON support_cases BEGIN "
+        "INSERT INTO support_cases_fts(support_cases_fts, rowid, summary, description) "
+        "VALUES ('delete', old.rowid, old.summary, old.description); "
+        "INSERT INTO support_cases_fts(rowid, summary, description) "
+        "VALUES (new.rowid, new.summary, new.description); END",
+        "CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5("
+        "content, content='messages', tokenize='porter unicode61')",
+        "CREATE TRIGGER IF NOT EXISTS messages_fts_insert AFTER INSERT ON messages BEGIN "
+        "INSERT INTO messages_fts(rowid, content) VALUES (new.rowid, new.content); END",
+        "CREATE TRIGGER IF NOT EXISTS messages_fts_delete AFTER DELETE ON messages BEGIN "
+        "INSERT INTO messages_fts(messages_fts, rowid, content) VALUES ('delete', old.rowid, old.content); END",
+        "CREATE TRIGGER IF NOT EXISTS messages_fts_update AFTER UPDATE OF content ON messages BEGIN "
+        "INSERT INTO messages_fts(messages_fts, rowid, content) VALUES ('delete', old.rowid, old.content); "
+        "INSERT INTO messages_fts(rowid, content) VALUES (new.rowid, new.content); END"
+    ], [
+        "DROP TABLE IF EXISTS messages_fts",
+        "DROP TABLE IF EXISTS support_cases_fts"
+    ])
+}
+
+for dialect, (create_statements, drop_statements) in SEARCH_SCHEMA.items():
+    for statement in create_statements:
+        event.listen(db.metadata, 'after_create', DDL(statement).execute_if(dialect=dialect))
+    for statement in drop_statements:
+        event.listen(db.metadata, 'before_drop', DDL(statement).execute_if(dialect=dialect))
@@ -0,0 +1,101 @@
+"""Connection pool configuration and instrumentation."""
+import threading
+import time
+from typing import Mapping
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import QueuePool
+
+class PoolMetrics:
+    """Counters for connection pool activity in this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters = {"connects": 0, "checkouts": 0, "checkins": 0, "invalidations": 0,
+                              "overflow_checkouts": 0, "timeouts": 0}
+            self._wait_count = 0
+            self._wait_total = 0.0
+            self._wait_max = 0.0
+
+    def increment(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self._wait_count += 1
+            self._wait_total += seconds
+            self._wait_max = max(self._wait_max, seconds)
+
+    def instrument(self, engine: Engine) -> None:
+        """Count connections and checkouts of the engine's pool via SQLAlchemy events."""
+        event.listen(engine, "connect", lambda *args: self.increment("connects"))
+        event.listen(engine, "checkout", lambda *args: self.increment("checkouts"))
+        event.listen(engine, "checkin", lambda *args: self.increment("checkins"))
+        event.listen(engine, "invalidate", lambda *args: self.increment("invalidations"))
+
+    def snapshot(self) -> dict:
+        """Return the counters and checkout wait statistics in milliseconds."""
+        with self._lock:
+            snapshot = dict(self._counters)
+            snapshot["checkout_wait_ms"] = {
+                "count": self._wait_count,
+                "total": round(self._wait_total * 1000, 3),
+                "max": round(self._wait_max * 1000, 3),
+                "mean": round(self._wait_total / self._wait_count * 1000, 3) if self._wait_count else 0.0
+            }
+            return snapshot
+
+pool_metrics = PoolMetrics()
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool recording how long callers wait for a connection.
+
+    Also counts checkout timeouts and checkouts made while overflow connections
+    are open. The event-based counters of PoolMetrics.instrument work with any
+    pool class.
+    """
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            pool_metrics.increment("timeouts")
+            raise
+        finally:
+            pool_metrics.record_wait(time.perf_counter() - start)
+        if self.overflow() > 0:
+            pool_metrics.increment("overflow_checkouts")
+        return connection
+
+def engine_options_from_env(database_url: str, environ: Mapping[str, str]) -> dict:
+    """Build SQLALCHEMY_ENGINE_OPTIONS from DB_* environment variables.
+
+    Unset variables keep SQLAlchemy's defaults. SQLite gets none of the pool
+    sizing options, since its in-memory databases use a single connection.
+    """
+    options = {}
+    if "DB_POOL_PRE_PING" in environ:
+        options["pool_pre_ping"] = environ["DB_POOL_PRE_PING"].lower() == "true"
+    if "DB_POOL_RECYCLE" in environ:
+        options["pool_recycle"] = int(environ["DB_POOL_RECYCLE"])
+
+    if not database_url or make_url(database_url).get_backend_name() == "sqlite":
+        return options
+
+    options["poolclass"] = InstrumentedQueuePool
+    if "DB_POOL_SIZE" in environ:
+        options["pool_size"] = int(environ["DB_POOL_SIZE"])
+    if "DB_MAX_OVERFLOW" in environ:
+        options["max_overflow"] = int(environ["DB_MAX_OVERFLOW"])
+    if "DB_POOL_TIMEOUT" in environ:
+        options["pool_timeout"] = float(environ["DB_POOL_TIMEOUT"])
+    if "DB_STATEMENT_TIMEOUT_MS" in environ and make_url(database_url).get_backend_name() == "postgresql":
+        timeout = int(environ["DB_STATEMENT_TIMEOUT_MS"])
+        options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
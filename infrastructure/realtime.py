@@ -0,0 +1,111 @@
+"""Real-time fan-out of new messages to subscribers of a case."""
+import queue
+import threading
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Callable, List, Optional
+from uuid import UUID
+from domain.entities import Message
+from domain.events import MessagePublisher
+
+class MessageBroker(ABC):
+    """Interface for carrying new messages to every process serving subscribers.
+
+    A networked implementation (Redis pub/sub, PostgreSQL LISTEN/NOTIFY, ...)
+    publishes once and calls each process's listener once, so a single write
+    reaches all subscribers without them querying the database.
+    """
+
+    @abstractmethod
+    def publish(self, messages: List[Message]) -> None:
+        """Send messages to every process."""
+        pass
+
+    @abstractmethod
+    def listen(self, callback: Callable[[List[Message]], None]) -> None:
+        """Register the callback receiving messages published by any process."""
+        pass
+
+class LocalMessageBroker(MessageBroker):
+    """Broker stand-in delivering messages within this process only."""
+
+    def __init__(self):
+        self._callbacks = []
+
+    def publish(self, messages: List[Message]) -> None:
+        for callback in self._callbacks:
+            callback(messages)
+
+    def listen(self, callback: Callable[[List[Message]], None]) -> None:
+        self._callbacks.append(callback)
+
+class Subscription:
+    """A subscriber's bounded queue of new messages of one case."""
+
+    def __init__(self, hub: 'MessageHub', case_id: UUID, max_queue: int):
+        self.case_id = case_id
+        self.overflowed = False
+        self._hub = hub
+        self._queue = queue.Queue(maxsize=max_queue)
+
+    def get(self, timeout: float) -> Optional[Message]:
+        """Wait up to timeout seconds for the next message."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        self._hub.unsubscribe(self)
+
+    def __enter__(self) -> 'Subscription':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _offer(self, message: Message) -> None:
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            # Slow consumers are cut off rather than slowing down writers
+            self.overflowed = True
+
+class MessageHub(MessagePublisher):
+    """In-process fan-out of published messages to per-case subscriptions."""
+
+    def __init__(self, broker: Optional[MessageBroker] = None, max_queue: int = 1000):
+        self.broker = broker or LocalMessageBroker()
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        self._subscriptions = defaultdict(set)
+        self.broker.listen(self.dispatch)
+
+    def publish(self, messages: List[Message]) -> None:
+        self.broker.publish(messages)
+
+    def subscribe(self, case_id: UUID) -> Subscription:
+        subscription = Subscription(self, case_id, self.max_queue)
+        with self._lock:
+            self._subscriptions[case_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscriptions.get(subscription.case_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscriptions[subscription.case_id]
+
+    def dispatch(self, messages: List[Message]) -> None:
+        """Deliver messages received from the broker to this process's subscribers."""
+        for message in messages:
+            with self._lock:
+                subscribers = list(self._subscriptions.get(message.case_id, ()))
+            for subscription in subscribers:
+                subscription._offer(message)
+
+    def subscriber_count(self, case_id: UUID) -> int:
+        with self._lock:
+            return len(self._subscriptions.get(case_id, ()))
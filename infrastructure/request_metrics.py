@@ -0,0 +1,179 @@
+"""Per-request SQL statement counts and timings.
+
+SQLAlchemy cursor events attribute every statement to the request being
+served in the current context. Each response then carries a Server-Timing
+header and a log line with its statement count, database time and handler
+time, and the totals are aggregated into per-route histograms.
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional, Sequence
+from flask import Flask, g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the histogram buckets
+DURATION_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+class QueryStats:
+    """SQL statements executed, and the time spent in them, within one unit of work.
+
+    Statements are also counted by the enclosing unit, if any, so a recorder
+    wrapped around a request sees the request's statements.
+    """
+
+    def __init__(self, parent: Optional['QueryStats'] = None):
+        self.parent = parent
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.executed = []
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.statements += 1
+        self.db_seconds += seconds
+        self.executed.append(statement)
+        if self.parent is not None:
+            self.parent.record(statement, seconds)
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar('query_stats', default=None)
+
+class Histogram:
+    """Cumulative bucket counts, sum and maximum of observed values. Not thread-safe."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def snapshot(self) -> dict:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip([*map(str, self.buckets), '+Inf'], self.counts):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 3),
+            "max": round(self.max, 3),
+            "mean": round(self.sum / self.count, 3) if self.count else 0.0,
+            "buckets": buckets
+        }
+
+class RouteMetrics:
+    """Histograms of the requests served by one route."""
+
+    def __init__(self):
+        self.duration_ms = Histogram(DURATION_BUCKETS_MS)
+        self.db_ms = Histogram(DURATION_BUCKETS_MS)
+        self.statements = Histogram(STATEMENT_BUCKETS)
+        self.statuses: Dict[int, int] = {}
+
+class RequestMetrics:
+    """Statement counts and timings of the requests served by this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes: Dict[str, RouteMetrics] = {}
+
+    def instrument(self, engine: Engine) -> None:
+        """Attribute the engine's statements to the current request via cursor events."""
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def init_app(self, app: Flask) -> None:
+        """Record every request of the Flask app."""
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        app.teardown_request(self._teardown_request)
+
+    @contextmanager
+    def record(self) -> Iterator[QueryStats]:
+        """Collect the statements executed in this context, outside of any request too."""
+        stats = QueryStats(_current_stats.get())
+        token = _current_stats.set(stats)
+        try:
+            yield stats
+        finally:
+            _current_stats.reset(token)
+
+    def observe(self, route: str, status: int, duration_ms: float, db_ms: float, statements: int) -> None:
+        with self._lock:
+            metrics = self._routes.get(route)
+            if metrics is None:
+                metrics = self._routes[route] = RouteMetrics()
+            metrics.duration_ms.observe(duration_ms)
+            metrics.db_ms.observe(db_ms)
+            metrics.statements.observe(statements)
+            metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+
+    def snapshot(self) -> dict:
+        """Return the histograms per route, durations in milliseconds."""
+        with self._lock:
+            return {route: {
+                "duration_ms": metrics.duration_ms.snapshot(),
+                "db_ms": metrics.db_ms.snapshot(),
+                "statements": metrics.statements.snapshot(),
+                "statuses": {str(status): count for status, count in sorted(metrics.statuses.items())}
+            } for route, metrics in sorted(self._routes.items())}
+
+    # The start time lives on the statement's execution context, which is discarded
+    # with it, so a statement that raises leaves nothing behind on its connection
+    @staticmethod
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current_stats.get() is not None:
+            context.request_metrics_start = time.perf_counter()
+
+    @staticmethod
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = _current_stats.get()
+        start = getattr(context, 'request_metrics_start', None)
+        if stats is not None and start is not None:
+            stats.record(statement, time.perf_counter() - start)
+
+    def _start_request(self) -> None:
+        g.request_metrics_start = time.perf_counter()
+        g.request_metrics_token = _current_stats.set(QueryStats(_current_stats.get()))
+
+    def _finish_request(self, response):
+        stats = _current_stats.get()
+        start = g.get('request_metrics_start')
+        if stats is None or start is None:
+            return response
+
+        duration_ms = (time.perf_counter() - start) * 1000
+        db_ms = stats.db_seconds * 1000
+        rule = request.url_rule.rule if request.url_rule else '<unmatched>'
+        self.observe(f"{request.method} {rule}", response.status_code, duration_ms, db_ms, stats.statements)
+
+        response.headers.add('Server-Timing', f'db;dur={db_ms:.3f};desc="{stats.statements} statements"')
+        response.headers.add('Server-Timing', f'handler;dur={duration_ms:.3f}')
+        logger.info(f"request method={request.method} route={rule} status={response.status_code} "
+                    f"statements={stats.statements} db_ms={db_ms:.3f} duration_ms={duration_ms:.3f}")
+        return response
+
+    @staticmethod
+    def _teardown_request(exc) -> None:
+        token = g.pop('request_metrics_token', None)
+        if token is not None:
+            _current_stats.reset(token)
+
+request_metrics = RequestMetrics()
@@ -1,42 +1,136 @@
 """Flask routes implementation."""
-from flask import request
+from flask import Response, current_app, request
 from flask_restful import Resource
 from uuid import UUID
+import json
 import logging
 from datetime import datetime
-from application.use_cases import SupportCaseService, MessageService
-from infrastructure.infrastructure_implementations import SQLAlchemySupportCaseRepository, SQLAlchemyMessageRepository
-from validators import validate_support_case, validate_message
+from application.use_cases import SupportCaseService, MessageService, SearchService
+from domain.pagination import Position
+from domain.search import CASE, MESSAGE
+from infrastructure.cache import CachingSupportCaseRepository
+from infrastructure.conditional import is_not_modified, not_modified, validator_headers
+from infrastructure.group_commit import GroupCommitMessageRepository, GroupCommitWriter
+from infrastructure.cursors import encode_cursor, decode_cursor, decode_since, parse_datetime
+from infrastructure.health import DatabaseProbe, pool_status
+from infrastructure.pool import pool_metrics
+from infrastructure.request_metrics import request_metrics
+from infrastructure.realtime import MessageHub
+from infrastructure.search import search_index_for
+from infrastructure.serializers import case_to_dict, message_to_dict, dumps, ndjson_response
+from infrastructure.infrastructure_implementations import (SQLAlchemySupportCaseRepository, SQLAlchemyMessageRepository,
+                                                           SQLAlchemyUnitOfWork)
+from infrastructure.database import db
+from validators import support_case_errors, support_case_batch_item_errors, message_errors
 
 logger = logging.getLogger(__name__)
 
-# Initialize repositories and services
-case_repository = SQLAlchemySupportCaseRepository()
-message_repository = SQLAlchemyMessageRepository()
-case_service = SupportCaseService(case_repository, message_repository)
-message_service = MessageService(case_repository, message_repository)
+def _build_case_repository(config, unit_of_work):
+    """Create the support case repository, wrapped in the header cache when enabled."""
+    repository = SQLAlchemySupportCaseRepository()
+    if not config["CASE_CACHE_ENABLED"]:
+        return repository
+    return CachingSupportCaseRepository(
+        repository,
+        max_size=config["CASE_CACHE_MAX_SIZE"],
+        ttl=config["CASE_CACHE_TTL_SECONDS"],
+        shared=config["CASE_CACHE_SHARED_BACKEND"],
+        after_commit=unit_of_work.after_commit
+    )
+
+def _build_message_repository(config):
+    """Create the message repository, group-committing posted messages when enabled."""
+    repository = SQLAlchemyMessageRepository()
+    if not config["MESSAGE_GROUP_COMMIT_ENABLED"]:
+        return repository
+    writer = GroupCommitWriter(
+        db.engine,
+        max_batch=config["MESSAGE_GROUP_COMMIT_MAX_BATCH"],
+        max_delay=config["MESSAGE_GROUP_COMMIT_MAX_DELAY_MS"] / 1000
+    )
+    return GroupCommitMessageRepository(repository, writer)
+
+# Initialize repositories and services; routes are imported inside the app context
+# Each use case commits once, through the unit of work
+unit_of_work = SQLAlchemyUnitOfWork()
+case_repository = _build_case_repository(current_app.config, unit_of_work)
+message_repository = _build_message_repository(current_app.config)
+case_service = SupportCaseService(case_repository, message_repository, unit_of_work)
+message_hub = MessageHub(current_app.config["MESSAGE_BROKER"], current_app.config["MESSAGE_STREAM_QUEUE_SIZE"])
+# Message writes change their case's counters and revision, so they drop its cached header
+message_service = MessageService(case_repository, message_repository, message_hub, unit_of_work,
+                                 case_changed=getattr(case_repository, 'invalidate', None))
+search_service = SearchService(current_app.config["SEARCH_INDEX"] or search_index_for(db.engine.dialect.name))
+database_probe = DatabaseProbe()
+
+def _wants_ndjson():
+    """Whether the client asked for a streamed NDJSON export instead of a JSON page."""
+    best = request.accept_mimetypes.best_match(['application/json', 'application/x-ndjson'])
+    return best == 'application/x-ndjson'
 
 class HealthCheckResource(Resource):
     """REST resource for health check."""
 
     def get(self):
         """Return health status of the application."""
-        try:
-            # Check database connection by making a simple query
-            case_repository.get_all()
+        report = database_probe.check(current_app.config["HEALTH_READY_CACHE_SECONDS"])
+        if report["ready"]:
             return {
                 "status": "healthy",
                 "database": "connected",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": report["timestamp"]
             }
-        except Exception as e:
-            logger.error(f"Health check failed: {str(e)}")
-            return {
-                "status": "unhealthy",
-                "database": "disconnected",
-                "error": str(e),
-                "timestamp": datetime.utcnow().isoformat()
-            }, 503
+
+        logger.error(f"Health check failed: {report['error']}")
+        return {
+            "status": "unhealthy",
+            "database": "disconnected",
+            "error": report["error"],
+            "timestamp": report["timestamp"]
+        }, 503
+
+class LivenessResource(Resource):
+    """REST resource for the liveness probe; never touches the database."""
+
+    def get(self):
+        return {
+            "status": "alive",
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+class ReadinessResource(Resource):
+    """REST resource for the readiness probe."""
+
+    def get(self):
+        """Report database round-trip latency and connection pool state."""
+        report = database_probe.check(current_app.config["HEALTH_READY_CACHE_SECONDS"])
+        database = {
+            "latency_ms": report.get("latency_ms"),
+            "pool": report["pool"],
+            "cached": report["cached"]
+        }
+        if report["ready"]:
+            return {"status": "ready", "database": database, "timestamp": report["timestamp"]}
+
+        database["error"] = report["error"]
+        return {"status": "not_ready", "database": database, "timestamp": report["timestamp"]}, 503
+
+class MetricsResource(Resource):
+    """REST resource exposing this worker's runtime metrics."""
+
+    def get(self):
+        metrics = {
+            "pool": {
+                "status": pool_status(),
+                **pool_metrics.snapshot()
+            },
+            "requests": request_metrics.snapshot()
+        }
+        if isinstance(case_repository, CachingSupportCaseRepository):
+            metrics["case_cache"] = case_repository.stats()
+        if isinstance(message_repository, GroupCommitMessageRepository):
+            metrics["message_group_commit"] = message_repository.writer.stats()
+        return metrics
 
 class SupportCaseResource(Resource):
     """REST resource for support cases."""
@@ -49,26 +143,48 @@ class SupportCaseResource(Resource):
                 except ValueError:
                     return {"error": "Invalid UUID format"}, 400
 
-                case = case_service.get_case(uuid_obj)
+                # The validators always come from the current revision, never from a cached
+                # header; revalidation reads only the revision and answers 304 if it still matches
+                revision = case_service.get_case_revision(uuid_obj)
+                if revision is None:
+                    return {"error": "Support case not found"}, 404
+                if is_not_modified(revision):
+                    return not_modified(revision)
+
+                case = case_service.get_case_header_at(revision)
                 if not case:
                     return {"error": "Support case not found"}, 404
 
-                return {
-                    'id': str(case.id),
-                    'summary': case.summary,
-                    'description': case.description,
-                    'customer_id': case.customer_id,
-                    'created_at': case.created_at.isoformat()
-                }
+                return case_to_dict(case), 200, validator_headers(revision)
 
-            cases = case_service.get_all_cases()
-            return [{
-                'id': str(case.id),
-                'summary': case.summary,
-                'description': case.description,
-                'customer_id': case.customer_id,
-                'created_at': case.created_at.isoformat()
-            } for case in cases]
+            try:
+                limit = max(min(int(request.args.get('limit', 20)), 100), 1)
+                after = request.args.get('after')
+                position = decode_cursor(after) if after else None
+                customer_id = request.args.get('customer_id')
+                customer_id = int(customer_id) if customer_id else None
+                created_from = parse_datetime(request.args.get('created_from'))
+                created_to = parse_datetime(request.args.get('created_to'))
+                sort = request.args.get('sort', 'created')
+                if sort not in ('created', 'activity'):
+                    raise ValueError(f"Unknown sort order: {sort}")
+            except ValueError:
+                return {"error": "Invalid query parameters"}, 400
+
+            if _wants_ndjson():
+                cases = case_service.stream_cases(position, customer_id, created_from, created_to,
+                                                  by_activity=sort == 'activity')
+                return ndjson_response(cases, case_to_dict)
+
+            page = case_service.list_cases(limit, position, customer_id, created_from, created_to,
+                                           by_activity=sort == 'activity')
+            return {
+                "cases": [case_to_dict(case) for case in page.items],
+                "pagination": {
+                    "limit": limit,
+                    "next_cursor": encode_cursor(page.next_position) if page.next_position else None
+                }
+            }
 
         except Exception as e:
             logger.error(f"Error retrieving support case: {str(e)}")
@@ -77,8 +193,9 @@ class SupportCaseResource(Resource):
     def post(self):
         try:
             data = request.get_json()
-            if not validate_support_case(data):
-                return {"error": "Invalid support case data"}, 400
+            errors = support_case_errors(data)
+            if errors:
+                return {"error": "Invalid support case data", "details": errors}, 400
 
             case = case_service.create_case(
                 summary=data["summary"],
@@ -86,13 +203,7 @@ class SupportCaseResource(Resource):
                 customer_id=data["customer_id"]
             )
 
-            return {
-                'id': str(case.id),
-                'summary': case.summary,
-                'description': case.description,
-                'customer_id': case.customer_id,
-                'created_at': case.created_at.isoformat()
-            }, 201
+            return case_to_dict(case), 201
 
         except Exception as e:
             logger.error(f"Error creating support case: {str(e)}")
@@ -106,8 +217,9 @@ class SupportCaseResource(Resource):
                 return {"error": "Invalid UUID format"}, 400
 
             data = request.get_json()
-            if not validate_support_case(data):
-                return {"error": "Invalid support case data"}, 400
+            errors = support_case_errors(data)
+            if errors:
+                return {"error": "Invalid support case data", "details": errors}, 400
 
             case = case_service.update_case(
                 case_id=uuid_obj,
@@ -119,13 +231,7 @@ class SupportCaseResource(Resource):
             if not case:
                 return {"error": "Support case not found"}, 404
 
-            return {
-                'id': str(case.id),
-                'summary': case.summary,
-                'description': case.description,
-                'customer_id': case.customer_id,
-                'created_at': case.created_at.isoformat()
-            }
+            return case_to_dict(case)
 
         except Exception as e:
             logger.error(f"Error updating support case: {str(e)}")
@@ -146,6 +252,65 @@ class SupportCaseResource(Resource):
             logger.error(f"Error deleting support case: {str(e)}")
             return {"error": "Internal server error"}, 500
 
+class SupportCaseBatchResource(Resource):
+    """REST resource for bulk support case creation and update."""
+
+    def post(self):
+        """Upsert many support cases; items with an `id` update that case or create it under that id."""
+        try:
+            items = request.get_json(silent=True)
+            if not isinstance(items, list):
+                return {"error": "Expected a JSON array"}, 400
+            if len(items) > current_app.config["CASE_BATCH_MAX_ITEMS"]:
+                return {"error": "Too many support cases in batch"}, 413
+
+            results = [None] * len(items)
+            valid = []
+            seen_ids = set()
+            for index, item in enumerate(items):
+                error = self._check_item(item, seen_ids)
+                if error:
+                    results[index] = {"index": index, "status": 400, **error}
+                else:
+                    valid.append(index)
+
+            cases, outcomes = case_service.upsert_cases(
+                [items[index] for index in valid],
+                chunk_size=current_app.config["CASE_BATCH_CHUNK_SIZE"]
+            )
+            for index, case, created in zip(valid, cases, outcomes):
+                if created is None:
+                    results[index] = {"index": index, "status": 500, "error": "Failed to store support case"}
+                else:
+                    results[index] = {"index": index, "status": 201 if created else 200, "id": case.id}
+
+            failed = sum(1 for result in results if result["status"] >= 400)
+            if not failed:
+                status = 200
+            else:
+                status = 207 if failed < len(items) else 400
+            return {"stored": len(items) - failed, "failed": failed, "results": results}, status
+
+        except Exception as e:
+            logger.error(f"Error upserting support cases in bulk: {str(e)}")
+            return {"error": "Internal server error"}, 500
+
+    @staticmethod
+    def _check_item(item, seen_ids):
+        """Validate one batch item in place, returning the error if it is invalid."""
+        errors = support_case_batch_item_errors(item)
+        if errors:
+            return {"error": "Invalid support case data", "details": errors}
+        if "id" in item:
+            try:
+                item["id"] = UUID(item["id"])
+            except ValueError:
+                return {"error": "Invalid UUID format"}
+            if item["id"] in seen_ids:
+                return {"error": "Duplicate support case id in batch"}
+            seen_ids.add(item["id"])
+        return None
+
 class MessageResource(Resource):
     """REST resource for messages."""
 
@@ -156,10 +321,12 @@ class MessageResource(Resource):
             except ValueError:
                 return {"error": "Invalid UUID format"}, 400
 
-            # Check if case exists first
-            case = case_service.get_case(uuid_obj)
-            if not case:
-                return {"error": "Support case not found"}, 404
+            if _wants_ndjson():
+                return self._export(uuid_obj)
+            if 'since' in request.args:
+                return self._get_since(uuid_obj)
+            if 'after' in request.args:
+                return self._get_page(uuid_obj)
 
             try:
                 limit = min(int(request.args.get('limit', 10)), 100)
@@ -167,25 +334,146 @@ class MessageResource(Resource):
             except ValueError:
                 return {"error": "Invalid pagination parameters"}, 400
 
-            messages, total = message_service.get_case_messages(uuid_obj, limit, offset)
-            return {
-                "messages": [{
-                    'id': str(message.id),
-                    'case_id': str(message.case_id),
-                    'content': message.content,
-                    'created_at': message.created_at.isoformat()
-                } for message in messages],
-                "pagination": {
-                    "total": total,
-                    "offset": offset,
-                    "limit": limit
-                }
+            revision, response = self._check_revision(uuid_obj)
+            if response is not None:
+                return response
+
+            result = message_service.get_case_messages(uuid_obj, limit, offset, case_checked=True)
+            if result is None:
+                return {"error": "Support case not found"}, 404
+
+            messages, total = result
+            pagination = {
+                "total": total,
+                "offset": offset,
+                "limit": limit
             }
+            # Let offset clients switch to cursor mode for the following pages
+            if messages and offset + len(messages) < total:
+                last = messages[-1]
+                pagination["next_cursor"] = encode_cursor(Position(last.created_at, last.id))
+
+            return {
+                "messages": [message_to_dict(message) for message in messages],
+                "pagination": pagination
+            }, 200, validator_headers(revision)
 
         except Exception as e:
             logger.error(f"Error retrieving messages: {str(e)}")
             return {"error": "Internal server error"}, 500
 
+    @staticmethod
+    def _check_revision(case_id):
+        """Read the case revision, with the response to send instead of the page if there is one.
+
+        The revision stands in for the existence check. It is read before the
+        page, so a message added in between at worst makes the next
+        revalidation miss.
+        """
+        revision = case_service.get_case_revision(case_id)
+        if revision is None:
+            return None, ({"error": "Support case not found"}, 404)
+        if is_not_modified(revision):
+            return revision, not_modified(revision)
+        return revision, None
+
+    def _get_page(self, case_id):
+        """Return a keyset page of messages starting after the `after` cursor."""
+        try:
+            limit = max(min(int(request.args.get('limit', 10)), 100), 1)
+            after = request.args['after']
+            position = decode_cursor(after) if after else None
+        except ValueError:
+            return {"error": "Invalid pagination parameters"}, 400
+
+        revision, response = self._check_revision(case_id)
+        if response is not None:
+            return response
+
+        include_total = request.args.get('include_total', 'false').lower() == 'true'
+        page = message_service.get_case_messages_page(case_id, limit, position, include_total, case_checked=True)
+        if page is None:
+            return {"error": "Support case not found"}, 404
+
+        pagination = {
+            "limit": limit,
+            "next_cursor": encode_cursor(page.next_position) if page.next_position else None
+        }
+        if include_total:
+            pagination["total"] = page.total
+
+        return {
+            "messages": [message_to_dict(message) for message in page.items],
+            "pagination": pagination
+        }, 200, validator_headers(revision)
+
+    def _export(self, case_id):
+        """Stream the whole thread as NDJSON, newest first, starting after the optional `after` cursor."""
+        try:
+            after = request.args.get('after')
+            position = decode_cursor(after) if after else None
+        except ValueError:
+            return {"error": "Invalid pagination parameters"}, 400
+
+        messages = message_service.stream_case_messages(case_id, position)
+        if messages is None:
+            return {"error": "Support case not found"}, 404
+        return ndjson_response(messages, message_to_dict)
+
+    def _get_since(self, case_id):
+        """Return messages newer than the `since` cursor or timestamp, oldest first.
+
+        With `wait`, an empty result is held open until a message arrives or
+        the wait runs out, so idle clients poll rarely; such polls are never
+        answered with a 304, which would end the wait early.
+        """
+        try:
+            limit = max(min(int(request.args.get('limit', 10)), 100), 1)
+            since = request.args['since']
+            position = decode_since(since)
+            wait = float(request.args.get('wait', 0))
+            if not wait >= 0:
+                raise ValueError("wait must be a non-negative number")
+            wait = min(wait, current_app.config["MESSAGE_LONG_POLL_MAX_SECONDS"])
+        except ValueError:
+            return {"error": "Invalid pagination parameters"}, 400
+
+        revision = None
+        if not wait:
+            revision, response = self._check_revision(case_id)
+            if response is not None:
+                return response
+
+        # Subscribe before querying so a message committed in between still wakes the poll
+        subscription = message_hub.subscribe(case_id) if wait else None
+        try:
+            page = message_service.get_case_messages_since(case_id, position, limit,
+                                                           case_checked=revision is not None)
+            if page is None:
+                return {"error": "Support case not found"}, 404
+            if not page.items and subscription is not None:
+                # End the read transaction first: waiting while holding its pooled
+                # connection would let a few idle pollers exhaust the pool
+                db.session.rollback()
+                if subscription.get(timeout=wait) is not None:
+                    page = message_service.get_case_messages_since(case_id, position, limit)
+        finally:
+            if subscription is not None:
+                subscription.close()
+
+        if page.items:
+            last = page.items[-1]
+            since = encode_cursor(Position(last.created_at, last.id))
+
+        return {
+            "messages": [message_to_dict(message) for message in page.items],
+            "pagination": {
+                "limit": limit,
+                "next_cursor": since,
+                "has_more": page.next_position is not None
+            }
+        }, 200, validator_headers(revision) if revision is not None else {}
+
     def post(self, case_id):
         try:
             try:
@@ -193,25 +481,16 @@ class MessageResource(Resource):
             except ValueError:
                 return {"error": "Invalid UUID format"}, 400
 
-            # Check if case exists first
-            case = case_service.get_case(uuid_obj)
-            if not case:
-                return {"error": "Support case not found"}, 404
-
             data = request.get_json()
-            if not validate_message(data):
-                return {"error": "Invalid message data"}, 400
+            errors = message_errors(data)
+            if errors:
+                return {"error": "Invalid message data", "details": errors}, 400
 
             message = message_service.add_message(uuid_obj, data["content"])
             if not message:
-                return {"error": "Failed to create message"}, 500
+                return {"error": "Support case not found"}, 404
 
-            return {
-                'id': str(message.id),
-                'case_id': str(message.case_id),
-                'content': message.content,
-                'created_at': message.created_at.isoformat()
-            }, 201
+            return message_to_dict(message), 201
 
         except Exception as e:
             logger.error(f"Error creating message: {str(e)}")
@@ -226,8 +505,7 @@ class MessageResource(Resource):
                 return {"error": "Invalid UUID format"}, 400
 
             # Check if case exists first
-            case = case_service.get_case(case_uuid)
-            if not case:
+            if not case_service.case_exists(case_uuid):
                 return {"error": "Support case not found"}, 404
 
             if message_service.delete_message(case_uuid, message_uuid):
@@ -238,12 +516,218 @@ class MessageResource(Resource):
             logger.error(f"Error deleting message: {str(e)}")
             return {"error": "Internal server error"}, 500
 
+class MessageStreamResource(Resource):
+    """REST resource pushing new messages of a case as Server-Sent Events."""
+
+    # Messages read per query when replaying what a reconnecting client missed
+    REPLAY_PAGE_SIZE = 100
+
+    def get(self, case_id):
+        try:
+            uuid_obj = UUID(case_id)
+        except ValueError:
+            return {"error": "Invalid UUID format"}, 400
+
+        # EventSource sends back the id of the last frame it saw when it reconnects
+        try:
+            last_event_id = request.headers.get('Last-Event-ID')
+            since = decode_cursor(last_event_id) if last_event_id else None
+        except ValueError:
+            return {"error": "Invalid Last-Event-ID"}, 400
+
+        try:
+            if not case_service.case_exists(uuid_obj):
+                return {"error": "Support case not found"}, 404
+        except Exception as e:
+            logger.error(f"Error opening message stream: {str(e)}")
+            return {"error": "Internal server error"}, 500
+
+        # Subscribe before responding, and before replaying, so nothing committed meanwhile is missed
+        subscription = message_hub.subscribe(uuid_obj)
+        max_replay = current_app.config["MESSAGE_STREAM_QUEUE_SIZE"]
+        missed, caught_up = [], True
+        if since is not None:
+            try:
+                missed, caught_up = self._missed(uuid_obj, since, max_replay)
+            except Exception as e:
+                subscription.close()
+                logger.error(f"Error replaying message stream: {str(e)}")
+                return {"error": "Internal server error"}, 500
+
+        heartbeat = current_app.config["MESSAGE_STREAM_HEARTBEAT_SECONDS"]
+        return Response(self._events(subscription, heartbeat, missed, caught_up),
+                        mimetype='text/event-stream', headers={
+                            'Cache-Control': 'no-cache',
+                            'X-Accel-Buffering': 'no'
+                        })
+
+    def _missed(self, case_id, since, max_replay):
+        """Read up to max_replay messages created after since, and whether that was all of them."""
+        missed = []
+        while len(missed) < max_replay:
+            page = message_service.get_case_messages_since(
+                case_id, since, min(self.REPLAY_PAGE_SIZE, max_replay - len(missed)), case_checked=True)
+            missed.extend(page.items)
+            if page.next_position is None:
+                return missed, True
+            since = page.next_position
+        return missed, False
+
+    @staticmethod
+    def _frame(message):
+        data = dumps(message_to_dict(message)).decode()
+        cursor = encode_cursor(Position(message.created_at, message.id))
+        return f"id: {cursor}\nevent: message\ndata: {data}\n\n"
+
+    @classmethod
+    def _events(cls, subscription, heartbeat, missed=(), caught_up=True):
+        """Yield SSE frames until the client disconnects or falls too far behind.
+
+        Missed messages are sent first. If there were too many to replay at
+        once the stream ends after them, and the client reconnecting from the
+        last one gets the rest.
+        """
+        with subscription:
+            yield f"retry: {int(heartbeat * 1000)}\n\n"
+            for message in missed:
+                yield cls._frame(message)
+            if not caught_up:
+                return
+            # Messages committed between subscribing and replaying arrive twice
+            replayed = {message.id for message in missed}
+            while not subscription.overflowed:
+                message = subscription.get(timeout=heartbeat)
+                if message is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                if message.id in replayed:
+                    continue
+                yield cls._frame(message)
+
+class SearchResource(Resource):
+    """REST resource for full-text search over cases and messages."""
+
+    def get(self):
+        try:
+            try:
+                query = request.args.get('q', '').strip()
+                limit = max(min(int(request.args.get('limit', 20)), 100), 1)
+                offset = max(int(request.args.get('offset', 0)), 0)
+                kind = request.args.get('type') or None
+                if not query or kind not in (None, CASE, MESSAGE):
+                    raise ValueError("q is required and type must be 'case' or 'message'")
+            except ValueError:
+                return {"error": "Invalid query parameters"}, 400
+
+            hits, has_more = search_service.search(query, limit, offset, kind)
+            return {
+                "results": [{
+                    'type': hit.kind,
+                    'id': hit.id,
+                    'case_id': hit.case_id,
+                    'rank': hit.rank,
+                    'snippet': hit.snippet
+                } for hit in hits],
+                "pagination": {
+                    "limit": limit,
+                    "offset": offset,
+                    "has_more": has_more
+                }
+            }
+
+        except Exception as e:
+            logger.error(f"Error searching: {str(e)}")
+            return {"error": "Internal server error"}, 500
+
+# Placeholder for NDJSON lines that are not valid JSON
+_INVALID_JSON = object()
+
+class MessageBatchResource(Resource):
+    """REST resource for bulk message ingestion."""
+
+    def post(self, case_id):
+        """Add many messages from a JSON array or an NDJSON body.
+
+        Valid items are inserted together in one transaction; every item gets
+        its own result so callers can retry only the ones that failed.
+        """
+        try:
+            try:
+                uuid_obj = UUID(case_id)
+            except ValueError:
+                return {"error": "Invalid UUID format"}, 400
+
+            items = self._parse_items()
+            if items is None:
+                return {"error": "Expected a JSON array or NDJSON body"}, 400
+            if len(items) > current_app.config["MESSAGE_BATCH_MAX_ITEMS"]:
+                return {"error": "Too many messages in batch"}, 413
+
+            results = [None] * len(items)
+            valid = []
+            for index, item in enumerate(items):
+                if item is _INVALID_JSON:
+                    results[index] = {"index": index, "status": 400, "error": "Invalid JSON"}
+                    continue
+                errors = message_errors(item)
+                if errors:
+                    results[index] = {"index": index, "status": 400, "error": "Invalid message data",
+                                      "details": errors}
+                else:
+                    valid.append(index)
+
+            messages = message_service.add_messages(uuid_obj, [items[index]["content"] for index in valid])
+            if messages is None:
+                return {"error": "Support case not found"}, 404
+
+            for index, message in zip(valid, messages):
+                results[index] = {
+                    "index": index,
+                    "status": 201,
+                    "id": message.id,
+                    "created_at": message.created_at
+                }
+
+            if len(valid) == len(items):
+                status = 201
+            else:
+                status = 207 if valid else 400
+            return {"created": len(valid), "failed": len(items) - len(valid), "results": results}, status
+
+        except Exception as e:
+            logger.error(f"Error creating messages in bulk: {str(e)}")
+            return {"error": "Internal server error"}, 500
+
+    @staticmethod
+    def _parse_items():
+        """Return the list of submitted items, or None if the body is malformed."""
+        if request.mimetype == 'application/x-ndjson':
+            items = []
+            for line in request.get_data(as_text=True).splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    items.append(json.loads(line))
+                except ValueError:
+                    items.append(_INVALID_JSON)
+            return items
+
+        data = request.get_json(silent=True)
+        return data if isinstance(data, list) else None
+
 def initialize_routes(api):
     """Initialize the API routes."""
     api.add_resource(HealthCheckResource, '/health')
+    api.add_resource(LivenessResource, '/health/live')
+    api.add_resource(ReadinessResource, '/health/ready')
+    api.add_resource(MetricsResource, '/metrics')
+    api.add_resource(SearchResource, '/api/search')
+    api.add_resource(SupportCaseBatchResource, '/api/cases/batch')
     api.add_resource(SupportCaseResource, 
                     '/api/cases',
                     '/api/cases/<string:case_id>')
     api.add_resource(MessageResource,
                     '/api/cases/<string:case_id>/messages',
-                    '/api/cases/<string:case_id>/messages/<string:message_id>')
\ No newline at end of file
+                    '/api/cases/<string:case_id>/messages/<string:message_id>')
+    api.add_resource(MessageBatchResource, '/api/cases/<string:case_id>/messages/batch')
+    api.add_resource(MessageStreamResource, '/api/cases/<string:case_id>/messages/stream')
\ No newline at end of file
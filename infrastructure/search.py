@@ -0,0 +1,131 @@
+"""Full-text search backends on the database's own text indexes.
+
+Both backends index inside the database, so every write path, including the
+bulk inserts and updates, keeps the index current in the same transaction:
+  - PostgreSQL: GIN indexes on to_tsvector() expressions, queried with
+    websearch_to_tsquery() and ranked by ts_rank().
+  - SQLite: external-content FTS5 tables maintained by triggers, ranked by bm25().
+The schema for both lives in infrastructure.models and migration 0003.
+"""
+import html
+import re
+from typing import List, Optional
+from uuid import UUID
+from sqlalchemy import text
+from domain.search import CASE, MESSAGE, SearchHit, SearchIndex
+from infrastructure.database import db
+
+# Highlight markers around matched terms in snippets
+MARK_START = '<mark>'
+MARK_END = '</mark>'
+
+# Control characters the database wraps matched terms in, so the stored text is escaped before the
+# markers go in; stored text containing them can at worst add a stray marker, never other markup
+MATCH_START = '\x02'
+MATCH_END = '\x03'
+
+def highlight(snippet: str) -> str:
+    """Turn a database snippet into HTML: stored text escaped, matched terms wrapped in <mark>."""
+    return html.escape(snippet).replace(MATCH_START, MARK_START).replace(MATCH_END, MARK_END)
+
+class PostgresSearchIndex(SearchIndex):
+    """Search backend for PostgreSQL text search."""
+
+    # Must match the indexed expressions exactly for the GIN indexes to be used
+    CASE_VECTOR = ("setweight(to_tsvector('english', c.summary), 'A') || "
+                   "setweight(to_tsvector('english', c.description), 'B')")
+    MESSAGE_VECTOR = "to_tsvector('english', m.content)"
+
+    def search(self, query: str, limit: int = 20, offset: int = 0,
+               kind: Optional[str] = None) -> List[SearchHit]:
+        branches = []
+        if kind in (None, CASE):
+            branches.append(f"""
+                SELECT 'case' AS kind, c.id, c.id AS case_id, c.summary || ' ' || c.description AS body,
+                       ts_rank({self.CASE_VECTOR}, q.query) AS rank
+                FROM support_cases c, q
+                WHERE {self.CASE_VECTOR} @@ q.query""")
+        if kind in (None, MESSAGE):
+            branches.append(f"""
+                SELECT 'message' AS kind, m.id, m.case_id, m.content AS body,
+                       ts_rank({self.MESSAGE_VECTOR}, q.query) AS rank
+                FROM messages m, q
+                WHERE {self.MESSAGE_VECTOR} @@ q.query""")
+
+        # Headlines are costly, so only the rows of the requested page get one
+        statement = text(f"""
+            WITH q AS (SELECT websearch_to_tsquery('english', :query) AS query)
+            SELECT hits.kind, hits.id, hits.case_id, hits.rank,
+                   ts_headline('english', hits.body, q.query,
+                               'StartSel={MATCH_START}, StopSel={MATCH_END}, MaxWords=20, MinWords=5')
+            FROM ({' UNION ALL '.join(branches)}
+                  ORDER BY rank DESC, id
+                  LIMIT :limit OFFSET :offset) hits, q
+            ORDER BY hits.rank DESC, hits.id""")
+        rows = db.session.execute(statement, {'query': query, 'limit': limit, 'offset': offset})
+        return [SearchHit(row[0], row[1], row[2], float(row[3]), highlight(row[4])) for row in rows]
+
+class SQLiteSearchIndex(SearchIndex):
+    """Search backend for SQLite FTS5."""
+
+    # Summary matches weigh twice as much as description matches
+    CASE_RANK = "-bm25(support_cases_fts, 2.0, 1.0)"
+    MESSAGE_RANK = "-bm25(messages_fts)"
+
+    def search(self, query: str, limit: int = 20, offset: int = 0,
+               kind: Optional[str] = None) -> List[SearchHit]:
+        match = self.match_expression(query)
+        if not match:
+            return []
+
+        branches = []
+        if kind in (None, CASE):
+            branches.append(f"""
+                SELECT 'case' AS kind, c.id AS id, c.id AS case_id, {self.CASE_RANK} AS rank,
+                       snippet(support_cases_fts, -1, '{MATCH_START}', '{MATCH_END}', '...', 20) AS snippet
+                FROM support_cases_fts JOIN support_cases c ON c.rowid = support_cases_fts.rowid
+                WHERE support_cases_fts MATCH :match""")
+        if kind in (None, MESSAGE):
+            branches.append(f"""
+                SELECT 'message' AS kind, m.id AS id, m.case_id AS case_id, {self.MESSAGE_RANK} AS rank,
+                       snippet(messages_fts, 0, '{MATCH_START}', '{MATCH_END}', '...', 20) AS snippet
+                FROM messages_fts JOIN messages m ON m.rowid = messages_fts.rowid
+                WHERE messages_fts MATCH :match""")
+
+        statement = text(f"{' UNION ALL '.join(branches)} ORDER BY rank DESC, id LIMIT :limit OFFSET :offset")
+        rows = db.session.execute(statement, {'match': match, 'limit': limit, 'offset': offset})
+        return [SearchHit(row[0], self._uuid(row[1]), self._uuid(row[2]), float(row[3]), highlight(row[4]))
+                for row in rows]
+
+    @staticmethod
+    def match_expression(query: str) -> str:
+        """Turn free text into an FTS5 query matching all of its words.
+
+        Quoting every word keeps FTS5 operators and punctuation in user input
+        from being parsed as query syntax.
+        """
+        return ' '.join(f'"{word}"' for word in re.findall(r'\w+', query))
+
+    @staticmethod
+    def rebuild() -> None:
+        """Rebuild the FTS tables from their content tables.
+
+        The tables are keyed by rowid, which VACUUM may renumber; run this after
+        one, as `flask --app app rebuild-search-index`.
+        """
+        db.session.execute(text("INSERT INTO support_cases_fts(support_cases_fts) VALUES ('rebuild')"))
+        db.session.execute(text("INSERT INTO messages_fts(messages_fts) VALUES ('rebuild')"))
+        db.session.commit()
+
+    @staticmethod
+    def _uuid(value) -> UUID:
+        # Raw SQL bypasses the UUID column type, which stores 32 hex digits on SQLite
+        return value if isinstance(value, UUID) else UUID(value)
+
+def search_index_for(dialect_name: str) -> SearchIndex:
+    """Return the search backend for a SQLAlchemy dialect name."""
+    if dialect_name == 'postgresql':
+        return PostgresSearchIndex()
+    if dialect_name == 'sqlite':
+        return SQLiteSearchIndex()
+    raise ValueError(f"No full-text search backend for dialect {dialect_name!r}")
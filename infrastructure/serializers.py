@@ -0,0 +1,108 @@
+"""JSON serialization of API payloads.
+
+Payload builders keep UUIDs and datetimes as they are and leave their
+encoding to the JSON encoder: orjson encodes both natively in C, and the
+stdlib fallback converts them in its `default` hook. Either way datetimes
+come out in `isoformat()` form and UUIDs in their hyphenated form.
+"""
+import json
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, TypeVar
+from uuid import UUID
+from flask import Response, make_response, stream_with_context
+from domain.entities import SupportCase, Message
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Objects encoded per chunk written to the client when streaming NDJSON
+NDJSON_CHUNK_SIZE = 100
+
+def case_to_dict(case: SupportCase) -> Dict[str, Any]:
+    """Payload of a support case, without its messages."""
+    return {
+        'id': case.id,
+        'summary': case.summary,
+        'description': case.description,
+        'customer_id': case.customer_id,
+        'created_at': case.created_at,
+        'message_count': case.message_count,
+        'last_message_at': case.last_message_at
+    }
+
+def message_to_dict(message: Message) -> Dict[str, Any]:
+    """Payload of a message."""
+    return {
+        'id': message.id,
+        'case_id': message.case_id,
+        'content': message.content,
+        'created_at': message.created_at
+    }
+
+def _default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def stdlib_dumps(data: Any) -> bytes:
+    """Encode data as compact UTF-8 JSON with the standard library."""
+    return json.dumps(data, default=_default, separators=(',', ':'), ensure_ascii=False).encode()
+
+def orjson_dumps(data: Any) -> bytes:
+    """Encode data as compact UTF-8 JSON with orjson."""
+    # Other types orjson does not know still go through the stdlib conversions
+    return orjson.dumps(data, default=_default)
+
+dumps = orjson_dumps if orjson is not None else stdlib_dumps
+
+def json_representation(encoder: Optional[Callable[[Any], bytes]] = None):
+    """Build a Flask-RESTful representation function encoding responses with encoder.
+
+    Defaults to orjson when it is installed and the standard library otherwise.
+    """
+    encoder = encoder or dumps
+
+    def output_json(data: Any, code: int, headers: Optional[Dict[str, str]] = None):
+        response = make_response(encoder(data), code)
+        response.headers['Content-Type'] = 'application/json'
+        response.headers.extend(headers or {})
+        return response
+
+    return output_json
+
+def ndjson_lines(items: Iterable[T], to_dict: Callable[[T], Dict[str, Any]],
+                 chunk_size: int = NDJSON_CHUNK_SIZE) -> Iterator[bytes]:
+    """Encode items as NDJSON, one object per line, yielding chunk_size lines at a time."""
+    lines = []
+    for item in items:
+        lines.append(dumps(to_dict(item)))
+        if len(lines) >= chunk_size:
+            yield b'\n'.join(lines) + b'\n'
+            lines = []
+    if lines:
+        yield b'\n'.join(lines) + b'\n'
+
+def ndjson_response(items: Iterable[T], to_dict: Callable[[T], Dict[str, Any]]) -> Response:
+    """Stream items as an NDJSON response while they are read, holding one chunk in memory at a time.
+
+    The request context stays open until the body is sent, so items may be
+    read lazily from the request's database session. Headers are sent before
+    the first item is read; a failure after that cuts the body short.
+    """
+    def chunks():
+        try:
+            yield from ndjson_lines(items, to_dict)
+        except Exception as e:
+            logger.error(f"Error streaming response: {str(e)}")
+            raise
+
+    return Response(stream_with_context(chunks()), mimetype='application/x-ndjson')
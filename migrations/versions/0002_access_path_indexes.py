@@ -0,0 +1,28 @@
+"""Add indexes for message pages and per-customer case listings
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 09:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_messages_case_id_created_at_id', 'messages',
+                    ['case_id', sa.text('created_at DESC'), 'id'], unique=False)
+    op.create_index('ix_support_cases_customer_id_created_at', 'support_cases',
+                    ['customer_id', 'created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_support_cases_customer_id_created_at', table_name='support_cases')
+    op.drop_index('ix_messages_case_id_created_at_id', table_name='messages')
@@ -0,0 +1,66 @@
+"""Add full-text search indexes over cases and messages
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 09:10:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("CREATE INDEX ix_support_cases_search ON support_cases USING gin "
+                   "((setweight(to_tsvector('english', summary), 'A') || "
+                   "setweight(to_tsvector('english', description), 'B')))")
+        op.execute("CREATE INDEX ix_messages_search ON messages USING gin (to_tsvector('english', content))")
+    elif dialect == 'sqlite':
+        op.execute("CREATE VIRTUAL TABLE support_cases_fts USING fts5("
+                   "summary, description, content='support_cases', tokenize='porter unicode61')")
+        op.execute("CREATE TRIGGER support_cases_fts_insert AFTER INSERT ON support_cases BEGIN "
+                   "INSERT INTO support_cases_fts(rowid, summary, description) "
+                   "VALUES (new.rowid, new.summary, new.description); END")
+        op.execute("CREATE TRIGGER support_cases_fts_delete AFTER DELETE ON support_cases BEGIN "
+                   "INSERT INTO support_cases_fts(support_cases_fts, rowid, summary, description) "
+                   "VALUES ('delete', old.rowid, old.summary, old.description); END")
+        op.execute("CREATE TRIGGER support_cases_fts_update AFTER UPDATE OF summary, description "
+                   "ON support_cases BEGIN "
+                   "INSERT INTO support_cases_fts(support_cases_fts, rowid, summary, description) "
+                   "VALUES ('delete', old.rowid, old.summary, old.description); "
+                   "INSERT INTO support_cases_fts(rowid, summary, description) "
+                   "VALUES (new.rowid, new.summary, new.description); END")
+        op.execute("CREATE VIRTUAL TABLE messages_fts USING fts5("
+                   "content, content='messages', tokenize='porter unicode61')")
+        op.execute("CREATE TRIGGER messages_fts_insert AFTER INSERT ON messages BEGIN "
+                   "INSERT INTO messages_fts(rowid, content) VALUES (new.rowid, new.content); END")
+        op.execute("CREATE TRIGGER messages_fts_delete AFTER DELETE ON messages BEGIN "
+                   "INSERT INTO messages_fts(messages_fts, rowid, content) "
+                   "VALUES ('delete', old.rowid, old.content); END")
+        op.execute("CREATE TRIGGER messages_fts_update AFTER UPDATE OF content ON messages BEGIN "
+                   "INSERT INTO messages_fts(messages_fts, rowid, content) "
+                   "VALUES ('delete', old.rowid, old.content); "
+                   "INSERT INTO messages_fts(rowid, content) VALUES (new.rowid, new.content); END")
+        # Index the rows that existed before the triggers
+        op.execute("INSERT INTO support_cases_fts(support_cases_fts) VALUES ('rebuild')")
+        op.execute("INSERT INTO messages_fts(messages_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.drop_index('ix_messages_search', table_name='messages')
+        op.drop_index('ix_support_cases_search', table_name='support_cases')
+    elif dialect == 'sqlite':
+        for trigger in ('messages_fts_update', 'messages_fts_delete', 'messages_fts_insert',
+                        'support_cases_fts_update', 'support_cases_fts_delete', 'support_cases_fts_insert'):
+            op.execute(f"DROP TRIGGER {trigger}")
+        op.execute("DROP TABLE messages_fts")
+        op.execute("DROP TABLE support_cases_fts")
@@ -0,0 +1,36 @@
+"""Add denormalized message counters and activity index to support cases
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 09:15:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('support_cases', sa.Column('message_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('support_cases', sa.Column('last_message_at', sa.DateTime(), nullable=True))
+
+    # Backfill from the existing threads; later writes keep the counters current
+    op.execute("UPDATE support_cases SET "
+               "message_count = (SELECT count(*) FROM messages WHERE messages.case_id = support_cases.id), "
+               "last_message_at = (SELECT max(created_at) FROM messages WHERE messages.case_id = support_cases.id)")
+
+    op.create_index('ix_support_cases_activity', 'support_cases',
+                    [sa.text('coalesce(last_message_at, created_at) DESC'), sa.text('id DESC')], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_support_cases_activity', table_name='support_cases')
+    # Plain ALTER TABLE rather than a batch table rebuild, which would drop the search triggers
+    op.drop_column('support_cases', 'last_message_at')
+    op.drop_column('support_cases', 'message_count')
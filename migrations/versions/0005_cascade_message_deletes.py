@@ -0,0 +1,69 @@
+"""Delete a case's messages with the case through ON DELETE CASCADE
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 09:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+# PostgreSQL's name for the unnamed foreign key created by 0001
+FOREIGN_KEY = 'messages_case_id_fkey'
+
+
+def upgrade():
+    _set_on_delete('CASCADE')
+
+
+def downgrade():
+    _set_on_delete(None)
+
+
+def _set_on_delete(ondelete):
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        _rebuild_sqlite_messages(ondelete)
+    else:
+        op.drop_constraint(FOREIGN_KEY, 'messages', type_='foreignkey')
+        op.create_foreign_key(FOREIGN_KEY, 'messages', 'support_cases', ['case_id'], ['id'], ondelete=ondelete)
+
+
+def _rebuild_sqlite_messages(ondelete):
+    # SQLite cannot alter a foreign key, so the table is copied. Rows keep their
+    # rowids, which the external-content search index refers to, the search
+    # triggers dropped with the old table are created again, and the index is
+    # rebuilt from the new table so it matches it whatever the copy did.
+    op.create_table('messages_rebuilt',
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('case_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['case_id'], ['support_cases.id'], ondelete=ondelete),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("INSERT INTO messages_rebuilt (rowid, id, case_id, content, created_at) "
+               "SELECT rowid, id, case_id, content, created_at FROM messages")
+    op.drop_table('messages')
+    op.rename_table('messages_rebuilt', 'messages')
+    op.create_index('ix_messages_case_id_created_at_id', 'messages',
+                    ['case_id', sa.text('created_at DESC'), 'id'], unique=False)
+
+    op.execute("CREATE TRIGGER messages_fts_insert AFTER INSERT ON messages BEGIN "
+               "INSERT INTO messages_fts(rowid, content) VALUES (new.rowid, new.content); END")
+    op.execute("INSERT INTO messages_fts(messages_fts) VALUES ('rebuild')")
+    op.execute("CREATE TRIGGER messages_fts_delete AFTER DELETE ON messages BEGIN "
+               "INSERT INTO messages_fts(messages_fts, rowid, content) "
+               "VALUES ('delete', old.rowid, old.content); END")
+    op.execute("CREATE TRIGGER messages_fts_update AFTER UPDATE OF content ON messages BEGIN "
+               "INSERT INTO messages_fts(messages_fts, rowid, content) "
+               "VALUES ('delete', old.rowid, old.content); "
+               "INSERT INTO messages_fts(rowid, content) VALUES (new.rowid, new.content); END")
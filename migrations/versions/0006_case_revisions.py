@@ -0,0 +1,30 @@
+"""Add a revision (version and update time) to support cases
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 09:25:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('support_cases', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+    op.add_column('support_cases', sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    # A case last changed with its newest message, or when it was opened
+    op.execute("UPDATE support_cases SET updated_at = coalesce(last_message_at, created_at)")
+
+
+def downgrade():
+    # Plain ALTER TABLE rather than a batch table rebuild, which would drop the search triggers
+    op.drop_column('support_cases', 'updated_at')
+    op.drop_column('support_cases', 'version')
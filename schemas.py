@@ -9,6 +9,16 @@ SUPPORT_CASE_SCHEMA = {
     "additionalProperties": False
 }
 
+SUPPORT_CASE_BATCH_ITEM_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "id": {"type": "string"},
+        **SUPPORT_CASE_SCHEMA["properties"]
+    },
+    "required": SUPPORT_CASE_SCHEMA["required"],
+    "additionalProperties": False
+}
+
 MESSAGE_SCHEMA = {
     "type": "object",
     "properties": {
@@ -0,0 +1,16 @@
+"""Assertions on the number of SQL statements a block of test code issues."""
+from contextlib import contextmanager
+from infrastructure.request_metrics import request_metrics
+
+class QueryCountAssertions:
+    """TestCase mixin failing a test when code issues more SQL statements than allowed."""
+
+    @contextmanager
+    def assertMaxStatements(self, limit):
+        """Fail if the block issues more than limit statements, listing the ones it did."""
+        with request_metrics.record() as stats:
+            yield stats
+        self.assertLessEqual(
+            stats.statements, limit,
+            f"{stats.statements} SQL statements issued, at most {limit} allowed:\n" + "\n".join(stats.executed)
+        )
@@ -1,13 +1,17 @@
+import gzip
 import unittest
 import json
 from app import app, db
 import uuid
+from unittest.mock import patch
 from infrastructure.models import SupportCaseModel, MessageModel
 from domain.entities import SupportCase, Message
 from infrastructure.infrastructure_implementations import SQLAlchemySupportCaseRepository, SQLAlchemyMessageRepository
 from application.use_cases import SupportCaseService, MessageService
+from infrastructure.cache import CachingSupportCaseRepository
+from tests.query_counter import QueryCountAssertions
 
-class TestAPI(unittest.TestCase):
+class TestAPI(QueryCountAssertions, unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         app.config['TESTING'] = True
@@ -75,6 +79,67 @@ class TestAPI(unittest.TestCase):
         json_data = json.loads(response.data)
         self.assertEqual(json_data['id'], case_id)
 
+    def test_get_support_case_conditional(self):
+        """Test revalidating a case answers 304 until the case or its thread changes"""
+        case_id = self.create_test_case()
+        response = self.client.get(f'/api/cases/{case_id}')
+        etag = response.headers['ETag']
+        last_modified = response.headers['Last-Modified']
+        self.assertTrue(etag.startswith('W/'))
+
+        # A matching validator is answered from the revision alone
+        with self.assertMaxStatements(1):
+            response = self.client.get(f'/api/cases/{case_id}', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+        self.assertEqual(response.headers['ETag'], etag)
+
+        response = self.client.get(f'/api/cases/{case_id}', headers={'If-Modified-Since': last_modified})
+        self.assertEqual(response.status_code, 304)
+
+        etags = {etag}
+        data = {"summary": "Updated", "description": "Updated description", "customer_id": 1}
+        for change in (lambda: self.client.put(f'/api/cases/{case_id}', json=data),
+                       lambda: self.client.post(f'/api/cases/{case_id}/messages', json={"content": "Hi"}),
+                       lambda: self.client.post('/api/cases/batch', json=[dict(data, id=case_id)])):
+            change()
+            response = self.client.get(f'/api/cases/{case_id}', headers={'If-None-Match': ', '.join(etags)})
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn(response.headers['ETag'], etags)
+            etags.add(response.headers['ETag'])
+
+        response = self.client.get(f'/api/cases/{uuid.uuid4()}', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 404)
+
+    def test_get_support_case_conditional_with_case_cache(self):
+        """Test cached headers never disagree with the validators sent along"""
+        from infrastructure import routes
+        repository = CachingSupportCaseRepository(SQLAlchemySupportCaseRepository(),
+                                                  after_commit=routes.unit_of_work.after_commit)
+        case_service = SupportCaseService(repository, routes.message_repository, routes.unit_of_work)
+        message_service = MessageService(repository, routes.message_repository, routes.message_hub,
+                                         routes.unit_of_work, case_changed=repository.invalidate)
+        with patch.object(routes, 'case_service', case_service), \
+                patch.object(routes, 'message_service', message_service):
+            case_id = self.create_test_case()
+            etag = self.client.get(f'/api/cases/{case_id}').headers['ETag']
+
+            # A message posted through the API drops the cached header
+            self.client.post(f'/api/cases/{case_id}/messages', json={"content": "Hi"})
+            response = self.client.get(f'/api/cases/{case_id}', headers={'If-None-Match': etag})
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response.headers['ETag'], etag)
+            self.assertEqual(response.get_json()['message_count'], 1)
+            etag = response.headers['ETag']
+            self.assertEqual(self.client.get(f'/api/cases/{case_id}', headers={'If-None-Match': etag}).status_code,
+                             304)
+
+            # A write that bypasses this cache, as from another worker, is caught by the revision
+            self.message_service.add_message(uuid.UUID(case_id), "From elsewhere")
+            response = self.client.get(f'/api/cases/{case_id}', headers={'If-None-Match': etag})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.get_json()['message_count'], 2)
+
     def test_create_and_get_message(self):
         """Test creating and retrieving a message for a support case"""
         case_id = self.create_test_case()
@@ -132,3 +197,230 @@ class TestAPI(unittest.TestCase):
         self.assertEqual(json_data['pagination']['total'], 15)
         self.assertEqual(json_data['pagination']['limit'], 5)
         self.assertEqual(json_data['pagination']['offset'], 10)
+
+    def test_list_support_cases_pagination(self):
+        """Test paginated case listing with a keyset cursor"""
+        created = {self.create_test_case() for _ in range(5)}
+
+        response = self.client.get('/api/cases?limit=2')
+        self.assertEqual(response.status_code, 200)
+        json_data = json.loads(response.data)
+        self.assertEqual(len(json_data['cases']), 2)
+        self.assertEqual(json_data['pagination']['limit'], 2)
+
+        seen = [case['id'] for case in json_data['cases']]
+        while json_data['pagination']['next_cursor']:
+            response = self.client.get(f"/api/cases?limit=2&after={json_data['pagination']['next_cursor']}")
+            json_data = json.loads(response.data)
+            seen.extend(case['id'] for case in json_data['cases'])
+
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(set(seen), created)
+
+    def test_list_support_cases_filters(self):
+        """Test filtering the case listing by customer and creation time"""
+        self.create_test_case()
+        data = {
+            "summary": "Other customer",
+            "description": "Case for another customer",
+            "customer_id": 2
+        }
+        response = self.client.post('/api/cases',
+                                data=json.dumps(data),
+                                content_type='application/json')
+        other = json.loads(response.data)
+
+        response = self.client.get('/api/cases?customer_id=2')
+        json_data = json.loads(response.data)
+        self.assertEqual([case['id'] for case in json_data['cases']], [other['id']])
+
+        response = self.client.get(f"/api/cases?created_from={other['created_at']}")
+        json_data = json.loads(response.data)
+        self.assertEqual([case['id'] for case in json_data['cases']], [other['id']])
+
+        response = self.client.get(f"/api/cases?created_to={other['created_at']}")
+        json_data = json.loads(response.data)
+        self.assertEqual(len(json_data['cases']), 1)
+        self.assertNotEqual(json_data['cases'][0]['id'], other['id'])
+
+    def test_case_message_counters(self):
+        """Test that the case payload tracks its message count and last activity"""
+        case_id = self.create_test_case()
+        json_data = json.loads(self.client.get(f'/api/cases/{case_id}').data)
+        self.assertEqual(json_data['message_count'], 0)
+        self.assertIsNone(json_data['last_message_at'])
+
+        first = json.loads(self.client.post(f'/api/cases/{case_id}/messages', json={"content": "First"}).data)
+        self.client.post(f'/api/cases/{case_id}/messages/batch', json=[{"content": "Second"}, {"content": "Third"}])
+        response = self.client.get(f'/api/cases/{case_id}/messages?limit=1')
+        last = json.loads(response.data)['messages'][0]
+
+        json_data = json.loads(self.client.get(f'/api/cases/{case_id}').data)
+        self.assertEqual(json_data['message_count'], 3)
+        self.assertEqual(json_data['last_message_at'], last['created_at'])
+
+        self.client.delete(f"/api/cases/{case_id}/messages/{last['id']}")
+        self.client.delete(f"/api/cases/{case_id}/messages/{first['id']}")
+        json_data = json.loads(self.client.get(f'/api/cases/{case_id}').data)
+        self.assertEqual(json_data['message_count'], 1)
+        response = self.client.get(f'/api/cases/{case_id}/messages')
+        remaining = json.loads(response.data)
+        self.assertEqual(remaining['pagination']['total'], 1)
+        self.assertEqual(json_data['last_message_at'], remaining['messages'][0]['created_at'])
+
+    def test_list_support_cases_by_activity(self):
+        """Test that cases with the latest messages are listed first"""
+        quiet, busy, newest = (self.create_test_case() for _ in range(3))
+        self.client.post(f'/api/cases/{busy}/messages', json={"content": "Ping"})
+        self.client.post(f'/api/cases/{quiet}/messages', json={"content": "Ping"})
+
+        response = self.client.get('/api/cases?sort=activity&limit=2')
+        json_data = json.loads(response.data)
+        self.assertEqual([case['id'] for case in json_data['cases']], [quiet, busy])
+
+        response = self.client.get(f"/api/cases?sort=activity&after={json_data['pagination']['next_cursor']}")
+        json_data = json.loads(response.data)
+        self.assertEqual([case['id'] for case in json_data['cases']], [newest])
+
+    def test_export_support_cases_ndjson(self):
+        """Test listings stream as compressed NDJSON when asked for, with the listing filters"""
+        items = [{"summary": f"Case {i}", "description": "Export", "customer_id": i % 2} for i in range(150)]
+        self.client.post('/api/cases/batch', json=items)
+
+        response = self.client.get('/api/cases?customer_id=1', headers={
+            'Accept': 'application/x-ndjson',
+            'Accept-Encoding': 'gzip'
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        cases = [json.loads(line) for line in gzip.decompress(response.data).splitlines()]
+        self.assertEqual(len(cases), 75)
+        self.assertTrue(all(case['customer_id'] == 1 for case in cases))
+
+        # Without the NDJSON preference the listing stays a bounded JSON page
+        response = self.client.get('/api/cases?customer_id=1', headers={'Accept': 'application/json, */*'})
+        self.assertEqual(len(response.get_json()['cases']), 20)
+
+    def test_support_case_statement_budgets(self):
+        """Test the number of SQL statements each case endpoint may issue"""
+        case_id = self.create_test_case()
+        self.client.post(f'/api/cases/{case_id}/messages/batch', json=[{"content": "Thread"}] * 50)
+        data = {"summary": "Updated", "description": "Updated description", "customer_id": 1}
+
+        with self.assertMaxStatements(1):
+            self.client.post('/api/cases', json=data)
+        # The revision, then the header it validates
+        with self.assertMaxStatements(2):
+            self.client.get(f'/api/cases/{case_id}')
+        with self.assertMaxStatements(1):
+            self.client.get('/api/cases?limit=100')
+        with self.assertMaxStatements(1):
+            self.client.get('/api/cases?sort=activity')
+        with self.assertMaxStatements(1):
+            self.client.put(f'/api/cases/{case_id}', json=data)
+        with self.assertMaxStatements(2):
+            self.client.post('/api/cases/batch', json=[data] * 20)
+        with self.assertMaxStatements(1):
+            self.client.get('/api/search?q=updated')
+        with self.assertMaxStatements(1):
+            self.client.delete(f'/api/cases/{case_id}')
+
+    def test_delete_support_case_cascades_to_messages(self):
+        """Test deleting a case removes its thread in the database, without loading it"""
+        case_id = self.create_test_case()
+        self.client.post(f'/api/cases/{case_id}/messages/batch', json=[{"content": "Thread"}] * 200)
+
+        with self.assertMaxStatements(1):
+            response = self.client.delete(f'/api/cases/{case_id}')
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(db.session.query(MessageModel).count(), 0)
+        self.assertEqual(self.client.delete(f'/api/cases/{case_id}').status_code, 404)
+
+    def test_list_support_cases_invalid_parameters(self):
+        """Test that invalid listing parameters return 400"""
+        for query in ('limit=invalid', 'customer_id=invalid', 'created_from=invalid', 'after=invalid',
+                      'sort=invalid'):
+            response = self.client.get(f'/api/cases?{query}')
+            self.assertEqual(response.status_code, 400)
+
+    def test_batch_upsert_support_cases(self):
+        """Test bulk creation and update of support cases"""
+        existing_id = self.create_test_case()
+        new_id = str(uuid.uuid4())
+        items = [
+            {"id": existing_id, "summary": "Updated", "description": "Updated description", "customer_id": 3},
+            {"id": new_id, "summary": "Imported", "description": "Imported from CRM", "customer_id": 4},
+            {"summary": "Fresh", "description": "No id given", "customer_id": 5},
+            {"summary": "", "description": "Invalid", "customer_id": 5},
+            {"id": new_id, "summary": "Again", "description": "Duplicate id", "customer_id": 4},
+            {"id": "not-a-uuid", "summary": "Bad", "description": "Bad id", "customer_id": 4}
+        ]
+        response = self.client.post('/api/cases/batch', json=items)
+        self.assertEqual(response.status_code, 207)
+
+        json_data = json.loads(response.data)
+        self.assertEqual(json_data['stored'], 3)
+        self.assertEqual([r['status'] for r in json_data['results']], [200, 201, 201, 400, 400, 400])
+        self.assertEqual(json_data['results'][1]['id'], new_id)
+
+        response = self.client.get(f'/api/cases/{existing_id}')
+        json_data = json.loads(response.data)
+        self.assertEqual(json_data['summary'], 'Updated')
+        self.assertEqual(json_data['customer_id'], 3)
+
+        response = self.client.get(f'/api/cases/{new_id}')
+        self.assertEqual(response.status_code, 200)
+
+    def test_batch_upsert_existing_new_id(self):
+        """Test an id stored since the client last saw it is updated rather than failing its chunk"""
+        case_id = str(uuid.uuid4())
+        item = {"id": case_id, "summary": "Imported", "description": "Imported from CRM", "customer_id": 4}
+        with self.assertMaxStatements(1):
+            response = self.client.post('/api/cases/batch', json=[item])
+        self.assertEqual(response.get_json()['results'][0]['status'], 201)
+
+        response = self.client.post('/api/cases/batch', json=[dict(item, summary="Imported again")])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['results'][0]['status'], 200)
+        case = self.client.get(f'/api/cases/{case_id}').get_json()
+        self.assertEqual(case['summary'], "Imported again")
+
+    def test_batch_upsert_support_cases_in_chunks(self):
+        """Test bulk upserts larger than the chunk size"""
+        chunk_size = app.config['CASE_BATCH_CHUNK_SIZE']
+        app.config['CASE_BATCH_CHUNK_SIZE'] = 3
+        self.addCleanup(app.config.__setitem__, 'CASE_BATCH_CHUNK_SIZE', chunk_size)
+
+        items = [{"summary": f"Case {i}", "description": "Bulk", "customer_id": 7} for i in range(10)]
+        response = self.client.post('/api/cases/batch', json=items)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)['stored'], 10)
+
+        response = self.client.get('/api/cases?customer_id=7&limit=100')
+        self.assertEqual(len(json.loads(response.data)['cases']), 10)
+
+    def test_batch_upsert_support_cases_invalid_body(self):
+        """Test bulk upserts reject non-array bodies and oversized batches"""
+        response = self.client.post('/api/cases/batch', json={"summary": "x"})
+        self.assertEqual(response.status_code, 400)
+
+        max_items = app.config['CASE_BATCH_MAX_ITEMS']
+        app.config['CASE_BATCH_MAX_ITEMS'] = 1
+        self.addCleanup(app.config.__setitem__, 'CASE_BATCH_MAX_ITEMS', max_items)
+        item = {"summary": "Case", "description": "Bulk", "customer_id": 7}
+        response = self.client.post('/api/cases/batch', json=[item, item])
+        self.assertEqual(response.status_code, 413)
+
+    def test_create_support_case_validation_details(self):
+        """Test invalid support case data is rejected with structured details"""
+        response = self.client.post('/api/cases',
+                                data=json.dumps({"summary": "Missing fields"}),
+                                content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+        json_data = json.loads(response.data)
+        self.assertEqual(json_data['error'], 'Invalid support case data')
+        self.assertEqual(json_data['details'][0]['path'], '/')
+        self.assertEqual(json_data['details'][0]['validator'], 'required')
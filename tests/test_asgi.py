@@ -0,0 +1,93 @@
+"""Tests for the async ASGI serving mode."""
+import importlib.util
+import unittest
+import uuid
+from app import app, db
+from infrastructure.models import SupportCaseModel, MessageModel
+
+ASYNC_DEPENDENCIES = all(importlib.util.find_spec(name) for name in ('starlette', 'aiosqlite', 'greenlet', 'httpx'))
+
+@unittest.skipUnless(ASYNC_DEPENDENCIES, "async serving dependencies are not installed")
+class TestAsgiApp(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from starlette.testclient import TestClient
+        import asgi
+
+        # The sync app owns the schema; both modes share the database file
+        cls.app_context = app.app_context()
+        cls.app_context.push()
+        db.create_all()
+        cls.client_context = TestClient(asgi.app)
+        cls.client = cls.client_context.__enter__()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.client_context.__exit__(None, None, None)
+        db.session.remove()
+        db.drop_all()
+        cls.app_context.pop()
+
+    def tearDown(self):
+        db.session.query(MessageModel).delete()
+        db.session.query(SupportCaseModel).delete()
+        db.session.commit()
+
+    def create_case(self, customer_id=1):
+        response = self.client.post('/api/cases', json={
+            "summary": "Async case",
+            "description": "Created through the ASGI app",
+            "customer_id": customer_id
+        })
+        self.assertEqual(response.status_code, 201)
+        return response.json()['id']
+
+    def test_case_lifecycle(self):
+        case_id = self.create_case()
+
+        response = self.client.get(f'/api/cases/{case_id}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['summary'], "Async case")
+
+        response = self.client.put(f'/api/cases/{case_id}', json={
+            "summary": "Updated", "description": "Updated", "customer_id": 2
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['customer_id'], 2)
+
+        response = self.client.get('/api/cases?customer_id=2')
+        self.assertEqual([case['id'] for case in response.json()['cases']], [case_id])
+
+        self.assertEqual(self.client.delete(f'/api/cases/{case_id}').status_code, 204)
+        self.assertEqual(self.client.get(f'/api/cases/{case_id}').status_code, 404)
+
+    def test_messages(self):
+        case_id = self.create_case()
+        for i in range(5):
+            response = self.client.post(f'/api/cases/{case_id}/messages', json={"content": f"Message {i}"})
+            self.assertEqual(response.status_code, 201)
+
+        response = self.client.get(f'/api/cases/{case_id}/messages?limit=3')
+        data = response.json()
+        self.assertEqual(data['pagination']['total'], 5)
+        self.assertEqual([m['content'] for m in data['messages']], ["Message 4", "Message 3", "Message 2"])
+
+        response = self.client.get(f"/api/cases/{case_id}/messages?after={data['pagination']['next_cursor']}")
+        data = response.json()
+        self.assertEqual([m['content'] for m in data['messages']], ["Message 1", "Message 0"])
+        self.assertIsNone(data['pagination']['next_cursor'])
+
+        message_id = data['messages'][0]['id']
+        self.assertEqual(self.client.delete(f'/api/cases/{case_id}/messages/{message_id}').status_code, 204)
+        response = self.client.get(f'/api/cases/{case_id}/messages')
+        self.assertEqual(response.json()['pagination']['total'], 4)
+
+    def test_errors(self):
+        self.assertEqual(self.client.get('/api/cases/not-a-uuid').status_code, 400)
+        self.assertEqual(self.client.get(f'/api/cases/{uuid.uuid4()}/messages').status_code, 404)
+        response = self.client.post(f'/api/cases/{uuid.uuid4()}/messages', json={"content": "Hello"})
+        self.assertEqual(response.status_code, 404)
+        response = self.client.post('/api/cases', json={"summary": ""})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('details', response.json())
+        self.assertEqual(self.client.get('/nowhere').json(), {"error": "Resource not found"})
@@ -0,0 +1,133 @@
+import unittest
+from unittest.mock import MagicMock
+from domain.entities import SupportCase
+from infrastructure.cache import CachingSupportCaseRepository, InMemoryCacheBackend, LRUTTLCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class TestLRUTTLCache(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = LRUTTLCache(max_size=2, ttl=10, clock=self.clock)
+
+    def test_evicts_least_recently_used(self):
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+        self.cache.get('a')
+        self.cache.set('c', 3)
+
+        self.assertEqual(self.cache.get('a'), 1)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(len(self.cache), 2)
+
+    def test_expires_entries(self):
+        self.cache.set('a', 1)
+        self.clock.now += 10
+
+        self.assertIsNone(self.cache.get('a'))
+
+class TestCachingSupportCaseRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.inner = MagicMock()
+        # Headers come without their thread
+        self.case = SupportCase.create("Test Summary", "Test Description", 1)
+        self.case.messages = None
+        self.case.message_count = 3
+        self.case.last_message_at = self.case.created_at
+        self.inner.get_header.return_value = self.case
+        self.shared = InMemoryCacheBackend(clock=self.clock)
+        self.repo = CachingSupportCaseRepository(self.inner, max_size=10, ttl=30, shared=self.shared,
+                                                 clock=self.clock)
+
+    def test_get_header_reads_through(self):
+        first = self.repo.get_header(self.case.id)
+        second = self.repo.get_header(self.case.id)
+
+        self.inner.get_header.assert_called_once_with(self.case.id)
+        self.assertEqual(first, self.case)
+        self.assertEqual(second, self.case)
+        self.assertIsNot(first, second)
+        stats = self.repo.stats()
+        self.assertEqual(stats['local_hits'], 1)
+        self.assertEqual(stats['local_misses'], 1)
+        self.assertEqual(stats['shared_misses'], 1)
+
+    def test_exists_bypasses_cache(self):
+        self.repo.get_header(self.case.id)
+        self.inner.exists.return_value = False
+
+        # Deleted elsewhere while its header is still cached
+        self.assertFalse(self.repo.exists(self.case.id))
+        self.inner.exists.assert_called_once_with(self.case.id)
+
+    def test_missing_case_is_not_cached(self):
+        self.inner.get_header.return_value = None
+
+        self.assertIsNone(self.repo.get_header(self.case.id))
+        self.assertIsNone(self.repo.get_header(self.case.id))
+        self.assertEqual(self.inner.get_header.call_count, 2)
+
+    def test_shared_tier_serves_other_processes(self):
+        self.repo.get_header(self.case.id)
+        other = CachingSupportCaseRepository(MagicMock(), shared=self.shared, clock=self.clock)
+
+        self.assertEqual(other.get_header(self.case.id), self.case)
+        other.inner.get_header.assert_not_called()
+        self.assertEqual(other.stats()['shared_hits'], 1)
+
+    def test_entries_expire(self):
+        self.repo.get_header(self.case.id)
+        self.clock.now += 30
+        self.repo.get_header(self.case.id)
+
+        self.assertEqual(self.inner.get_header.call_count, 2)
+
+    def test_writes_invalidate(self):
+        for write in (lambda: self.repo.update(self.case.id, "Test Summary", "Test Description", 1),
+                      lambda: self.repo.upsert_many([self.case]),
+                      lambda: self.repo.delete(self.case.id)):
+            self.repo.get_header(self.case.id)
+            write()
+            self.assertIsNone(self.shared.get(f"support_case:header:{self.case.id}"))
+            self.repo.get_header(self.case.id)
+
+        self.assertEqual(self.inner.get_header.call_count, 4)
+        self.assertEqual(self.repo.stats()['invalidations'], 3)
+
+    def test_writes_invalidate_again_after_commit(self):
+        pending = []
+        repo = CachingSupportCaseRepository(self.inner, max_size=10, ttl=30, clock=self.clock,
+                                            after_commit=pending.append)
+        repo.update(self.case.id, "Test Summary", "Test Description", 1)
+        # A read before the commit caches the old header again
+        repo.get_header(self.case.id)
+
+        for callback in pending:
+            callback()
+
+        repo.get_header(self.case.id)
+        self.assertEqual(self.inner.get_header.call_count, 2)
+
+    def test_copy_older_than_min_version_is_refreshed(self):
+        self.repo.get_header(self.case.id)
+        self.case.version = 2
+
+        self.assertEqual(self.repo.get_header(self.case.id, min_version=1).version, 1)
+        self.assertEqual(self.repo.get_header(self.case.id, min_version=2).version, 2)
+        self.assertEqual(self.repo.get_header(self.case.id, min_version=2).version, 2)
+        self.assertEqual(self.inner.get_header.call_count, 2)
+        self.assertEqual(self.repo.stats()['stale_hits'], 1)
+
+    def test_full_aggregate_is_not_cached(self):
+        self.repo.get(self.case.id)
+        self.repo.get(self.case.id)
+
+        self.assertEqual(self.inner.get.call_count, 2)
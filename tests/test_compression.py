@@ -0,0 +1,97 @@
+"""Tests for negotiated response compression."""
+import gzip
+import json
+import unittest
+import zlib
+from flask import Flask, Response, jsonify
+from infrastructure import compression
+from infrastructure.compression import ResponseCompression, compress_stream, GzipCompressor
+
+class TestResponseCompression(unittest.TestCase):
+
+    def setUp(self):
+        app = Flask(__name__)
+        app.config.update(COMPRESSION_ENABLED=True, COMPRESSION_MIN_SIZE=1024, COMPRESSION_LEVEL=6)
+        ResponseCompression().init_app(app)
+        self.rows = [{"id": i, "content": f"Message {i}"} for i in range(200)]
+
+        @app.route('/small')
+        def small():
+            return jsonify(self.rows[:1])
+
+        @app.route('/large')
+        def large():
+            return jsonify(self.rows)
+
+        @app.route('/stream')
+        def stream():
+            return Response((json.dumps(row).encode() + b'\n' for row in self.rows),
+                            mimetype='application/x-ndjson')
+
+        @app.route('/events')
+        def events():
+            return Response(["data: 1\n\n" * 500], mimetype='text/event-stream')
+
+        self.app = app
+        self.client = app.test_client()
+
+    def test_large_body_is_compressed(self):
+        response = self.client.get('/large', headers={'Accept-Encoding': 'gzip'})
+
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        self.assertEqual(int(response.headers['Content-Length']), len(response.data))
+        self.assertEqual(json.loads(gzip.decompress(response.data)), self.rows)
+
+    def test_small_body_is_sent_as_is(self):
+        response = self.client.get('/small', headers={'Accept-Encoding': 'gzip'})
+
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(response.get_json(), self.rows[:1])
+
+    def test_not_accepted_or_disabled(self):
+        for headers in ({}, {'Accept-Encoding': 'gzip;q=0'}, {'Accept-Encoding': 'identity'}):
+            response = self.client.get('/large', headers=headers)
+            self.assertNotIn('Content-Encoding', response.headers)
+
+        self.app.config['COMPRESSION_ENABLED'] = False
+        response = self.client.get('/large', headers={'Accept-Encoding': 'gzip'})
+        self.assertNotIn('Content-Encoding', response.headers)
+
+    def test_streamed_body_is_compressed_incrementally(self):
+        response = self.client.get('/stream', headers={'Accept-Encoding': 'gzip'})
+
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertNotIn('Content-Length', response.headers)
+        lines = gzip.decompress(response.data).splitlines()
+        self.assertEqual([json.loads(line) for line in lines], self.rows)
+
+    def test_event_streams_are_left_alone(self):
+        response = self.client.get('/events', headers={'Accept-Encoding': 'gzip'})
+
+        self.assertNotIn('Content-Encoding', response.headers)
+
+    @unittest.skipUnless(compression.brotli, "brotli is not installed")
+    def test_brotli_preferred(self):
+        response = self.client.get('/large', headers={'Accept-Encoding': 'gzip, br'})
+
+        self.assertEqual(response.headers['Content-Encoding'], 'br')
+        self.assertEqual(json.loads(compression.brotli.decompress(response.data)), self.rows)
+
+    def test_compress_stream_closes_wrapped_body(self):
+        closed = []
+
+        def body():
+            try:
+                yield b'{"id": 1}\n'
+                yield b'{"id": 2}\n'
+            finally:
+                closed.append(True)
+
+        chunks = compress_stream(body(), GzipCompressor(6))
+        first = next(chunks)
+        chunks.close()
+
+        self.assertEqual(closed, [True])
+        # Each chunk is flushed, so what was sent so far decodes on its own
+        self.assertEqual(zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(first), b'{"id": 1}\n')
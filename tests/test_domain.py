@@ -35,8 +35,25 @@ class TestSupportCase(unittest.TestCase):
         self.assertEqual(len(support_case.messages), 1)
         self.assertEqual(support_case.messages[0], message)
 
+    def test_add_message_to_unloaded_thread(self):
+        """Test that a case loaded without its thread does not pretend to hold the new message."""
+        support_case = SupportCase.create("Test Summary", "Test Description", 1)
+        support_case.messages = None
+
+        message = support_case.add_message("Test Message Content")
+
+        self.assertEqual(message.case_id, support_case.id)
+        self.assertIsNone(support_case.messages)
+
+    def test_support_case_is_slotted(self):
+        """Test that support cases carry no per-instance __dict__."""
+        support_case = SupportCase.create("Test Summary", "Test Description", 1)
+
+        self.assertFalse(hasattr(support_case, '__dict__'))
+
 
 import unittest
+from dataclasses import FrozenInstanceError
 from uuid import UUID
 from domain.entities import Message
 
@@ -53,3 +70,11 @@ class TestMessage(unittest.TestCase):
         self.assertEqual(message.case_id, case_id)
         self.assertEqual(message.content, content)
         self.assertIsNotNone(message.created_at)
+
+    def test_message_is_slotted_and_frozen(self):
+        """Test that messages carry no per-instance __dict__ and cannot be changed."""
+        message = Message.create(UUID('12345678123456781234567812345678'), "Test Message Content")
+
+        self.assertFalse(hasattr(message, '__dict__'))
+        with self.assertRaises(FrozenInstanceError):
+            message.content = "Changed"
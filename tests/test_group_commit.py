@@ -0,0 +1,131 @@
+import threading
+import unittest
+from sqlalchemy.exc import IntegrityError
+from app import app, db
+from application.use_cases import SupportCaseService, MessageService
+from domain.entities import Message, SupportCase
+from infrastructure.group_commit import GroupCommitMessageRepository, GroupCommitWriter
+from infrastructure.infrastructure_implementations import (SQLAlchemySupportCaseRepository, SQLAlchemyMessageRepository,
+                                                           SQLAlchemyUnitOfWork)
+from infrastructure.models import SupportCaseModel, MessageModel
+
+class TestGroupCommitWriter(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app_context = app.app_context()
+        cls.app_context.push()
+        db.create_all()
+
+    @classmethod
+    def tearDownClass(cls):
+        db.session.remove()
+        db.drop_all()
+        cls.app_context.pop()
+
+    def setUp(self):
+        self.case_repository = SQLAlchemySupportCaseRepository()
+        self.case = SupportCaseService(self.case_repository, SQLAlchemyMessageRepository())\
+            .create_case("Group commit", "Group commit test case", 1)
+
+    def tearDown(self):
+        db.session.query(MessageModel).delete()
+        db.session.query(SupportCaseModel).delete()
+        db.session.commit()
+
+    def _write_concurrently(self, writer, messages):
+        errors = {}
+
+        def write(message):
+            try:
+                writer.write([message])
+            except Exception as e:
+                errors[message.id] = e
+
+        threads = [threading.Thread(target=write, args=(message,)) for message in messages]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return errors
+
+    def test_coalesces_concurrent_writes(self):
+        writer = GroupCommitWriter(db.engine, max_batch=100, max_delay=0.2)
+        self.addCleanup(writer.close)
+        messages = [Message.create(self.case.id, f"Message {i}") for i in range(10)]
+
+        errors = self._write_concurrently(writer, messages)
+
+        self.assertEqual(errors, {})
+        self.assertEqual(writer.writes, 10)
+        self.assertLess(writer.batches, 10)
+        db.session.expire_all()
+        self.assertEqual(db.session.query(MessageModel).count(), 10)
+        case = self.case_repository.get_header(self.case.id)
+        self.assertEqual(case.message_count, 10)
+        self.assertEqual(case.last_message_at, max(message.created_at for message in messages))
+
+    def test_batch_size_is_bounded(self):
+        writer = GroupCommitWriter(db.engine, max_batch=1, max_delay=0.2)
+        self.addCleanup(writer.close)
+
+        self._write_concurrently(writer, [Message.create(self.case.id, f"Message {i}") for i in range(5)])
+
+        self.assertEqual(writer.batches, 5)
+
+    def test_failed_write_only_fails_its_caller(self):
+        writer = GroupCommitWriter(db.engine, max_delay=0.2)
+        self.addCleanup(writer.close)
+        stored = Message.create(self.case.id, "Stored")
+        writer.write([stored])
+        duplicate = Message(stored.id, self.case.id, "Duplicate", stored.created_at)
+        others = [Message.create(self.case.id, f"Message {i}") for i in range(3)]
+
+        errors = self._write_concurrently(writer, [duplicate, *others])
+
+        self.assertEqual(list(errors), [stored.id])
+        self.assertIsInstance(errors[stored.id], IntegrityError)
+        db.session.expire_all()
+        self.assertEqual(db.session.query(MessageModel).count(), 4)
+        self.assertEqual(self.case_repository.get_header(self.case.id).message_count, 4)
+
+    def test_message_service_through_group_commit(self):
+        writer = GroupCommitWriter(db.engine)
+        self.addCleanup(writer.close)
+        repository = GroupCommitMessageRepository(SQLAlchemyMessageRepository(), writer)
+        service = MessageService(self.case_repository, repository)
+
+        message = service.add_message(self.case.id, "Hello")
+        # The request's own transaction ended before waiting, releasing its connection
+        self.assertFalse(db.session().in_transaction())
+
+        messages, total = service.get_case_messages(self.case.id)
+        self.assertEqual(total, 1)
+        self.assertEqual(messages[0].id, message.id)
+        self.assertEqual(writer.stats(), {"batches": 1, "writes": 1, "writes_per_batch": 1.0})
+
+    def test_group_commit_inside_unit_of_work(self):
+        writer = GroupCommitWriter(db.engine)
+        self.addCleanup(writer.close)
+        unit_of_work = SQLAlchemyUnitOfWork()
+        repository = GroupCommitMessageRepository(SQLAlchemyMessageRepository(), writer)
+        service = MessageService(self.case_repository, repository, unit_of_work=unit_of_work)
+        staged = SupportCase.create("Staged", "Staged earlier in the unit of work", 2)
+
+        # Changes staged before the message are not committed early; the message joins them
+        with self.assertRaises(RuntimeError):
+            with unit_of_work.transaction():
+                self.case_repository.add(staged)
+                service.add_message(self.case.id, "Hello")
+                raise RuntimeError("The use case failed")
+        db.session.expire_all()
+        self.assertFalse(self.case_repository.exists(staged.id))
+        self.assertEqual(db.session.query(MessageModel).count(), 0)
+        self.assertEqual(writer.writes, 0)
+
+        # With nothing staged yet, the message is group committed
+        service.add_message(self.case.id, "Hello")
+        self.assertEqual(writer.writes, 1)
+        self.assertEqual(db.session.query(MessageModel).count(), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,10 @@
 """Tests for the health check endpoint."""
+import threading
 import unittest
 from datetime import datetime
+from unittest.mock import patch
 from app import app, db
+from infrastructure.health import DatabaseProbe
 
 class TestHealthCheck(unittest.TestCase):
     @classmethod
@@ -44,3 +47,83 @@ class TestHealthCheck(unittest.TestCase):
         required_fields = ['status', 'database', 'timestamp']
         for field in required_fields:
             self.assertIn(field, data)
+
+    def test_liveness(self):
+        """Test liveness probe answers without touching the database."""
+        with patch('infrastructure.health.db') as mock_db:
+            response = self.client.get('/health/live')
+            mock_db.engine.connect.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['status'], 'alive')
+
+    def test_readiness(self):
+        """Test readiness probe reports latency and pool state."""
+        response = self.client.get('/health/ready')
+        self.assertEqual(response.status_code, 200)
+
+        data = response.get_json()
+        self.assertEqual(data['status'], 'ready')
+        self.assertGreaterEqual(data['database']['latency_ms'], 0)
+        self.assertIn('class', data['database']['pool'])
+        self.assertIn('cached', data['database'])
+
+    def test_readiness_failure(self):
+        """Test readiness probe returns 503 when the database is unreachable."""
+        probe = DatabaseProbe()
+        with patch('infrastructure.routes.database_probe', probe), \
+                patch('infrastructure.health.db.engine.connect', side_effect=Exception("boom")):
+            response = self.client.get('/health/ready')
+        self.assertEqual(response.status_code, 503)
+        data = response.get_json()
+        self.assertEqual(data['status'], 'not_ready')
+        self.assertEqual(data['database']['error'], 'boom')
+
+class TestDatabaseProbe(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app_context = app.app_context()
+        cls.app_context.push()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.app_context.pop()
+
+    def test_result_is_cached(self):
+        """Test the probe reuses its result within max_age."""
+        now = [100.0]
+        probe = DatabaseProbe(clock=lambda: now[0])
+
+        self.assertFalse(probe.check(5)['cached'])
+        now[0] += 4
+        self.assertTrue(probe.check(5)['cached'])
+        now[0] += 2
+        self.assertFalse(probe.check(5)['cached'])
+
+    def test_probe_runs_without_the_lock(self):
+        """Test a slow probe does not hold up callers served from the cache."""
+        probe = DatabaseProbe(clock=lambda: 100.0)
+        probe.check()
+        started, release = threading.Event(), threading.Event()
+
+        def slow_probe():
+            started.set()
+            release.wait(2)
+            return {"ready": True}
+
+        probe._probe = slow_probe
+
+        slow = threading.Thread(target=probe.check)
+        slow.start()
+        self.assertTrue(started.wait(5))
+        try:
+            self.assertTrue(probe.check(5)['cached'])
+            self.assertTrue(slow.is_alive())
+        finally:
+            release.set()
+            slow.join()
+
+    def test_no_caching_by_default(self):
+        """Test a zero max_age always probes."""
+        probe = DatabaseProbe(clock=lambda: 100.0)
+        probe.check()
+        self.assertFalse(probe.check()['cached'])
@@ -1,7 +1,8 @@
 import unittest
 from unittest.mock import MagicMock, patch
 from uuid import UUID
-from infrastructure.infrastructure_implementations import SQLAlchemySupportCaseRepository, SQLAlchemyMessageRepository
+from infrastructure.infrastructure_implementations import (SQLAlchemySupportCaseRepository, SQLAlchemyMessageRepository,
+                                                           SQLAlchemyUnitOfWork)
 from domain.entities import SupportCase, Message
 from infrastructure.models import SupportCaseModel, MessageModel
 
@@ -21,20 +22,40 @@ class TestSQLAlchemySupportCaseRepository(unittest.TestCase):
 
     def test_update(self):
         case_id = UUID('12345678123456781234567812345678')
-        case = SupportCase.create("Test Summary", "Test Description", 1)
-        case.id = case_id
-        with patch('infrastructure.infrastructure_implementations.SupportCaseModel.query.get') as mock_query:
-            mock_query.return_value = SupportCaseModel(id=case_id)
-            self.repo.update(case)
-            self.mock_db_session.commit.assert_called_once()
+        self.mock_db_session.execute.return_value.first.return_value = None
+
+        result = self.repo.update(case_id, "Test Summary", "Test Description", 1)
+
+        # A single UPDATE ... RETURNING, without reading the case first
+        self.assertIsNone(result)
+        self.mock_db_session.execute.assert_called_once()
+        self.mock_db_session.query.assert_not_called()
+        self.mock_db_session.commit.assert_called_once()
+
+    def test_upsert_many(self):
+        existing = SupportCase.create("Existing", "Test Description", 1)
+        new = SupportCase.create("New", "Test Description", 1)
+        self.mock_db_session.get_bind.return_value.dialect.name = 'sqlite'
+        self.mock_db_session.execute.return_value.all.return_value = [(new.id, 1), (existing.id, 4)]
+
+        result = self.repo.upsert_many([existing, new])
+
+        self.assertEqual(result, [False, True])
+        # A single INSERT ... ON CONFLICT DO UPDATE, without reading which ids exist first
+        self.mock_db_session.execute.assert_called_once()
+        self.mock_db_session.scalars.assert_not_called()
+        self.mock_db_session.commit.assert_called_once()
 
     def test_delete(self):
         case_id = UUID('12345678123456781234567812345678')
-        with patch('infrastructure.infrastructure_implementations.SupportCaseModel.query.get') as mock_query:
-            mock_query.return_value = SupportCaseModel(id=case_id)
-            self.repo.delete(case_id)
-            self.mock_db_session.delete.assert_called_once()
-            self.mock_db_session.commit.assert_called_once()
+        self.mock_db_session.scalar.return_value = case_id
+
+        self.assertTrue(self.repo.delete(case_id))
+
+        # A single DELETE ... RETURNING; the database cascades to the messages
+        self.mock_db_session.scalar.assert_called_once()
+        self.mock_db_session.delete.assert_not_called()
+        self.mock_db_session.commit.assert_called_once()
 
 class TestSQLAlchemyMessageRepository(unittest.TestCase):
 
@@ -50,10 +71,78 @@ class TestSQLAlchemyMessageRepository(unittest.TestCase):
         self.mock_db_session.add.assert_called_once()
         self.mock_db_session.commit.assert_called_once()
 
+    def test_add_many(self):
+        case_id = UUID('12345678123456781234567812345678')
+        messages = [Message.create(case_id, f"Content {i}") for i in range(2500)]
+        self.repo.add_many(messages)
+        # One counter update for the case, then three chunked inserts
+        self.assertEqual(self.mock_db_session.execute.call_count, 4)
+        self.mock_db_session.commit.assert_called_once()
+
     def test_delete(self):
         message_id = UUID('87654321876543218765432187654321')
-        with patch('infrastructure.infrastructure_implementations.MessageModel.query.get') as mock_query:
-            mock_query.return_value = MessageModel(id=message_id)
-            self.repo.delete(message_id)
-            self.mock_db_session.delete.assert_called_once()
-            self.mock_db_session.commit.assert_called_once()
+        self.mock_db_session.scalar.return_value = UUID('12345678123456781234567812345678')
+
+        self.repo.delete(message_id)
+
+        # DELETE ... RETURNING the case, then the counter update
+        self.mock_db_session.scalar.assert_called_once()
+        self.mock_db_session.execute.assert_called_once()
+        self.mock_db_session.commit.assert_called_once()
+
+    def test_delete_missing_message(self):
+        self.mock_db_session.scalar.return_value = None
+
+        self.repo.delete(UUID('87654321876543218765432187654321'))
+
+        self.mock_db_session.execute.assert_not_called()
+
+class TestSQLAlchemyUnitOfWork(unittest.TestCase):
+
+    def setUp(self):
+        self.unit_of_work = SQLAlchemyUnitOfWork()
+        self.repo = SQLAlchemySupportCaseRepository()
+        self.db_session_patch = patch('infrastructure.infrastructure_implementations.db.session')
+        self.mock_db_session = self.db_session_patch.start()
+        self.addCleanup(self.db_session_patch.stop)
+
+    def test_commits_once_for_all_writes(self):
+        with self.unit_of_work.transaction():
+            self.repo.add(SupportCase.create("First", "Test Description", 1))
+            self.repo.add(SupportCase.create("Second", "Test Description", 1))
+            self.mock_db_session.commit.assert_not_called()
+
+        self.assertEqual(self.mock_db_session.add.call_count, 2)
+        self.mock_db_session.commit.assert_called_once()
+
+    def test_nested_transactions_join_the_outer_one(self):
+        with self.unit_of_work.transaction():
+            with self.unit_of_work.transaction():
+                self.repo.add(SupportCase.create("Test Summary", "Test Description", 1))
+            self.mock_db_session.commit.assert_not_called()
+
+        self.mock_db_session.commit.assert_called_once()
+
+    def test_rolls_back_on_error(self):
+        callback = MagicMock()
+        with self.assertRaises(ValueError):
+            with self.unit_of_work.transaction():
+                self.repo.add(SupportCase.create("Test Summary", "Test Description", 1))
+                self.unit_of_work.after_commit(callback)
+                raise ValueError("boom")
+
+        self.mock_db_session.commit.assert_not_called()
+        self.mock_db_session.rollback.assert_called_once()
+        callback.assert_not_called()
+
+    def test_after_commit_runs_once_committed(self):
+        callback = MagicMock(side_effect=lambda: self.mock_db_session.commit.assert_called_once())
+        with self.unit_of_work.transaction():
+            self.unit_of_work.after_commit(callback)
+            callback.assert_not_called()
+
+        callback.assert_called_once()
+
+        # Outside a unit of work the callback runs right away
+        self.unit_of_work.after_commit(callback)
+        self.assertEqual(callback.call_count, 2)
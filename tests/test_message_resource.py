@@ -1,10 +1,16 @@
+import json
+import threading
+import time
 import unittest
 import uuid
 from app import app, db
 from infrastructure.models import SupportCaseModel, MessageModel
 from datetime import datetime, timedelta
+from domain.pagination import Position
+from infrastructure.cursors import encode_cursor
+from tests.query_counter import QueryCountAssertions
 
-class TestMessageResource(unittest.TestCase):
+class TestMessageResource(QueryCountAssertions, unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         app.config['TESTING'] = True
@@ -92,6 +98,14 @@ class TestMessageResource(unittest.TestCase):
         self.assertEqual(response.status_code, 404)
         self.assertEqual(response.get_json(), {"error": "Support case not found"})
 
+    def test_post_message_invalid_case(self):
+        """Test that posting to a non-existent case returns 404"""
+        random_uuid = str(uuid.uuid4())
+        response = self.client.post(f'/api/cases/{random_uuid}/messages',
+                                    json={"content": "Hello"})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.get_json(), {"error": "Support case not found"})
+
     def test_get_messages_invalid_parameters(self):
         """Test that invalid pagination parameters return 400"""
         # Test invalid limit
@@ -113,3 +127,343 @@ class TestMessageResource(unittest.TestCase):
             response.get_json(),
             {"error": "Invalid pagination parameters"}
         )
+
+    def test_get_messages_cursor_pagination(self):
+        """Test that cursor pages cover every message exactly once, newest first"""
+        response = self.client.get(f'/api/cases/{self.case_id}/messages?after=&limit=4')
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertNotIn('total', data['pagination'])
+
+        seen = [m['id'] for m in data['messages']]
+        while data['pagination']['next_cursor']:
+            response = self.client.get(
+                f"/api/cases/{self.case_id}/messages?after={data['pagination']['next_cursor']}&limit=4"
+            )
+            self.assertEqual(response.status_code, 200)
+            data = response.get_json()
+            seen.extend(m['id'] for m in data['messages'])
+
+        self.assertEqual(len(seen), 15)
+        self.assertEqual(len(set(seen)), 15)
+
+        # The cursor mode must return the same order as the offset mode
+        response = self.client.get(f'/api/cases/{self.case_id}/messages?limit=15')
+        self.assertEqual([m['id'] for m in response.get_json()['messages']], seen)
+
+    def test_get_messages_cursor_from_offset_page(self):
+        """Test that an offset page hands out a cursor to the following page"""
+        response = self.client.get(f'/api/cases/{self.case_id}/messages?limit=10')
+        data = response.get_json()
+        cursor = data['pagination']['next_cursor']
+
+        response = self.client.get(
+            f'/api/cases/{self.case_id}/messages?after={cursor}&limit=10&include_total=true'
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(len(data['messages']), 5)
+        self.assertEqual(data['pagination']['total'], 15)
+        self.assertIsNone(data['pagination']['next_cursor'])
+
+    def test_get_messages_invalid_cursor(self):
+        """Test that a malformed cursor returns 400"""
+        response = self.client.get(f'/api/cases/{self.case_id}/messages?after=not-a-cursor')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.get_json(),
+            {"error": "Invalid pagination parameters"}
+        )
+
+    def test_get_messages_since_cursor(self):
+        """Test that since mode returns only newer messages, oldest first"""
+        response = self.client.get(f'/api/cases/{self.case_id}/messages?limit=15')
+        newest_first = [m['id'] for m in response.get_json()['messages']]
+
+        # The cursor of the fourth newest message leaves three to catch up on
+        cursor = self.client.get(
+            f'/api/cases/{self.case_id}/messages?limit=4'
+        ).get_json()['pagination']['next_cursor']
+
+        response = self.client.get(f'/api/cases/{self.case_id}/messages?since={cursor}&limit=2')
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual([m['id'] for m in data['messages']], newest_first[2:0:-1])
+        self.assertTrue(data['pagination']['has_more'])
+
+        response = self.client.get(
+            f"/api/cases/{self.case_id}/messages?since={data['pagination']['next_cursor']}&limit=2"
+        )
+        data = response.get_json()
+        self.assertEqual([m['id'] for m in data['messages']], [newest_first[0]])
+        self.assertFalse(data['pagination']['has_more'])
+
+        # Nothing new: the cursor is handed back unchanged
+        cursor = data['pagination']['next_cursor']
+        response = self.client.get(f'/api/cases/{self.case_id}/messages?since={cursor}')
+        data = response.get_json()
+        self.assertEqual(data['messages'], [])
+        self.assertEqual(data['pagination']['next_cursor'], cursor)
+
+    def test_get_messages_since_timestamp(self):
+        """Test that since accepts an ISO 8601 timestamp"""
+        since = (datetime.utcnow() - timedelta(minutes=2, seconds=30)).isoformat()
+        response = self.client.get(f'/api/cases/{self.case_id}/messages', query_string={'since': since})
+        self.assertEqual(response.status_code, 200)
+        contents = [m['content'] for m in response.get_json()['messages']]
+        self.assertEqual(contents, ["Test message 2", "Test message 1", "Test message 0"])
+
+    def test_get_messages_since_long_poll(self):
+        """Test that a long poll returns as soon as a new message is posted"""
+        since = datetime.utcnow().isoformat()
+        client = app.test_client()
+        timer = threading.Timer(0.1, client.post, args=(f'/api/cases/{self.case_id}/messages',),
+                                kwargs={'json': {"content": "Late"}})
+        timer.start()
+        self.addCleanup(timer.join)
+
+        start = time.monotonic()
+        response = self.client.get(f'/api/cases/{self.case_id}/messages',
+                                   query_string={'since': since, 'wait': 5})
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([m['content'] for m in response.get_json()['messages']], ["Late"])
+
+        from infrastructure.routes import message_hub
+        self.assertEqual(message_hub.subscriber_count(self.test_case.id), 0)
+
+    def test_get_messages_since_long_poll_timeout(self):
+        """Test that an idle long poll returns an empty page once the wait runs out"""
+        since = datetime.utcnow().isoformat()
+        start = time.monotonic()
+        response = self.client.get(f'/api/cases/{self.case_id}/messages',
+                                   query_string={'since': since, 'wait': 0.1})
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['messages'], [])
+
+    def test_get_messages_since_long_poll_releases_connection(self):
+        """Test that a waiting long poll does not hold a pooled connection"""
+        since = datetime.utcnow().isoformat()
+        responses = []
+
+        def poll():
+            with app.app_context():
+                responses.append(app.test_client().get(f'/api/cases/{self.case_id}/messages',
+                                                       query_string={'since': since, 'wait': 0.5}))
+
+        db.session.remove()
+        pollers = [threading.Thread(target=poll) for _ in range(3)]
+        for poller in pollers:
+            poller.start()
+        time.sleep(0.25)
+        self.assertEqual(db.engine.pool.checkedout(), 0)
+        for poller in pollers:
+            poller.join()
+        self.assertEqual([response.status_code for response in responses], [200] * 3)
+
+    def test_get_messages_since_invalid(self):
+        """Test that since mode rejects bad parameters and unknown cases"""
+        for query in ('since=yesterday', f'since={datetime.utcnow().isoformat()}&wait=-1',
+                      f'since={datetime.utcnow().isoformat()}&wait=nan'):
+            response = self.client.get(f'/api/cases/{self.case_id}/messages?{query}')
+            self.assertEqual(response.status_code, 400, query)
+
+        response = self.client.get(f'/api/cases/{uuid.uuid4()}/messages',
+                                   query_string={'since': datetime.utcnow().isoformat()})
+        self.assertEqual(response.status_code, 404)
+
+    def test_get_messages_conditional(self):
+        """Test revalidating a message page answers 304 until the thread changes"""
+        url = f'/api/cases/{self.case_id}/messages'
+        for query in ('limit=5', 'after=&limit=5', f'since={datetime(2000, 1, 1).isoformat()}&limit=5'):
+            response = self.client.get(f'{url}?{query}')
+            etag = response.headers['ETag']
+
+            # One statement reads the revision; the page is never loaded
+            with self.assertMaxStatements(1):
+                response = self.client.get(f'{url}?{query}', headers={'If-None-Match': etag})
+            self.assertEqual(response.status_code, 304)
+
+        self.client.post(url, json={"content": "New"})
+        response = self.client.get(f'{url}?limit=5', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+        self.assertEqual(response.get_json()['messages'][0]['content'], "New")
+
+        # A long poll waits for new messages instead of being revalidated
+        response = self.client.get(url, query_string={'since': datetime.utcnow().isoformat(), 'wait': 0.05},
+                                   headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response.headers)
+
+    def test_export_messages_ndjson(self):
+        """Test the whole thread streams as NDJSON, newest first, from a server-side cursor"""
+        url = f'/api/cases/{self.case_id}/messages'
+        with self.assertMaxStatements(2):
+            response = self.client.get(url, headers={'Accept': 'application/x-ndjson'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        messages = [json.loads(line) for line in response.data.splitlines()]
+        self.assertEqual([m['content'] for m in messages], [f"Test message {i}" for i in range(15)])
+
+        cursor = self.client.get(f'{url}?limit=10').get_json()['pagination']['next_cursor']
+        response = self.client.get(f'{url}?after={cursor}', headers={'Accept': 'application/x-ndjson'})
+        self.assertEqual(len(response.data.splitlines()), 5)
+
+        response = self.client.get(f'/api/cases/{uuid.uuid4()}/messages', headers={'Accept': 'application/x-ndjson'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_message_statement_budgets(self):
+        """Test the number of SQL statements each message endpoint may issue"""
+        url = f'/api/cases/{self.case_id}/messages'
+        with self.assertMaxStatements(3):
+            self.client.post(url, json={"content": "New"})
+        with self.assertMaxStatements(3):
+            self.client.post(f'{url}/batch', json=[{"content": "Imported"}] * 100)
+        with self.assertMaxStatements(3):
+            self.client.get(f'{url}?limit=100')
+        with self.assertMaxStatements(2):
+            self.client.get(f'{url}?after=&limit=100&include_total=false')
+        with self.assertMaxStatements(2):
+            self.client.get(f'{url}?since={datetime(2000, 1, 1).isoformat()}&limit=100')
+
+        message_id = self.client.get(f'{url}?limit=1').get_json()['messages'][0]['id']
+        with self.assertMaxStatements(3):
+            self.client.delete(f'{url}/{message_id}')
+
+    def test_post_message_statements_independent_of_thread_size(self):
+        """Test that posting a message never loads the thread it is added to"""
+        url = f'/api/cases/{self.case_id}/messages'
+        with self.assertMaxStatements(3) as small:
+            self.client.post(url, json={"content": "Before"})
+
+        self.client.post(f'{url}/batch', json=[{"content": "Filler"}] * 500)
+        with self.assertMaxStatements(3) as large:
+            self.client.post(url, json={"content": "After"})
+
+        self.assertEqual(large.statements, small.statements)
+
+    def test_post_message_batch(self):
+        """Test bulk ingestion keeps input order and reports every item"""
+        items = [{"content": "first"}, {"content": ""}, {"content": "second"}, {"text": "bad"}]
+        response = self.client.post(f'/api/cases/{self.case_id}/messages/batch', json=items)
+        self.assertEqual(response.status_code, 207)
+
+        data = response.get_json()
+        self.assertEqual(data['created'], 2)
+        self.assertEqual(data['failed'], 2)
+        self.assertEqual([r['status'] for r in data['results']], [201, 400, 201, 400])
+        self.assertEqual([r['index'] for r in data['results']], [0, 1, 2, 3])
+
+        response = self.client.get(f'/api/cases/{self.case_id}/messages?limit=2')
+        contents = [m['content'] for m in response.get_json()['messages']]
+        self.assertEqual(contents, ["second", "first"])
+
+    def test_post_message_batch_ndjson(self):
+        """Test bulk ingestion from a newline-delimited JSON body"""
+        body = '{"content": "one"}\n{"content": "two"}\nnot json\n\n'
+        response = self.client.post(f'/api/cases/{self.case_id}/messages/batch',
+                                    data=body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 207)
+        data = response.get_json()
+        self.assertEqual([r['status'] for r in data['results']], [201, 201, 400])
+
+        response = self.client.get(f'/api/cases/{self.case_id}/messages')
+        self.assertEqual(response.get_json()['pagination']['total'], 17)
+
+    def test_post_message_batch_all_valid(self):
+        """Test a fully valid batch returns 201"""
+        items = [{"content": f"Imported {i}"} for i in range(50)]
+        response = self.client.post(f'/api/cases/{self.case_id}/messages/batch', json=items)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.get_json()['created'], 50)
+
+    def test_post_message_batch_errors(self):
+        """Test bulk ingestion rejects bad bodies, unknown cases and oversized batches"""
+        response = self.client.post(f'/api/cases/{self.case_id}/messages/batch', json={"content": "x"})
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.post(f'/api/cases/{uuid.uuid4()}/messages/batch', json=[{"content": "x"}])
+        self.assertEqual(response.status_code, 404)
+
+        max_items = app.config['MESSAGE_BATCH_MAX_ITEMS']
+        app.config['MESSAGE_BATCH_MAX_ITEMS'] = 2
+        self.addCleanup(app.config.__setitem__, 'MESSAGE_BATCH_MAX_ITEMS', max_items)
+        response = self.client.post(f'/api/cases/{self.case_id}/messages/batch',
+                                    json=[{"content": "x"}] * 3)
+        self.assertEqual(response.status_code, 413)
+
+    def test_stream_messages(self):
+        """Test that new messages are pushed to stream subscribers"""
+        heartbeat = app.config['MESSAGE_STREAM_HEARTBEAT_SECONDS']
+        app.config['MESSAGE_STREAM_HEARTBEAT_SECONDS'] = 0.05
+        self.addCleanup(app.config.__setitem__, 'MESSAGE_STREAM_HEARTBEAT_SECONDS', heartbeat)
+
+        response = self.client.get(f'/api/cases/{self.case_id}/messages/stream', buffered=False)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'text/event-stream')
+
+        posted = self.client.post(f'/api/cases/{self.case_id}/messages', json={"content": "Live"}).get_json()
+
+        events = (chunk.decode() for chunk in response.response)
+        self.assertEqual(next(events), "retry: 50\n\n")
+        frame = next(events)
+        self.assertIn("event: message\n", frame)
+        data = json.loads(frame.split("data: ", 1)[1])
+        self.assertEqual(data['id'], posted['id'])
+        self.assertEqual(next(events), ": keep-alive\n\n")
+        response.close()
+
+        from infrastructure.routes import message_hub
+        self.assertEqual(message_hub.subscriber_count(self.test_case.id), 0)
+
+    def test_stream_messages_replays_from_last_event_id(self):
+        """Test that a reconnecting subscriber first gets the messages it missed"""
+        heartbeat = app.config['MESSAGE_STREAM_HEARTBEAT_SECONDS']
+        app.config['MESSAGE_STREAM_HEARTBEAT_SECONDS'] = 0.05
+        self.addCleanup(app.config.__setitem__, 'MESSAGE_STREAM_HEARTBEAT_SECONDS', heartbeat)
+        url = f'/api/cases/{self.case_id}/messages/stream'
+
+        response = self.client.get(url, buffered=False)
+        posted = [self.client.post(f'/api/cases/{self.case_id}/messages', json={"content": f"M{i}"}).get_json()
+                  for i in range(3)]
+        events = (chunk.decode() for chunk in response.response)
+        next(events)
+        last_event_id = next(events).split("id: ", 1)[1].split("\n", 1)[0]
+        response.close()
+
+        response = self.client.get(url, buffered=False, headers={'Last-Event-ID': last_event_id})
+        live = self.client.post(f'/api/cases/{self.case_id}/messages', json={"content": "Live"}).get_json()
+        events = (chunk.decode() for chunk in response.response)
+        self.assertEqual(next(events), "retry: 50\n\n")
+        received = [json.loads(next(events).split("data: ", 1)[1])['id'] for _ in range(3)]
+        self.assertEqual(received, [posted[1]['id'], posted[2]['id'], live['id']])
+        self.assertEqual(next(events), ": keep-alive\n\n")
+        response.close()
+
+    def test_stream_messages_long_replay_ends_stream(self):
+        """Test that a replay longer than the queue ends the stream for the client to resume"""
+        max_queue = app.config['MESSAGE_STREAM_QUEUE_SIZE']
+        app.config['MESSAGE_STREAM_QUEUE_SIZE'] = 2
+        self.addCleanup(app.config.__setitem__, 'MESSAGE_STREAM_QUEUE_SIZE', max_queue)
+        since = encode_cursor(Position(datetime.utcnow(), uuid.UUID(int=0)))
+        self.client.post(f'/api/cases/{self.case_id}/messages/batch',
+                         json=[{"content": content} for content in ("A", "B", "C")])
+
+        response = self.client.get(f'/api/cases/{self.case_id}/messages/stream',
+                                   headers={'Last-Event-ID': since})
+        frames = response.get_data(as_text=True).split("\n\n")
+        self.assertEqual([json.loads(frame.split("data: ", 1)[1])['content'] for frame in frames[1:-1]],
+                         ["A", "B"])
+
+    def test_stream_messages_invalid_last_event_id(self):
+        """Test that an undecodable Last-Event-ID returns 400"""
+        response = self.client.get(f'/api/cases/{self.case_id}/messages/stream',
+                                   headers={'Last-Event-ID': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_stream_messages_invalid_case(self):
+        """Test that streaming a non-existent case returns 404"""
+        response = self.client.get(f'/api/cases/{uuid.uuid4()}/messages/stream')
+        self.assertEqual(response.status_code, 404)
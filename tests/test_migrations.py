@@ -0,0 +1,125 @@
+"""Tests for the Alembic migrations."""
+import os
+import tempfile
+import unittest
+from flask import Flask
+from flask_migrate import Migrate, upgrade, downgrade
+from sqlalchemy import inspect, text
+from app import db
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+class TestMigrations(unittest.TestCase):
+    def setUp(self):
+        fd, self.db_path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        self.addCleanup(os.remove, self.db_path)
+
+        # A separate app keeps the migrated schema out of the shared test database
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{self.db_path}'
+        db.init_app(self.app)
+        Migrate(self.app, db, directory=MIGRATIONS_DIR)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        self.addCleanup(self.app_context.pop)
+        self.addCleanup(db.engine.dispose)
+
+    def test_upgrade_creates_access_path_indexes(self):
+        """Test the migrated schema has the message and case indexes."""
+        upgrade(directory=MIGRATIONS_DIR)
+        inspector = inspect(db.engine)
+
+        message_indexes = {i['name']: i['column_names'] for i in inspector.get_indexes('messages')}
+        self.assertEqual(message_indexes['ix_messages_case_id_created_at_id'], ['case_id', 'created_at', 'id'])
+
+        case_indexes = {i['name']: i['column_names'] for i in inspector.get_indexes('support_cases')}
+        self.assertEqual(case_indexes['ix_support_cases_customer_id_created_at'], ['customer_id', 'created_at'])
+
+    def test_upgrade_indexes_existing_rows_for_search(self):
+        """Test the search migration indexes rows stored before it ran."""
+        upgrade(directory=MIGRATIONS_DIR, revision='0002')
+        with db.engine.begin() as connection:
+            connection.execute(text(
+                "INSERT INTO support_cases (id, summary, description, customer_id) "
+                "VALUES ('0123456789abcdef0123456789abcdef', 'Printer jammed', 'Paper stuck', 1)"
+            ))
+        upgrade(directory=MIGRATIONS_DIR)
+
+        with db.engine.connect() as connection:
+            count = connection.execute(text(
+                "SELECT count(*) FROM support_cases_fts WHERE support_cases_fts MATCH 'printer'"
+            )).scalar()
+        self.assertEqual(count, 1)
+
+    def test_upgrade_backfills_message_counters(self):
+        """Test the counter migration fills in existing threads."""
+        upgrade(directory=MIGRATIONS_DIR, revision='0003')
+        with db.engine.begin() as connection:
+            connection.execute(text(
+                "INSERT INTO support_cases (id, summary, description, customer_id) "
+                "VALUES ('0123456789abcdef0123456789abcdef', 'Printer jammed', 'Paper stuck', 1)"
+            ))
+            for i in range(2):
+                connection.execute(text(
+                    "INSERT INTO messages (id, case_id, content, created_at) "
+                    f"VALUES ('{i:032x}', '0123456789abcdef0123456789abcdef', 'Hello', '2026-01-0{i + 1} 00:00:00')"
+                ))
+        upgrade(directory=MIGRATIONS_DIR)
+
+        with db.engine.connect() as connection:
+            row = connection.execute(text("SELECT message_count, last_message_at FROM support_cases")).one()
+        self.assertEqual(row[0], 2)
+        self.assertTrue(row[1].startswith('2026-01-02'))
+
+    def test_upgrade_cascades_message_deletes(self):
+        """Test the cascade migration keeps messages searchable and deletes them with their case."""
+        upgrade(directory=MIGRATIONS_DIR, revision='0004')
+        with db.engine.begin() as connection:
+            connection.execute(text(
+                "INSERT INTO support_cases (id, summary, description, customer_id) "
+                "VALUES ('0123456789abcdef0123456789abcdef', 'Printer jammed', 'Paper stuck', 1)"
+            ))
+            for i, content in enumerate(('Paper tray empty', 'Toner empty', 'Toner replaced'), 1):
+                connection.execute(text(
+                    "INSERT INTO messages (id, case_id, content) "
+                    f"VALUES ('{i:032x}', '0123456789abcdef0123456789abcdef', '{content}')"
+                ))
+            # Leave a gap in the rowids for the copy to keep
+            connection.execute(text("DELETE FROM messages WHERE content = 'Paper tray empty'"))
+        upgrade(directory=MIGRATIONS_DIR)
+
+        with db.engine.begin() as connection:
+            # Search resolves index entries to the messages they were made from
+            found = connection.execute(text(
+                "SELECT m.content FROM messages_fts JOIN messages m ON m.rowid = messages_fts.rowid "
+                "WHERE messages_fts MATCH 'toner' ORDER BY m.content"
+            )).scalars().all()
+            self.assertEqual(found, ['Toner empty', 'Toner replaced'])
+            search = text("SELECT count(*) FROM messages_fts WHERE messages_fts MATCH 'toner'")
+            connection.execute(text("PRAGMA foreign_keys=ON"))
+            connection.execute(text("DELETE FROM support_cases"))
+            self.assertEqual(connection.execute(text("SELECT count(*) FROM messages")).scalar(), 0)
+            self.assertEqual(connection.execute(search).scalar(), 0)
+
+    def test_upgrade_backfills_case_revisions(self):
+        """Test the revision migration dates existing cases by their latest activity."""
+        upgrade(directory=MIGRATIONS_DIR, revision='0005')
+        with db.engine.begin() as connection:
+            connection.execute(text(
+                "INSERT INTO support_cases (id, summary, description, customer_id, created_at, last_message_at) "
+                "VALUES ('0123456789abcdef0123456789abcdef', 'Printer jammed', 'Paper stuck', 1, "
+                "'2026-01-01 00:00:00', '2026-01-02 00:00:00')"
+            ))
+        upgrade(directory=MIGRATIONS_DIR)
+
+        with db.engine.connect() as connection:
+            row = connection.execute(text("SELECT version, updated_at FROM support_cases")).one()
+        self.assertEqual(row[0], 1)
+        self.assertTrue(row[1].startswith('2026-01-02'))
+
+    def test_downgrade_to_base(self):
+        """Test every migration can be reverted."""
+        upgrade(directory=MIGRATIONS_DIR)
+        downgrade(directory=MIGRATIONS_DIR, revision='base')
+        self.assertNotIn('messages', inspect(db.engine).get_table_names())
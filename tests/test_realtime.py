@@ -0,0 +1,46 @@
+import unittest
+from unittest.mock import MagicMock
+from uuid import UUID
+from domain.entities import Message
+from infrastructure.realtime import LocalMessageBroker, MessageHub
+
+CASE_ID = UUID('12345678123456781234567812345678')
+
+class TestMessageHub(unittest.TestCase):
+
+    def setUp(self):
+        self.hub = MessageHub(LocalMessageBroker(), max_queue=2)
+
+    def test_fans_out_to_every_subscriber_of_the_case(self):
+        first = self.hub.subscribe(CASE_ID)
+        second = self.hub.subscribe(CASE_ID)
+        other = self.hub.subscribe(UUID('87654321876543218765432187654321'))
+        message = Message.create(CASE_ID, "Hello")
+
+        self.hub.publish([message])
+
+        self.assertEqual(first.get(timeout=0), message)
+        self.assertEqual(second.get(timeout=0), message)
+        self.assertIsNone(other.get(timeout=0))
+
+    def test_unsubscribe(self):
+        with self.hub.subscribe(CASE_ID):
+            self.assertEqual(self.hub.subscriber_count(CASE_ID), 1)
+        self.assertEqual(self.hub.subscriber_count(CASE_ID), 0)
+
+    def test_slow_subscriber_overflows(self):
+        subscription = self.hub.subscribe(CASE_ID)
+
+        self.hub.publish([Message.create(CASE_ID, f"Message {i}") for i in range(3)])
+
+        self.assertTrue(subscription.overflowed)
+
+    def test_publishes_through_broker(self):
+        broker = MagicMock()
+        hub = MessageHub(broker)
+        message = Message.create(CASE_ID, "Hello")
+
+        hub.publish([message])
+
+        broker.listen.assert_called_once_with(hub.dispatch)
+        broker.publish.assert_called_once_with([message])
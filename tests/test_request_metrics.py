@@ -0,0 +1,88 @@
+"""Tests for per-request statement counting and timing."""
+import re
+import unittest
+import uuid
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app import app, db
+from infrastructure.request_metrics import Histogram, request_metrics
+
+class TestHistogram(unittest.TestCase):
+
+    def test_cumulative_buckets(self):
+        histogram = Histogram((1, 5))
+        for value in (0.5, 1, 3, 10):
+            histogram.observe(value)
+
+        snapshot = histogram.snapshot()
+
+        self.assertEqual(snapshot['buckets'], {'1': 2, '5': 3, '+Inf': 4})
+        self.assertEqual(snapshot['count'], 4)
+        self.assertEqual(snapshot['sum'], 14.5)
+        self.assertEqual(snapshot['max'], 10)
+
+class TestRequestMetrics(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        app.config['TESTING'] = True
+        cls.client = app.test_client()
+        cls.app_context = app.app_context()
+        cls.app_context.push()
+        db.create_all()
+
+    @classmethod
+    def tearDownClass(cls):
+        db.session.remove()
+        db.drop_all()
+        cls.app_context.pop()
+
+    def setUp(self):
+        request_metrics.reset()
+
+    def test_record_counts_statements(self):
+        with request_metrics.record() as outer:
+            db.session.execute(text("SELECT 1"))
+            with request_metrics.record() as inner:
+                db.session.execute(text("SELECT 2"))
+
+        self.assertEqual(inner.statements, 1)
+        self.assertEqual(outer.statements, 2)
+        self.assertEqual(outer.executed, ["SELECT 1", "SELECT 2"])
+        self.assertGreater(outer.db_seconds, 0)
+
+    def test_failed_statement_leaves_no_timing_behind(self):
+        with request_metrics.record() as stats:
+            with self.assertRaises(OperationalError):
+                db.session.execute(text("SELECT * FROM no_such_table"))
+            db.session.rollback()
+            db.session.execute(text("SELECT 1"))
+            connection_info = db.session.connection().info
+
+        self.assertEqual(stats.executed, ["SELECT 1"])
+        self.assertNotIn('query_start', connection_info)
+
+    def test_server_timing_header(self):
+        with request_metrics.record() as stats:
+            response = self.client.get(f'/api/cases/{uuid.uuid4()}')
+        self.assertEqual(response.status_code, 404)
+
+        db_timing, handler_timing = response.headers.getlist('Server-Timing')
+        match = re.fullmatch(r'db;dur=[\d.]+;desc="(\d+) statements"', db_timing)
+        self.assertIsNotNone(match)
+        # The request's statements also reach the recorder wrapped around it
+        self.assertEqual(int(match.group(1)), stats.statements)
+        self.assertRegex(handler_timing, r'^handler;dur=[\d.]+$')
+
+    def test_metrics_endpoint_aggregates_per_route(self):
+        for _ in range(3):
+            self.client.get(f'/api/cases/{uuid.uuid4()}')
+        self.client.get('/api/cases/not-a-uuid')
+
+        routes = self.client.get('/metrics').get_json()['requests']
+
+        route = routes['GET /api/cases/<string:case_id>']
+        self.assertEqual(route['duration_ms']['count'], 4)
+        self.assertEqual(route['statuses'], {'400': 1, '404': 3})
+        self.assertEqual(route['statements']['buckets']['+Inf'], 4)
+        # The invalid id is rejected before any SQL runs
+        self.assertEqual(route['statements']['buckets']['0'], 1)
@@ -0,0 +1,113 @@
+import unittest
+from sqlalchemy import text
+from app import app, db
+from domain.entities import SupportCase, Message
+from domain.search import CASE, MESSAGE
+from infrastructure.models import SupportCaseModel, MessageModel
+from infrastructure.infrastructure_implementations import SQLAlchemySupportCaseRepository, SQLAlchemyMessageRepository
+from infrastructure.search import SQLiteSearchIndex
+
+class TestSQLiteSearchIndex(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        app.config['TESTING'] = True
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        cls.client = app.test_client()
+        cls.app_context = app.app_context()
+        cls.app_context.push()
+        db.create_all()
+
+        cls.case_repository = SQLAlchemySupportCaseRepository()
+        cls.message_repository = SQLAlchemyMessageRepository()
+        cls.index = SQLiteSearchIndex()
+
+    @classmethod
+    def tearDownClass(cls):
+        db.session.remove()
+        db.drop_all()
+        cls.app_context.pop()
+
+    def setUp(self):
+        self.case = SupportCase.create("Printer jammed", "The office printer eats every page", 1)
+        self.other = SupportCase.create("Login fails", "Password reset email never arrives", 2)
+        self.case_repository.add(self.case)
+        self.case_repository.add(self.other)
+        self.message = Message.create(self.other.id, "Tried resetting the password twice")
+        self.message_repository.add_many([self.message, Message.create(self.case.id, "The printer is still broken")])
+
+    def tearDown(self):
+        db.session.query(MessageModel).delete()
+        db.session.query(SupportCaseModel).delete()
+        db.session.commit()
+
+    def test_search_ranks_and_stems(self):
+        hits = self.index.search("password reset")
+
+        self.assertEqual([(hit.kind, hit.id) for hit in hits],
+                         [(CASE, self.other.id), (MESSAGE, self.message.id)])
+        self.assertEqual(hits[1].case_id, self.other.id)
+        self.assertGreater(hits[0].rank, 0)
+        self.assertIn("<mark>Password</mark>", hits[0].snippet)
+
+    def test_search_filters_and_paginates(self):
+        self.assertEqual([hit.kind for hit in self.index.search("printer", kind=MESSAGE)], [MESSAGE])
+
+        first = self.index.search("printer", limit=1)
+        second = self.index.search("printer", limit=1, offset=1)
+        self.assertEqual(len(first), 1)
+        self.assertEqual(len(second), 1)
+        self.assertNotEqual(first[0].id, second[0].id)
+
+    def test_index_follows_updates_and_deletes(self):
+        self.case_repository.update(self.case.id, "Scanner jammed", self.case.description, self.case.customer_id)
+        self.assertEqual([hit.id for hit in self.index.search("scanner")], [self.case.id])
+
+        self.message_repository.delete(self.message.id)
+        self.assertEqual([hit.kind for hit in self.index.search("twice")], [])
+
+        self.case_repository.delete(self.other.id)
+        self.assertEqual(self.index.search("password"), [])
+
+    def test_search_treats_operators_as_text(self):
+        self.assertEqual(SQLiteSearchIndex.match_expression('printer" OR (NEAR'), '"printer" "OR" "NEAR"')
+        self.assertEqual(self.index.search('"*:()'), [])
+
+    def test_snippets_escape_stored_text(self):
+        message = Message.create(self.case.id, 'The <img src=x onerror="alert(1)"> printer & "scanner"')
+        self.message_repository.add_many([message])
+
+        snippet = self.index.search("onerror", kind=MESSAGE)[0].snippet
+        self.assertEqual(snippet, 'The &lt;img src=x <mark>onerror</mark>=&quot;alert(1)&quot;&gt; printer '
+                                  '&amp; &quot;scanner&quot;')
+
+    def test_rebuild(self):
+        SQLiteSearchIndex.rebuild()
+        self.assertEqual(len(self.index.search("printer")), 2)
+
+    def test_rebuild_command(self):
+        db.session.execute(text("INSERT INTO messages_fts(messages_fts) VALUES ('delete-all')"))
+        db.session.commit()
+        self.assertEqual(self.index.search("twice"), [])
+
+        result = app.test_cli_runner().invoke(args=['rebuild-search-index'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual([hit.id for hit in self.index.search("twice")], [self.message.id])
+
+    def test_search_api(self):
+        response = self.client.get('/api/search?q=printer&limit=1')
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(len(data['results']), 1)
+        self.assertEqual(set(data['results'][0]), {'type', 'id', 'case_id', 'rank', 'snippet'})
+        self.assertEqual(data['pagination'], {"limit": 1, "offset": 0, "has_more": True})
+
+        response = self.client.get('/api/search?q=printer&type=case')
+        data = response.get_json()
+        self.assertEqual([result['id'] for result in data['results']], [str(self.case.id)])
+        self.assertFalse(data['pagination']['has_more'])
+
+    def test_search_api_invalid_parameters(self):
+        for query in ('', '?q=', '?q=printer&type=user', '?q=printer&limit=abc'):
+            response = self.client.get(f'/api/search{query}')
+            self.assertEqual(response.status_code, 400, query)
+            self.assertEqual(response.get_json(), {"error": "Invalid query parameters"})
@@ -0,0 +1,58 @@
+import json
+import unittest
+from datetime import datetime
+from uuid import UUID
+from flask import Flask
+from domain.entities import SupportCase, Message
+from infrastructure import serializers
+from infrastructure.serializers import (case_to_dict, message_to_dict, json_representation, orjson_dumps,
+                                        stdlib_dumps)
+
+class TestSerializers(unittest.TestCase):
+
+    def setUp(self):
+        self.case = SupportCase.create("Printer jammed", "Paper stuck – again", 1,
+                                       UUID('12345678123456781234567812345678'))
+        self.case.created_at = datetime(2026, 10, 17, 9, 30, 0, 123456)
+        self.message = Message.create(self.case.id, "Hello", datetime(2026, 10, 17, 9, 31))
+
+    def test_case_payload(self):
+        payload = json.loads(stdlib_dumps(case_to_dict(self.case)))
+
+        self.assertEqual(payload, {
+            'id': '12345678-1234-5678-1234-567812345678',
+            'summary': "Printer jammed",
+            'description': "Paper stuck – again",
+            'customer_id': 1,
+            'created_at': '2026-10-17T09:30:00.123456',
+            'message_count': 0,
+            'last_message_at': None
+        })
+
+    def test_message_payload(self):
+        payload = json.loads(stdlib_dumps(message_to_dict(self.message)))
+
+        self.assertEqual(payload['case_id'], str(self.case.id))
+        self.assertEqual(payload['created_at'], self.message.created_at.isoformat())
+
+    @unittest.skipUnless(serializers.orjson, "orjson is not installed")
+    def test_orjson_matches_stdlib(self):
+        data = {"cases": [case_to_dict(self.case)], "messages": [message_to_dict(self.message)]}
+
+        self.assertEqual(orjson_dumps(data), stdlib_dumps(data))
+
+    def test_stdlib_rejects_unknown_types(self):
+        with self.assertRaises(TypeError):
+            stdlib_dumps({"value": object()})
+
+    def test_json_representation(self):
+        app = Flask(__name__)
+        output_json = json_representation(stdlib_dumps)
+
+        with app.test_request_context():
+            response = output_json({"id": self.case.id}, 201, {'X-Test': '1'})
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.mimetype, 'application/json')
+        self.assertEqual(response.headers['X-Test'], '1')
+        self.assertEqual(response.get_json(), {"id": str(self.case.id)})
@@ -1,8 +1,12 @@
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
+from datetime import datetime
 from uuid import UUID
-from application.use_cases import SupportCaseService, MessageService
+from application.use_cases import (SupportCaseService, MessageService, SearchService, AsyncSupportCaseService,
+                                   AsyncMessageService)
 from domain.entities import SupportCase, Message
+from domain.pagination import Page, Position
+from domain.search import CASE, SearchHit
 
 class TestSupportCaseService(unittest.TestCase):
 
@@ -35,6 +39,24 @@ class TestSupportCaseService(unittest.TestCase):
         self.case_repo.get.assert_called_once_with(case_id)
         self.assertEqual(result, case)
 
+    def test_get_case_header(self):
+        case_id = UUID('12345678123456781234567812345678')
+        case = SupportCase.create("Test Summary", "Test Description", 1)
+        self.case_repo.get_header.return_value = case
+
+        result = self.service.get_case_header(case_id)
+
+        self.case_repo.get_header.assert_called_once_with(case_id)
+        self.case_repo.get.assert_not_called()
+        self.assertEqual(result, case)
+
+    def test_case_exists(self):
+        case_id = UUID('12345678123456781234567812345678')
+        self.case_repo.exists.return_value = False
+
+        self.assertFalse(self.service.case_exists(case_id))
+        self.case_repo.exists.assert_called_once_with(case_id)
+
     def test_get_all_cases(self):
         cases = [SupportCase.create("Test Summary", "Test Description", 1)]
         self.case_repo.get_all.return_value = cases
@@ -44,25 +66,56 @@ class TestSupportCaseService(unittest.TestCase):
         self.case_repo.get_all.assert_called_once()
         self.assertEqual(result, cases)
 
+    def test_list_cases(self):
+        page = Page([SupportCase.create("Test Summary", "Test Description", 1)])
+        self.case_repo.get_page.return_value = page
+
+        result = self.service.list_cases(5, customer_id=1)
+
+        self.case_repo.get_page.assert_called_once_with(5, None, 1, None, None, False)
+        self.assertEqual(result, page)
+
     def test_update_case(self):
         case_id = UUID('12345678123456781234567812345678')
-        case = SupportCase.create("Old Summary", "Old Description", 1)
-        self.case_repo.get.return_value = case
+        case = SupportCase.create("New Summary", "New Description", 2, case_id)
+        self.case_repo.update.return_value = case
 
         result = self.service.update_case(case_id, "New Summary", "New Description", 2)
 
-        self.case_repo.update.assert_called_once_with(case)
-        self.assertEqual(result.summary, "New Summary")
-        self.assertEqual(result.description, "New Description")
-        self.assertEqual(result.customer_id, 2)
+        self.case_repo.get.assert_not_called()
+        self.case_repo.get_header.assert_not_called()
+        self.case_repo.update.assert_called_once_with(case_id, "New Summary", "New Description", 2)
+        self.assertEqual(result, case)
+
+    def test_update_case_in_one_unit_of_work(self):
+        unit_of_work = MagicMock()
+        service = SupportCaseService(self.case_repo, self.message_repo, unit_of_work)
+
+        service.update_case(UUID('12345678123456781234567812345678'), "New Summary", "New Description", 2)
+
+        unit_of_work.transaction.assert_called_once()
+        self.case_repo.update.assert_called_once()
+
+    def test_upsert_cases_in_chunks(self):
+        case_id = UUID('12345678123456781234567812345678')
+        items = [{"summary": f"Case {i}", "description": "Bulk", "customer_id": 1} for i in range(5)]
+        items[0]["id"] = case_id
+        self.case_repo.upsert_many.side_effect = [[False, True], Exception("boom"), [True]]
+
+        cases, outcomes = self.service.upsert_cases(items, chunk_size=2)
+
+        self.assertEqual(self.case_repo.upsert_many.call_count, 3)
+        self.assertEqual(cases[0].id, case_id)
+        self.assertEqual(outcomes, [False, True, None, None, True])
 
     def test_delete_case(self):
         case_id = UUID('12345678123456781234567812345678')
-        case = SupportCase.create("Test Summary", "Test Description", 1)
-        self.case_repo.get.return_value = case
+        self.case_repo.delete.return_value = True
 
         result = self.service.delete_case(case_id)
 
+        self.case_repo.get.assert_not_called()
+        self.case_repo.exists.assert_not_called()
         self.case_repo.delete.assert_called_once_with(case_id)
         self.assertTrue(result)
 
@@ -86,6 +139,60 @@ class TestMessageService(unittest.TestCase):
         self.message_repo.add.assert_called_once()
         self.assertEqual(result.content, content)
 
+    def test_add_message_checks_existence_only(self):
+        case_id = UUID('12345678123456781234567812345678')
+        self.case_repo.exists.return_value = True
+
+        result = self.service.add_message(case_id, "Test Message Content")
+
+        self.case_repo.exists.assert_called_once_with(case_id)
+        self.case_repo.get.assert_not_called()
+        self.message_repo.add.assert_called_once_with(result)
+        self.assertEqual(result.case_id, case_id)
+
+    def test_add_message_publishes(self):
+        publisher = MagicMock()
+        service = MessageService(self.case_repo, self.message_repo, publisher)
+
+        result = service.add_message(UUID('12345678123456781234567812345678'), "Test Message Content")
+
+        publisher.publish.assert_called_once_with([result])
+
+    def test_add_message_survives_publish_failure(self):
+        publisher = MagicMock()
+        publisher.publish.side_effect = Exception("broker down")
+        service = MessageService(self.case_repo, self.message_repo, publisher)
+
+        result = service.add_message(UUID('12345678123456781234567812345678'), "Test Message Content")
+
+        self.message_repo.add.assert_called_once_with(result)
+
+    def test_add_message_missing_case(self):
+        case_id = UUID('12345678123456781234567812345678')
+        self.case_repo.exists.return_value = False
+
+        result = self.service.add_message(case_id, "Test Message Content")
+
+        self.assertIsNone(result)
+        self.message_repo.add.assert_not_called()
+
+    def test_add_messages(self):
+        case_id = UUID('12345678123456781234567812345678')
+        self.case_repo.exists.return_value = True
+
+        result = self.service.add_messages(case_id, ["first", "second"])
+
+        self.message_repo.add_many.assert_called_once_with(result)
+        self.assertEqual([m.content for m in result], ["first", "second"])
+        self.assertLess(result[0].created_at, result[1].created_at)
+
+    def test_add_messages_missing_case(self):
+        case_id = UUID('12345678123456781234567812345678')
+        self.case_repo.exists.return_value = False
+
+        self.assertIsNone(self.service.add_messages(case_id, ["first"]))
+        self.message_repo.add_many.assert_not_called()
+
     def test_get_case_messages(self):
         case_id = UUID('12345678123456781234567812345678')
         messages = [Message.create(case_id, "Test Message Content")]
@@ -98,6 +205,40 @@ class TestMessageService(unittest.TestCase):
         self.assertEqual(result, messages)
         self.assertEqual(total, 1)
 
+    def test_get_case_messages_page(self):
+        case_id = UUID('12345678123456781234567812345678')
+        message = Message.create(case_id, "Test Message Content")
+        after = Position(message.created_at, message.id)
+        page = Page([message])
+        self.case_repo.get.return_value = SupportCase.create("Test Summary", "Test Description", 1)
+        self.message_repo.get_page_by_case.return_value = page
+
+        result = self.service.get_case_messages_page(case_id, 5, after)
+
+        self.message_repo.get_page_by_case.assert_called_once_with(case_id, 5, after, False)
+        self.assertEqual(result, page)
+
+    def test_get_case_messages_since(self):
+        case_id = UUID('12345678123456781234567812345678')
+        message = Message.create(case_id, "Test Message Content")
+        since = Position(message.created_at, message.id)
+        page = Page([])
+        self.message_repo.get_page_since.return_value = page
+
+        result = self.service.get_case_messages_since(case_id, since, 5)
+
+        self.message_repo.get_page_since.assert_called_once_with(case_id, since, 5)
+        self.assertEqual(result, page)
+
+    def test_get_case_messages_since_missing_case(self):
+        self.case_repo.exists.return_value = False
+
+        result = self.service.get_case_messages_since(UUID('12345678123456781234567812345678'),
+                                                      Position(datetime.utcnow(), UUID(int=0)))
+
+        self.assertIsNone(result)
+        self.message_repo.get_page_since.assert_not_called()
+
     def test_delete_message(self):
         case_id = UUID('12345678123456781234567812345678')
         message_id = UUID('87654321876543218765432187654321')
@@ -106,3 +247,85 @@ class TestMessageService(unittest.TestCase):
 
         self.message_repo.delete.assert_called_once_with(message_id)
         self.assertTrue(result)
+
+    def test_message_writes_notify_case_changed(self):
+        case_id = UUID('12345678123456781234567812345678')
+        case_changed = MagicMock()
+        service = MessageService(self.case_repo, self.message_repo, case_changed=case_changed)
+
+        service.add_message(case_id, "One")
+        service.add_messages(case_id, ["Two", "Three"])
+        service.delete_message(case_id, UUID('87654321876543218765432187654321'))
+
+        self.assertEqual(case_changed.call_args_list, [((case_id,),)] * 3)
+
+class TestSearchService(unittest.TestCase):
+
+    def setUp(self):
+        self.search_index = MagicMock()
+        self.service = SearchService(self.search_index)
+
+    def test_search_reports_more_pages(self):
+        case_id = UUID('12345678123456781234567812345678')
+        hits = [SearchHit(CASE, case_id, case_id, 1.0, "snippet")] * 3
+        self.search_index.search.return_value = hits
+
+        result, has_more = self.service.search("printer", 2, 4, CASE)
+
+        self.search_index.search.assert_called_once_with("printer", 3, 4, CASE)
+        self.assertEqual(result, hits[:2])
+        self.assertTrue(has_more)
+
+class TestAsyncSupportCaseService(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.case_repo = AsyncMock()
+        self.message_repo = AsyncMock()
+        self.service = AsyncSupportCaseService(self.case_repo, self.message_repo)
+
+    async def test_create_case(self):
+        result = await self.service.create_case("Test Summary", "Test Description", 1)
+
+        self.case_repo.add.assert_awaited_once_with(result)
+        self.assertEqual(result.summary, "Test Summary")
+
+    async def test_update_case_in_one_statement(self):
+        case = SupportCase.create("New Summary", "New Description", 2)
+        self.case_repo.update.return_value = case
+
+        result = await self.service.update_case(case.id, "New Summary", "New Description", 2)
+
+        self.case_repo.get.assert_not_awaited()
+        self.case_repo.get_header.assert_not_awaited()
+        self.case_repo.update.assert_awaited_once_with(case.id, "New Summary", "New Description", 2)
+        self.assertEqual(result, case)
+
+    async def test_delete_missing_case(self):
+        self.case_repo.delete.return_value = False
+
+        self.assertFalse(await self.service.delete_case(UUID('12345678123456781234567812345678')))
+        self.case_repo.exists.assert_not_awaited()
+
+class TestAsyncMessageService(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.case_repo = AsyncMock()
+        self.message_repo = AsyncMock()
+        self.service = AsyncMessageService(self.case_repo, self.message_repo)
+
+    async def test_add_message(self):
+        case_id = UUID('12345678123456781234567812345678')
+        self.case_repo.exists.return_value = True
+
+        result = await self.service.add_message(case_id, "Test Message Content")
+
+        self.message_repo.add.assert_awaited_once_with(result)
+        self.assertEqual(result.case_id, case_id)
+
+    async def test_get_case_messages_missing_case(self):
+        self.case_repo.exists.return_value = False
+
+        result = await self.service.get_case_messages(UUID('12345678123456781234567812345678'))
+
+        self.assertIsNone(result)
+        self.message_repo.get_by_case.assert_not_awaited()
@@ -0,0 +1,38 @@
+import unittest
+from validators import (support_case_errors, message_errors, validate_support_case,
+                        validate_message)
+
+class TestValidators(unittest.TestCase):
+
+    def test_valid_support_case(self):
+        data = {"summary": "Summary", "description": "Description", "customer_id": 1}
+        self.assertEqual(support_case_errors(data), [])
+        self.assertTrue(validate_support_case(data))
+
+    def test_invalid_support_case_details(self):
+        data = {"summary": "", "customer_id": 0, "priority": "high"}
+
+        errors = support_case_errors(data)
+
+        self.assertFalse(validate_support_case(data))
+        self.assertEqual(
+            [(error["path"], error["validator"]) for error in errors],
+            [("/", "required"), ("/", "additionalProperties"), ("/customer_id", "minimum"), ("/summary", "minLength")]
+        )
+
+    def test_validation_errors_are_logged(self):
+        with self.assertLogs('validators', level='ERROR') as logs:
+            support_case_errors({"summary": ""})
+            message_errors({"content": 5})
+
+        self.assertEqual(len(logs.records), 2)
+        self.assertIn("Support case validation error", logs.output[0])
+        self.assertIn("Message validation error", logs.output[1])
+
+    def test_invalid_message_details(self):
+        errors = message_errors({"content": 5})
+
+        self.assertFalse(validate_message({"content": 5}))
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0]["path"], "/content")
+        self.assertEqual(errors[0]["validator"], "type")
@@ -1,21 +1,49 @@
-from jsonschema import validate, ValidationError
-from schemas import SUPPORT_CASE_SCHEMA, MESSAGE_SCHEMA
+from typing import List
+from jsonschema.validators import validator_for
+from schemas import SUPPORT_CASE_SCHEMA, SUPPORT_CASE_BATCH_ITEM_SCHEMA, MESSAGE_SCHEMA
 import logging
 
 logger = logging.getLogger(__name__)
 
+def _compile(schema):
+    """Check a schema once and build a reusable validator for it."""
+    cls = validator_for(schema)
+    cls.check_schema(schema)
+    return cls(schema)
+
+_support_case_validator = _compile(SUPPORT_CASE_SCHEMA)
+_support_case_batch_item_validator = _compile(SUPPORT_CASE_BATCH_ITEM_SCHEMA)
+_message_validator = _compile(MESSAGE_SCHEMA)
+
+def _errors(validator, data) -> List[dict]:
+    """Describe every schema violation in data, ordered by location."""
+    errors = [{
+        "path": "/" + "/".join(str(part) for part in error.absolute_path),
+        "message": error.message,
+        "validator": error.validator
+    } for error in validator.iter_errors(data)]
+    return sorted(errors, key=lambda error: error["path"])
+
+def support_case_errors(data) -> List[dict]:
+    errors = _errors(_support_case_validator, data)
+    if errors:
+        logger.error("Support case validation error: %s", errors)
+    return errors
+
+def support_case_batch_item_errors(data) -> List[dict]:
+    errors = _errors(_support_case_batch_item_validator, data)
+    if errors:
+        logger.error("Support case batch item validation error: %s", errors)
+    return errors
+
+def message_errors(data) -> List[dict]:
+    errors = _errors(_message_validator, data)
+    if errors:
+        logger.error("Message validation error: %s", errors)
+    return errors
+
 def validate_support_case(data):
-    try:
-        validate(instance=data, schema=SUPPORT_CASE_SCHEMA)
-        return True
-    except ValidationError as e:
-        logger.error(f"Support case validation error: {str(e)}")
-        return False
+    return not support_case_errors(data)
 
 def validate_message(data):
-    try:
-        validate(instance=data, schema=MESSAGE_SCHEMA)
-        return True
-    except ValidationError as e:
-        logger.error(f"Message validation error: {str(e)}")
-        return False
+    return not message_errors(data)